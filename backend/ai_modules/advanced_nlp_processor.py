@@ -1,4 +1,5 @@
 """Advanced NLP Processing Module with real ML/AI functionality"""
+import asyncio
 import numpy as np
 import pandas as pd
 import logging
@@ -6,6 +7,10 @@ import re
 import json
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from .skill_matcher import SkillMatcher
+from .doc_context import DocContext
+from .model_registry import model_registry
+from .micro_batcher import batcher_for
 
 # Core NLP imports
 try:
@@ -37,6 +42,126 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# category -> skill group -> spellings found in resumes
+SKILLS_DATABASE: Dict[str, Dict[str, List[str]]] = {
+    'programming_languages': {
+        'python': ['python', 'py', 'django', 'flask', 'fastapi', 'pandas', 'numpy', 'scipy', 'matplotlib'],
+        'javascript': ['javascript', 'js', 'node.js', 'nodejs', 'react', 'vue', 'angular', 'express', 'next.js'],
+        'java': ['java', 'spring', 'springboot', 'hibernate', 'maven', 'gradle', 'jsp', 'servlet'],
+        'cpp': ['c++', 'cpp', 'c plus plus', 'stl', 'boost'],
+        'csharp': ['c#', 'csharp', '.net', 'dotnet', 'asp.net', 'entity framework'],
+        'go': ['golang', 'go', 'gin', 'gorilla'],
+        'rust': ['rust', 'cargo'],
+        'php': ['php', 'laravel', 'symfony', 'codeigniter'],
+        'ruby': ['ruby', 'rails', 'ruby on rails', 'sinatra'],
+        'swift': ['swift', 'ios', 'xcode'],
+        'kotlin': ['kotlin', 'android'],
+        'typescript': ['typescript', 'ts'],
+        'scala': ['scala', 'akka', 'play'],
+        'r': ['r', 'rstudio', 'shiny'],
+        'matlab': ['matlab', 'simulink']
+    },
+    'databases': {
+        'relational': ['mysql', 'postgresql', 'postgres', 'sqlite', 'oracle', 'sql server', 'mariadb'],
+        'nosql': ['mongodb', 'cassandra', 'redis', 'elasticsearch', 'dynamodb', 'couchdb', 'neo4j'],
+        'data_warehousing': ['snowflake', 'redshift', 'bigquery', 'databricks']
+    },
+    'cloud_platforms': {
+        'aws': ['aws', 'amazon web services', 'ec2', 's3', 'lambda', 'rds', 'cloudfront', 'route53'],
+        'azure': ['azure', 'microsoft azure', 'azure functions', 'cosmos db'],
+        'gcp': ['gcp', 'google cloud', 'google cloud platform', 'compute engine', 'app engine'],
+        'containerization': ['docker', 'containerization', 'kubernetes', 'k8s', 'helm', 'istio']
+    },
+    'ai_ml': {
+        'machine_learning': ['machine learning', 'ml', 'scikit-learn', 'sklearn', 'xgboost', 'lightgbm'],
+        'deep_learning': ['deep learning', 'neural networks', 'tensorflow', 'pytorch', 'keras', 'cnn', 'rnn', 'lstm'],
+        'nlp': ['nlp', 'natural language processing', 'spacy', 'nltk', 'transformers', 'bert', 'gpt'],
+        'computer_vision': ['computer vision', 'opencv', 'image processing', 'cv', 'yolo', 'rcnn']
+    },
+    'web_technologies': {
+        'frontend': ['html', 'css', 'sass', 'less', 'bootstrap', 'tailwind', 'material-ui', 'chakra-ui'],
+        'backend': ['api', 'rest', 'graphql', 'microservices', 'soap'],
+        'frameworks': ['react', 'angular', 'vue', 'svelte', 'next.js', 'nuxt', 'gatsby']
+    },
+    'devops_tools': {
+        'version_control': ['git', 'github', 'gitlab', 'bitbucket', 'svn'],
+        'ci_cd': ['jenkins', 'github actions', 'gitlab ci', 'travis ci', 'circleci', 'bamboo'],
+        'monitoring': ['prometheus', 'grafana', 'elk', 'splunk', 'datadog', 'new relic'],
+        'testing': ['unit testing', 'integration testing', 'pytest', 'jest', 'selenium', 'cypress']
+    },
+    'data_science': {
+        'visualization': ['matplotlib', 'seaborn', 'plotly', 'd3.js', 'tableau', 'power bi'],
+        'analysis': ['pandas', 'numpy', 'scipy', 'statsmodels', 'jupyter'],
+        'big_data': ['spark', 'hadoop', 'kafka', 'airflow', 'dask']
+    }
+}
+
+# Compiled once at import: one pass over a resume finds every spelling of every skill group
+SKILLS_MATCHER = SkillMatcher.from_groups(SKILLS_DATABASE)
+
+# Up to five words of a certification name, kept on one line; a word starts with a letter
+# or digit, so list bullets ("- ", "+ ") stay out of the name
+_CERT_NAME = r"((?:\w[\w+#-]*[ \t]+){0,4}\w[\w+#-]*)"
+
+# Resume parsing patterns, compiled once at import; lists are tried in order
+RESUME_PATTERNS: Dict[str, Any] = {
+    'email': re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'),
+    'phone': [
+        re.compile(r'(?<![\d+])(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}(?!\d)'),
+        re.compile(r'(?<![\d+])(?:\+?\d{1,3}[-.\s]?)?\d{5}[-.\s]?\d{5}(?!\d)'),
+    ],
+    'linkedin': [
+        re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE),
+        re.compile(r'linkedin\.com/pub/[\w-]+', re.IGNORECASE),
+        re.compile(r'/in/[\w-]+', re.IGNORECASE),
+    ],
+    'github': [
+        re.compile(r'github\.com/[\w-]+', re.IGNORECASE),
+        re.compile(r'github\.io/[\w-]+', re.IGNORECASE),
+    ],
+    'website': re.compile(r'https?://[\w.-]+\.[a-z]{2,}', re.IGNORECASE),
+    'experience_years': [
+        re.compile(r'(\d+)\+?\s*years?\s+(?:of\s+)?experience', re.IGNORECASE),
+        re.compile(r'(\d+)\+?\s*yrs?\s+(?:of\s+)?experience', re.IGNORECASE),
+        re.compile(r'experience\s*:?\s*(\d+)\+?\s*years?', re.IGNORECASE),
+        re.compile(r'(\d+)\+?\s*years?\s+(?:in|of|as)\b', re.IGNORECASE),
+        re.compile(r'over\s+(\d+)\s+years?', re.IGNORECASE),
+    ],
+    # Titles stay on one line with at most two leading words, so a sentence never becomes a title
+    'job_title': [
+        re.compile(r'\b(senior|lead|principal|staff)[ \t]+(?:\w+[ \t]+){0,2}(?:engineer|developer|analyst|manager|architect)\b', re.IGNORECASE),
+        re.compile(r'\b(?:\w+[ \t]+){0,2}(?:engineer|developer|analyst|manager|architect|consultant|specialist)\b', re.IGNORECASE),
+        re.compile(r'\b(software|web|mobile|data|machine learning|ai)[ \t]+(engineer|developer)\b', re.IGNORECASE),
+        re.compile(r'\b(frontend|backend|full.?stack|devops)[ \t]+(engineer|developer)\b', re.IGNORECASE),
+    ],
+    # Two-letter abbreviations that are also English words ("be", "me", "ma") need their dots
+    'degree': [
+        re.compile(r"\b(bachelor'?s?\s*(?:of\s*)?(?:science|arts|engineering|computer science|business|technology)?)(?:\s+in\s+([\w ]+))?", re.IGNORECASE),
+        re.compile(r"\b(master'?s?\s*(?:of\s*)?(?:science|arts|engineering|business|technology)?)(?:\s+in\s+([\w ]+))?", re.IGNORECASE),
+        re.compile(r'\b(phd|ph\.d|doctorate)(?:\s+in\s+([\w ]+))?', re.IGNORECASE),
+        re.compile(r'\b(b\.?s\.?|b\.a\.?|b\.e\.?|b\.?tech)(?!\w)(?:[ \t]+(?:in[ \t]+)?([\w ]+))?', re.IGNORECASE),
+        re.compile(r'\b(m\.?s\.?|m\.a\.?|m\.e\.?|m\.?tech)(?!\w)(?:[ \t]+(?:in[ \t]+)?([\w ]+))?', re.IGNORECASE),
+        re.compile(r'\b(mba)\b(?:[ \t]+(?:in[ \t]+)?([\w ]+))?', re.IGNORECASE),
+    ],
+    'gpa': re.compile(r'gpa\s*:?\s*(\d+\.\d+)(?:\s*/\s*(\d+))?', re.IGNORECASE),
+    'certification': [
+        re.compile(r'\bcertified[ \t]+' + _CERT_NAME + r'[ \t]+(?:certification|cert)\b', re.IGNORECASE),
+        re.compile(r'(?<![\w+#-])' + _CERT_NAME + r'[ \t]+certification\b', re.IGNORECASE),
+        re.compile(r'(?<![\w+#-])' + _CERT_NAME + r'[ \t]+certified\b', re.IGNORECASE),
+    ],
+    'ats_tab': re.compile(r'\t'),
+    'ats_special_char': re.compile(r'[^\w\s.,;:()/-]'),
+}
+
+
+def _line_window(text: str, start: int, end: int, width: int = 50) -> str:
+    """Up to `width` characters either side of text[start:end], without crossing line breaks"""
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', end)
+    if line_end == -1:
+        line_end = len(text)
+    return text[max(line_start, start - width):min(line_end, end + width)].strip()
+
 class AdvancedNLPProcessor:
     """Advanced NLP processor with real ML/AI functionality"""
     
@@ -54,21 +179,16 @@ class AdvancedNLPProcessor:
         try:
             logger.info("🚀 Initializing Advanced NLP Processor...")
             
-            # Load spaCy model
+            # spaCy model and sentence transformer are shared handles from the model registry
             if SPACY_AVAILABLE:
-                try:
-                    self.nlp = spacy.load("en_core_web_sm")
-                    logger.info("✅ SpaCy model loaded")
-                except OSError:
+                self.nlp = await model_registry.get("spacy")
+                if self.nlp is None:
                     logger.warning("⚠️ SpaCy model not found. Install with: python -m spacy download en_core_web_sm")
             
-            # Load sentence transformer
             if SENTENCE_TRANSFORMERS_AVAILABLE:
-                try:
-                    self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-                    logger.info("✅ Sentence transformer loaded")
-                except Exception as e:
-                    logger.warning(f"⚠️ Failed to load sentence transformer: {e}")
+                self.sentence_model = await model_registry.get("sentence_transformer")
+                if self.sentence_model is None:
+                    logger.warning("⚠️ Failed to load sentence transformer")
             
             # Initialize TF-IDF
             if SKLEARN_AVAILABLE:
@@ -95,58 +215,7 @@ class AdvancedNLPProcessor:
     
     def _load_skills_database(self):
         """Load comprehensive skills database with categories"""
-        self.skills_database = {
-            'programming_languages': {
-                'python': ['python', 'py', 'django', 'flask', 'fastapi', 'pandas', 'numpy', 'scipy', 'matplotlib'],
-                'javascript': ['javascript', 'js', 'node.js', 'nodejs', 'react', 'vue', 'angular', 'express', 'next.js'],
-                'java': ['java', 'spring', 'springboot', 'hibernate', 'maven', 'gradle', 'jsp', 'servlet'],
-                'cpp': ['c++', 'cpp', 'c plus plus', 'stl', 'boost'],
-                'csharp': ['c#', 'csharp', '.net', 'dotnet', 'asp.net', 'entity framework'],
-                'go': ['golang', 'go', 'gin', 'gorilla'],
-                'rust': ['rust', 'cargo'],
-                'php': ['php', 'laravel', 'symfony', 'codeigniter'],
-                'ruby': ['ruby', 'rails', 'ruby on rails', 'sinatra'],
-                'swift': ['swift', 'ios', 'xcode'],
-                'kotlin': ['kotlin', 'android'],
-                'typescript': ['typescript', 'ts'],
-                'scala': ['scala', 'akka', 'play'],
-                'r': ['r', 'rstudio', 'shiny'],
-                'matlab': ['matlab', 'simulink']
-            },
-            'databases': {
-                'relational': ['mysql', 'postgresql', 'postgres', 'sqlite', 'oracle', 'sql server', 'mariadb'],
-                'nosql': ['mongodb', 'cassandra', 'redis', 'elasticsearch', 'dynamodb', 'couchdb', 'neo4j'],
-                'data_warehousing': ['snowflake', 'redshift', 'bigquery', 'databricks']
-            },
-            'cloud_platforms': {
-                'aws': ['aws', 'amazon web services', 'ec2', 's3', 'lambda', 'rds', 'cloudfront', 'route53'],
-                'azure': ['azure', 'microsoft azure', 'azure functions', 'cosmos db'],
-                'gcp': ['gcp', 'google cloud', 'google cloud platform', 'compute engine', 'app engine'],
-                'containerization': ['docker', 'containerization', 'kubernetes', 'k8s', 'helm', 'istio']
-            },
-            'ai_ml': {
-                'machine_learning': ['machine learning', 'ml', 'scikit-learn', 'sklearn', 'xgboost', 'lightgbm'],
-                'deep_learning': ['deep learning', 'neural networks', 'tensorflow', 'pytorch', 'keras', 'cnn', 'rnn', 'lstm'],
-                'nlp': ['nlp', 'natural language processing', 'spacy', 'nltk', 'transformers', 'bert', 'gpt'],
-                'computer_vision': ['computer vision', 'opencv', 'image processing', 'cv', 'yolo', 'rcnn']
-            },
-            'web_technologies': {
-                'frontend': ['html', 'css', 'sass', 'less', 'bootstrap', 'tailwind', 'material-ui', 'chakra-ui'],
-                'backend': ['api', 'rest', 'graphql', 'microservices', 'soap'],
-                'frameworks': ['react', 'angular', 'vue', 'svelte', 'next.js', 'nuxt', 'gatsby']
-            },
-            'devops_tools': {
-                'version_control': ['git', 'github', 'gitlab', 'bitbucket', 'svn'],
-                'ci_cd': ['jenkins', 'github actions', 'gitlab ci', 'travis ci', 'circleci', 'bamboo'],
-                'monitoring': ['prometheus', 'grafana', 'elk', 'splunk', 'datadog', 'new relic'],
-                'testing': ['unit testing', 'integration testing', 'pytest', 'jest', 'selenium', 'cypress']
-            },
-            'data_science': {
-                'visualization': ['matplotlib', 'seaborn', 'plotly', 'd3.js', 'tableau', 'power bi'],
-                'analysis': ['pandas', 'numpy', 'scipy', 'statsmodels', 'jupyter'],
-                'big_data': ['spark', 'hadoop', 'kafka', 'airflow', 'dask']
-            }
-        }
+        self.skills_database = SKILLS_DATABASE
     
     def _load_job_categories(self):
         """Load job categories and their typical requirements"""
@@ -190,52 +259,33 @@ class AdvancedNLPProcessor:
         }
         
         # Email extraction
-        email_pattern = r'\\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\\.[A-Z|a-z]{2,}\\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact_info['email'] = emails[0]
+        email = RESUME_PATTERNS['email'].search(text)
+        if email:
+            contact_info['email'] = email.group()
         
         # Phone extraction (multiple formats)
-        phone_patterns = [
-            r'(\\+?\\d{1,3}[-\.\\s]?)?\\(?\\d{3}\\)?[-\.\\s]?\\d{3}[-\.\\s]?\\d{4}',
-            r'(\\+?\\d{1,3}[-\.\\s]?)?\\d{10}',
-            r'(\\+?\\d{1,3}[-\.\\s]?)?\\(?\\d{3}\\)?[-\.\\s]?\\d{3}[-\.\\s]?\\d{4}'
-        ]
-        
-        for pattern in phone_patterns:
-            phones = re.findall(pattern, text)
-            if phones:
-                contact_info['phone'] = phones[0] if isinstance(phones[0], str) else ''.join(phones[0])
+        for pattern in RESUME_PATTERNS['phone']:
+            phone = pattern.search(text)
+            if phone:
+                contact_info['phone'] = phone.group().strip()
                 break
         
         # LinkedIn extraction
-        linkedin_patterns = [
-            r'linkedin\\.com/in/[\\w-]+',
-            r'linkedin\\.com/pub/[\\w-]+',
-            r'/in/[\\w-]+'
-        ]
-        
-        for pattern in linkedin_patterns:
-            linkedin = re.search(pattern, text, re.IGNORECASE)
+        for pattern in RESUME_PATTERNS['linkedin']:
+            linkedin = pattern.search(text)
             if linkedin:
                 contact_info['linkedin'] = linkedin.group()
                 break
         
         # GitHub extraction
-        github_patterns = [
-            r'github\\.com/[\\w-]+',
-            r'github\\.io/[\\w-]+'
-        ]
-        
-        for pattern in github_patterns:
-            github = re.search(pattern, text, re.IGNORECASE)
+        for pattern in RESUME_PATTERNS['github']:
+            github = pattern.search(text)
             if github:
                 contact_info['github'] = github.group()
                 break
         
         # Website extraction
-        website_pattern = r'https?://[\\w.-]+\\.[a-z]{2,}'
-        websites = re.findall(website_pattern, text, re.IGNORECASE)
+        websites = RESUME_PATTERNS['website'].findall(text)
         if websites:
             # Filter out common non-personal websites
             personal_sites = [site for site in websites if not any(common in site.lower() 
@@ -245,7 +295,11 @@ class AdvancedNLPProcessor:
         
         return contact_info
     
-    def extract_experience_details(self, text: str) -> Dict[str, Any]:
+    def make_context(self, text: str) -> DocContext:
+        """Per-request context that parses text once for every extractor it is passed to"""
+        return DocContext(self.nlp if SPACY_AVAILABLE else None, text)
+    
+    def extract_experience_details(self, text: str, ctx: Optional[DocContext] = None) -> Dict[str, Any]:
         """Extract detailed experience information"""
         experience_info = {
             'total_years': None,
@@ -255,40 +309,24 @@ class AdvancedNLPProcessor:
         }
         
         # Extract years of experience
-        exp_patterns = [
-            r'(\\d+)\\+?\\s*years?\\s+(?:of\\s+)?experience',
-            r'(\\d+)\\+?\\s*yrs?\\s+(?:of\\s+)?experience',
-            r'experience\\s*:?\\s*(\\d+)\\+?\\s*years?',
-            r'(\\d+)\\+?\\s*years?\\s+(?:in|of|as)',
-            r'over\\s+(\\d+)\\s+years?'
-        ]
-        
-        for pattern in exp_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in RESUME_PATTERNS['experience_years']:
+            match = pattern.search(text)
             if match:
                 experience_info['total_years'] = int(match.group(1))
                 break
         
         # Extract job titles (common patterns)
-        title_patterns = [
-            r'(senior|lead|principal|staff)\\s+(\\w+\\s+)*(?:engineer|developer|analyst|manager|architect)',
-            r'(\\w+\\s+)*(?:engineer|developer|analyst|manager|architect|consultant|specialist)',
-            r'(software|web|mobile|data|machine learning|ai)\\s+(engineer|developer)',
-            r'(frontend|backend|full.?stack|devops)\\s+(engineer|developer)'
-        ]
-        
-        for pattern in title_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in RESUME_PATTERNS['job_title']:
+            for match in pattern.finditer(text):
                 title = match.group().strip()
                 if title not in experience_info['positions'] and len(title) > 3:
                     experience_info['positions'].append(title)
         
         # Extract company names (using NER if available)
         if self.nlp and SPACY_AVAILABLE:
-            doc = self.nlp(text)
-            for ent in doc.ents:
-                if ent.label_ == 'ORG' and len(ent.text) > 2:
+            ctx = DocContext.ensure(ctx, self.nlp, text)
+            for ent in ctx.entities_by_label('ORG'):
+                if len(ent.text) > 2:
                     # Filter out common non-company words
                     if not any(word in ent.text.lower() for word in ['university', 'college', 'school', 'institute']):
                         experience_info['companies'].append(ent.text)
@@ -299,19 +337,8 @@ class AdvancedNLPProcessor:
         """Extract detailed education information"""
         education = []
         
-        # Degree patterns with more detail
-        degree_patterns = [
-            r'(bachelor\'?s?\\s*(?:of\\s*)?(?:science|arts|engineering|computer science|business|technology)?)(?:\\s+in\\s+([\\w\\s]+))?',
-            r'(master\'?s?\\s*(?:of\\s*)?(?:science|arts|engineering|business|technology)?)(?:\\s+in\\s+([\\w\\s]+))?',
-            r'(phd|ph\\.d|doctorate)(?:\\s+in\\s+([\\w\\s]+))?',
-            r'(b\\.?s\\.?|b\\.?a\\.?|b\\.?e\\.?|b\\.?tech)(?:\\s+([\\w\\s]+))?',
-            r'(m\\.?s\\.?|m\\.?a\\.?|m\\.?e\\.?|m\\.?tech)(?:\\s+([\\w\\s]+))?',
-            r'(mba)(?:\\s+([\\w\\s]+))?'
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
+        for pattern in RESUME_PATTERNS['degree']:
+            for match in pattern.finditer(text):
                 degree_info = {
                     'degree': match.group(1).strip(),
                     'field': match.group(2).strip() if match.group(2) else None,
@@ -320,8 +347,7 @@ class AdvancedNLPProcessor:
                 education.append(degree_info)
         
         # Extract GPA if mentioned
-        gpa_pattern = r'gpa\\s*:?\\s*(\\d+\\.\\d+)(?:\\s*/\\s*(\\d+))?'
-        gpa_matches = re.finditer(gpa_pattern, text, re.IGNORECASE)
+        gpa_matches = RESUME_PATTERNS['gpa'].finditer(text)
         
         for i, match in enumerate(gpa_matches):
             if i < len(education):
@@ -341,25 +367,21 @@ class AdvancedNLPProcessor:
             'certification_skills': []
         }
         
-        text_lower = text.lower()
+        # Spellings and context windows per (category, skill group), from one scan of the text
+        found_aliases = {}
+        found_contexts = {}
+        for hit in SKILLS_MATCHER.find_all(text):
+            found_aliases.setdefault((hit.category, hit.skill), set()).add(hit.alias)
+            found_contexts.setdefault((hit.category, hit.skill), []).append(_line_window(text, hit.start, hit.end))
         
         # Extract skills by category
-        for category, subcategories in self.skills_database.items():
+        for category, subcategories in SKILLS_DATABASE.items():
             skills_analysis['categorized_skills'][category] = []
             
             for skill_group, variations in subcategories.items():
-                found_variations = []
-                contexts = []
-                
-                for variation in variations:
-                    if variation.lower() in text_lower:
-                        found_variations.append(variation)
-                        
-                        # Extract context around the skill
-                        pattern = r'.{0,50}' + re.escape(variation) + r'.{0,50}'
-                        context_matches = re.finditer(pattern, text, re.IGNORECASE)
-                        for context_match in context_matches:
-                            contexts.append(context_match.group().strip())
+                found = found_aliases.get((category, skill_group), ())
+                found_variations = [variation for variation in variations if variation in found]
+                contexts = found_contexts.get((category, skill_group), [])
                 
                 if found_variations:
                     skill_info = {
@@ -387,14 +409,8 @@ class AdvancedNLPProcessor:
                         break
         
         # Extract certifications
-        cert_patterns = [
-            r'certified\\s+([\\w\\s]+?)(?:certification|cert)',
-            r'([\\w\\s]+?)\\s+certification',
-            r'([\\w\\s]+?)\\s+certified'
-        ]
-        
-        for pattern in cert_patterns:
-            cert_matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in RESUME_PATTERNS['certification']:
+            cert_matches = pattern.finditer(text)
             for match in cert_matches:
                 cert_name = match.group(1).strip()
                 if len(cert_name) > 3 and cert_name not in skills_analysis['certification_skills']:
@@ -407,8 +423,18 @@ class AdvancedNLPProcessor:
         
         return skills_analysis
     
-    def calculate_job_match_score(self, resume_text: str, job_description: str) -> Dict[str, Any]:
-        """Calculate job match score using multiple ML techniques"""
+    def _encode_batcher(self):
+        """Micro-batcher for the shared sentence transformer; concurrent matches share one encode call"""
+        model = self.sentence_model
+        return batcher_for("sentence_transformer", model, lambda texts: model.encode(texts))
+    
+    def calculate_job_match_score(self, resume_text: str, job_description: str,
+                                  semantic_similarity: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Calculate job match score using multiple ML techniques. Blocks on the shared
+        sentence-transformer batch unless `semantic_similarity` is given; coroutines use
+        calculate_job_match_score_async instead.
+        """
         match_analysis = {
             'overall_score': 0.0,
             'skill_match_score': 0.0,
@@ -421,8 +447,10 @@ class AdvancedNLPProcessor:
         
         try:
             # Semantic similarity using sentence transformers
-            if self.sentence_model and SENTENCE_TRANSFORMERS_AVAILABLE:
-                embeddings = self.sentence_model.encode([resume_text, job_description])
+            if semantic_similarity is not None:
+                match_analysis['semantic_similarity'] = semantic_similarity
+            elif self.sentence_model and SENTENCE_TRANSFORMERS_AVAILABLE:
+                embeddings = self._encode_batcher().run([resume_text, job_description])
                 match_analysis['semantic_similarity'] = float(
                     cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
                 )
@@ -485,15 +513,28 @@ class AdvancedNLPProcessor:
         
         return match_analysis
     
-    def generate_resume_insights(self, resume_text: str) -> Dict[str, Any]:
+    async def calculate_job_match_score_async(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+        """calculate_job_match_score for coroutines: the encode is awaited on the micro-batcher, the rest runs in a worker thread"""
+        similarity = None
+        if self.sentence_model and SENTENCE_TRANSFORMERS_AVAILABLE:
+            try:
+                embeddings = await self._encode_batcher().encode([resume_text, job_description])
+                similarity = float(cosine_similarity([embeddings[0]], [embeddings[1]])[0][0])
+            except Exception as e:
+                logger.error(f"Error encoding texts for job match: {e}")
+                similarity = 0.0
+        return await asyncio.to_thread(self.calculate_job_match_score, resume_text, job_description, similarity)
+    
+    def generate_resume_insights(self, resume_text: str, ctx: Optional[DocContext] = None) -> Dict[str, Any]:
         """Generate comprehensive resume insights using ML"""
+        ctx = DocContext.ensure(ctx, self.nlp if SPACY_AVAILABLE else None, resume_text)
         insights = {
             'contact_info': self.extract_contact_information(resume_text),
-            'experience': self.extract_experience_details(resume_text),
+            'experience': self.extract_experience_details(resume_text, ctx),
             'education': self.extract_education_details(resume_text),
             'skills_analysis': self.analyze_skills_with_ml(resume_text),
             'text_statistics': self._calculate_text_statistics(resume_text),
-            'readability_score': self._calculate_readability_score(resume_text),
+            'readability_score': self._calculate_readability_score(resume_text, ctx),
             'ats_compatibility': self._analyze_ats_compatibility(resume_text),
             'improvement_suggestions': []
         }
@@ -514,15 +555,15 @@ class AdvancedNLPProcessor:
             'line_count': len(text.split('\\n'))
         }
     
-    def _calculate_readability_score(self, text: str) -> Dict[str, float]:
+    def _calculate_readability_score(self, text: str, ctx: Optional[DocContext] = None) -> Dict[str, float]:
         """Calculate readability metrics"""
         if not self.nlp or not SPACY_AVAILABLE:
             return {'score': 0.0}
         
         try:
-            doc = self.nlp(text)
-            sentences = list(doc.sents)
-            words = [token for token in doc if token.is_alpha and not token.is_stop]
+            ctx = DocContext.ensure(ctx, self.nlp, text)
+            sentences = ctx.sentences
+            words = [token for token in ctx.words if token.is_alpha and not token.is_stop]
             
             if not sentences or not words:
                 return {'score': 0.0}
@@ -549,11 +590,11 @@ class AdvancedNLPProcessor:
         issues = []
         
         # Check for common ATS issues
-        if len(re.findall(r'\\t', text)) > 10:
+        if len(RESUME_PATTERNS['ats_tab'].findall(text)) > 10:
             ats_score -= 10
             issues.append("Excessive use of tabs - use spaces instead")
         
-        if len(re.findall(r'[^\\w\\s.,;:()/-]', text)) > 20:
+        if len(RESUME_PATTERNS['ats_special_char'].findall(text)) > 20:
             ats_score -= 15
             issues.append("Special characters may cause parsing issues")
         
@@ -629,8 +670,18 @@ class AdvancedNLPProcessor:
         
         return suggestions[:10]  # Limit to top 10 suggestions
     
-    def analyze_resume_complete(self, resume_text: str, job_description: str = "") -> Dict[str, Any]:
-        """Complete resume analysis combining all NLP capabilities"""
+    def extract_rule_based(self, resume_text: str) -> Dict[str, Any]:
+        """Contact details, skills and education from the regex bank and skill matcher only (no model)"""
+        return {
+            "status": "success",
+            "contact_information": self.extract_contact_information(resume_text),
+            "skills_analysis": self.analyze_skills_with_ml(resume_text),
+            "education_details": self.extract_education_details(resume_text),
+        }
+    
+    def analyze_resume_complete(self, resume_text: str, job_description: str = "",
+                                ctx: Optional[DocContext] = None) -> Dict[str, Any]:
+        """Complete resume analysis combining all NLP capabilities (ctx: an already parsed resume)"""
         try:
             if not self.initialized:
                 logger.warning("NLP Processor not initialized, using basic analysis")
@@ -643,12 +694,12 @@ class AdvancedNLPProcessor:
                     }
                 }
             
-            # Extract all components
-            contact_info = self.extract_contact_information(resume_text)
-            skills_analysis = self.analyze_skills_with_ml(resume_text)
-            experience_details = self.extract_experience_details(resume_text)
-            education_details = self.extract_education_details(resume_text)
-            insights = self.generate_resume_insights(resume_text)
+            # Extract all components once; the insights already hold each extractor's result
+            insights = self.generate_resume_insights(resume_text, ctx or self.make_context(resume_text))
+            contact_info = insights['contact_info']
+            skills_analysis = insights['skills_analysis']
+            experience_details = insights['experience']
+            education_details = insights['education']
             
             # Job matching if job description provided
             job_match = None
@@ -677,6 +728,14 @@ class AdvancedNLPProcessor:
                     "error_timestamp": datetime.now().isoformat()
                 }
             }
+    
+    async def analyze_resume_complete_async(self, resume_text: str, job_description: str = "",
+                                            ctx: Optional[DocContext] = None) -> Dict[str, Any]:
+        """analyze_resume_complete for coroutines: extraction in a worker thread, the job match on the async encode path"""
+        analysis = await asyncio.to_thread(self.analyze_resume_complete, resume_text, "", ctx)
+        if analysis.get("status") == "success" and job_description.strip():
+            analysis["job_match_analysis"] = await self.calculate_job_match_score_async(resume_text, job_description)
+        return analysis
 
 # Global instance
 nlp_processor = AdvancedNLPProcessor()
\ No newline at end of file
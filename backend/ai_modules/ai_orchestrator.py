@@ -1,7 +1,10 @@
 """Main AI Service Orchestrator - coordinates all AI modules"""
 from typing import Dict, Any, List, Optional
+import os
+import sys
 import asyncio
 from .config import config
+from .model_registry import model_registry, child_pids, process_memory
 from .nlp_processor import NLPProcessor
 from .resume_analyzer import ResumeAnalyzer
 from .matching_engine import MatchingEngine
@@ -10,6 +13,35 @@ from .coding_profile_integrator import CodingProfileIntegrator
 from .fraud_detector import FraudDetector
 from .analytics_engine import AnalyticsEngine
 
+def _transformer_weights(handle: Any) -> Optional[Any]:
+    """The torch module holding a handle's transformer weights, or None if it holds none"""
+    if isinstance(handle, tuple) and len(handle) == 2:
+        handle = handle[1]  # (tokenizer, model)
+    first_module = getattr(handle, "_first_module", None)
+    if callable(first_module):
+        handle = getattr(first_module(), "auto_model", handle)  # SentenceTransformer
+    elif not callable(getattr(handle, "parameters", None)):
+        handle = getattr(handle, "model", None)  # llm_provider's HuggingFaceWrapper
+    return handle if callable(getattr(handle, "parameters", None)) else None
+
+
+def _loaded_model_handles() -> List[Any]:
+    """Handles already loaded in the model registry and by models/llm_provider (never loads one)"""
+    handles = []
+    for name in model_registry.get_stats()["loaded"]:
+        handle = model_registry.peek(name)
+        handles += [handle, getattr(handle, "sentence_model", None), getattr(handle, "bert_model", None)]
+    for module_name in ("llm_provider", "models.llm_provider"):
+        provider = sys.modules.get(module_name)
+        if provider is None:
+            continue
+        handles.append(getattr(provider, "_chat_model", None))
+        standalone = getattr(provider, "_standalone_embedding_model", None)
+        if standalone is not None and standalone.cache_info().currsize:
+            handles.append(standalone())
+    return handles
+
+
 class AIServiceOrchestrator:
     """
     Main orchestrator class that coordinates all AI modules
@@ -20,11 +52,11 @@ class AIServiceOrchestrator:
         self.config = config
         self.logger = config.logger
         
-        # Initialize all AI modules
+        # Initialize all AI modules; one NLPProcessor and one ResumeAnalyzer are shared by every module
         self.nlp_processor = NLPProcessor()
-        self.resume_analyzer = ResumeAnalyzer()
-        self.matching_engine = MatchingEngine()
-        self.interview_assessor = InterviewAssessor()
+        self.resume_analyzer = ResumeAnalyzer(nlp_processor=self.nlp_processor)
+        self.matching_engine = MatchingEngine(nlp_processor=self.nlp_processor, resume_analyzer=self.resume_analyzer)
+        self.interview_assessor = InterviewAssessor(nlp_processor=self.nlp_processor)
         self.coding_profile_integrator = CodingProfileIntegrator()
         self.fraud_detector = FraudDetector()
         self.analytics_engine = AnalyticsEngine()
@@ -85,7 +117,8 @@ class AIServiceOrchestrator:
     async def _initialize_module(self, module_name: str, module) -> bool:
         """Initialize a single module"""
         try:
-            return await module.initialize()
+            # Shared modules are initialized once even when several modules depend on them
+            return await module.ensure_initialized()
         except Exception as e:
             self.logger.error(f"Error initializing {module_name}: {e}")
             return False
@@ -100,8 +133,7 @@ class AIServiceOrchestrator:
         Returns: comprehensive resume analysis with skills, experience, score, etc.
         """
         try:
-            if not self.resume_analyzer.is_initialized:
-                await self.resume_analyzer.initialize()
+            await self.resume_analyzer.ensure_initialized()
             
             return await self.resume_analyzer.process(resume_text)
             
@@ -115,8 +147,7 @@ class AIServiceOrchestrator:
         Returns: detailed matching results with scores and recommendations
         """
         try:
-            if not self.matching_engine.is_initialized:
-                await self.matching_engine.initialize()
+            await self.matching_engine.ensure_initialized()
             
             input_data = {"candidates": candidates, "jobs": jobs}
             return await self.matching_engine.process(input_data)
@@ -131,8 +162,7 @@ class AIServiceOrchestrator:
         Returns: comprehensive interview analysis with scores and recommendations
         """
         try:
-            if not self.interview_assessor.is_initialized:
-                await self.interview_assessor.initialize()
+            await self.interview_assessor.ensure_initialized()
             
             input_data = {"transcript": transcript, "questions": questions or []}
             return await self.interview_assessor.process(input_data)
@@ -147,8 +177,7 @@ class AIServiceOrchestrator:
         Returns: comprehensive coding profile analysis with scores
         """
         try:
-            if not self.coding_profile_integrator.is_initialized:
-                await self.coding_profile_integrator.initialize()
+            await self.coding_profile_integrator.ensure_initialized()
             
             input_data = {}
             if github_username:
@@ -168,8 +197,7 @@ class AIServiceOrchestrator:
         Returns: fraud detection results and bias analysis with recommendations
         """
         try:
-            if not self.fraud_detector.is_initialized:
-                await self.fraud_detector.initialize()
+            await self.fraud_detector.ensure_initialized()
             
             return await self.fraud_detector.process(candidates)
             
@@ -183,8 +211,7 @@ class AIServiceOrchestrator:
         Returns: comprehensive analytics with metrics and insights
         """
         try:
-            if not self.analytics_engine.is_initialized:
-                await self.analytics_engine.initialize()
+            await self.analytics_engine.ensure_initialized()
             
             input_data = {"timeframe": timeframe}
             return await self.analytics_engine.process(input_data)
@@ -282,6 +309,65 @@ class AIServiceOrchestrator:
             }
         }
 
+    def get_memory_report(self, instance_memory_mb: Optional[int] = None,
+                          workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Memory used by this worker process and how many model copies its modules hold.
+        When the models were preloaded in a parent that forked the workers, every sibling
+        worker is listed with its RSS/PSS/USS and the total is the sum of their PSS.
+        With workers, also the projected total for that many workers (shared pages once,
+        private pages per worker); with instance_memory_mb, how many workers fit.
+        """
+        # Every NLP processor and resume analyzer reachable from a module
+        processors, analyzers = {}, {}
+        for module in self.modules.values():
+            for candidate in (module, getattr(module, "nlp_processor", None),
+                              getattr(getattr(module, "resume_analyzer", None), "nlp_processor", None)):
+                if isinstance(candidate, NLPProcessor):
+                    processors[id(candidate)] = candidate
+            for candidate in (module, getattr(module, "resume_analyzer", None)):
+                if isinstance(candidate, ResumeAnalyzer):
+                    analyzers[id(candidate)] = candidate
+        spacy_pipelines = {id(p.nlp) for p in processors.values() if p.nlp is not None}
+        # Distinct copies of transformer weights, wherever the handle to them lives
+        weights = [_transformer_weights(h) for h in [p.bert_model for p in processors.values()] + _loaded_model_handles()]
+        transformer_models = {id(w) for w in weights if w is not None}
+
+        memory = process_memory()
+        rss = memory["rss_bytes"]
+        report = {
+            "pid": os.getpid(),
+            **memory,
+            "rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+            "instances": {
+                "nlp_processor": len(processors),
+                "resume_analyzer": len(analyzers),
+                "spacy_pipeline": len(spacy_pipelines),
+                "transformer_model": len(transformer_models)
+            },
+            "models": model_registry.get_stats()["models"],
+            "preloaded_in_parent": model_registry.forked_from_preload
+        }
+
+        pids = child_pids(os.getppid()) if model_registry.forked_from_preload else [os.getpid()]
+        siblings = {pid: (memory if pid == os.getpid() else process_memory(pid)) for pid in pids or [os.getpid()]}
+        report["workers"] = [{"pid": pid, **usage} for pid, usage in siblings.items()]
+        for field in ("rss_bytes", "pss_bytes"):
+            values = [usage[field] for usage in siblings.values()]
+            report[f"total_{field}"] = sum(values) if None not in values else None
+
+        # Pages this worker shares with its siblings are paid for once, private pages per worker
+        uss = memory["uss_bytes"]
+        private = uss if uss is not None else rss
+        shared = rss - uss if rss is not None and uss is not None else 0
+        if workers and private:
+            report["projected_workers"] = workers
+            report["projected_total_bytes"] = shared + workers * private
+        if instance_memory_mb and private:
+            report["instance_memory_mb"] = instance_memory_mb
+            report["workers_that_fit"] = max(0, int((instance_memory_mb * 1024 * 1024 - shared) // private))
+        return report
+
 # =============================================================================
 # GLOBAL INSTANCE - Easy import for FastAPI
 # =============================================================================
@@ -0,0 +1,146 @@
+"""Tiered analyzer cascade: cheap tiers inline, expensive tiers concurrently under a latency budget"""
+import os
+import time
+import asyncio
+import hashlib
+import inspect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from .config import config
+
+# Threads for the blocking work of analysis tiers; a tier past its deadline keeps its
+# thread until it returns, so abandoned tiers never hold the loop's default executor
+TIER_THREADS = int(os.getenv("ANALYSIS_TIER_THREADS", "4"))
+
+tier_executor = ThreadPoolExecutor(max_workers=TIER_THREADS, thread_name_prefix="analysis-tier")
+
+
+@dataclass
+class CascadeTier:
+    """
+    One analyzer in the cascade. `fn(text)` may be a coroutine function or a plain
+    function (run on `tier_executor`). Cheap tiers are always awaited; expensive tiers
+    only until the caller's budget runs out. After `deadline` seconds a tier is reported
+    as timed out and the coroutine awaiting it is cancelled, but nothing running in a
+    thread can be: a plain function keeps its pool thread until it returns, and work a
+    coroutine hands off (to threads, or shielded as analysis_store.get_or_compute does)
+    runs on. Coroutine tiers should hand their blocking work to `tier_executor` too.
+    """
+    name: str
+    fn: Callable[[str], Any]
+    deadline: float = 30.0
+    cheap: bool = False
+
+
+class AnalysisCascade:
+    """
+    Runs resume analyzers as a cascade and keeps every analysis for `ttl` seconds, keyed
+    by a hash of the analysed text. Tiers that miss the budget keep running in the
+    background and their results are attached to the stored analysis, which `get`
+    returns for a later poll. A repeat request for the same text joins the tiers that
+    are still running instead of starting them again.
+    """
+
+    def __init__(self, ttl: float = 900.0, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.logger = config.logger
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @staticmethod
+    def analysis_id(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+    def _prune(self):
+        now = time.time()
+        for key in [k for k, e in self._entries.items() if now - e["created_at"] > self.ttl and not e["tasks"]]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _run_tier(self, tier: CascadeTier, text: str) -> Any:
+        if inspect.iscoroutinefunction(tier.fn):
+            call = tier.fn(text)
+        else:
+            # Not to_thread: abandoned tiers would hold threads of the loop's default executor
+            call = asyncio.get_running_loop().run_in_executor(tier_executor, tier.fn, text)
+        return await asyncio.wait_for(call, timeout=tier.deadline)
+
+    def _record(self, entry: Dict[str, Any], name: str, started: float, task: asyncio.Task):
+        """Done-callback: store a tier's outcome in its analysis entry"""
+        entry["tasks"].pop(name, None)
+        elapsed = round(time.time() - started, 3)
+        if task.cancelled():
+            entry["status"][name] = {"state": "cancelled", "seconds": elapsed}
+            return
+        error = task.exception()
+        if isinstance(error, asyncio.TimeoutError):
+            entry["status"][name] = {"state": "timeout", "seconds": elapsed}
+            entry["results"][name] = {"error": "deadline exceeded"}
+        elif error is not None:
+            self.logger.error(f"Analysis tier {name} failed: {error}")
+            entry["status"][name] = {"state": "error", "seconds": elapsed}
+            entry["results"][name] = {"error": str(error)}
+        else:
+            entry["status"][name] = {"state": "complete", "seconds": elapsed}
+            entry["results"][name] = task.result()
+
+    async def run(self, text: str, tiers: List[CascadeTier], budget: float) -> Dict[str, Any]:
+        """
+        Analyse text within `budget` seconds (cheap tiers excepted) and return the
+        snapshot described in `get`.
+        """
+        started = time.time()
+        self._prune()
+        key = self.analysis_id(text)
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry["created_at"] > self.ttl:
+            entry = {"created_at": started, "results": {}, "status": {}, "tasks": {}}
+            self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        # Start every tier that has neither finished nor is still running, expensive ones first
+        for tier in sorted(tiers, key=lambda t: t.cheap):
+            if tier.name in entry["tasks"] or entry["status"].get(tier.name, {}).get("state") == "complete":
+                continue
+            entry["status"][tier.name] = {"state": "running"}
+            task = asyncio.ensure_future(self._run_tier(tier, text))
+            task.add_done_callback(lambda t, name=tier.name, s=time.time(): self._record(entry, name, s, t))
+            entry["tasks"][tier.name] = task
+
+        cheap = [entry["tasks"][t.name] for t in tiers if t.cheap and t.name in entry["tasks"]]
+        if cheap:
+            await asyncio.wait(cheap)
+        expensive = [entry["tasks"][t.name] for t in tiers if not t.cheap and t.name in entry["tasks"]]
+        remaining = budget - (time.time() - started)
+        if expensive and remaining > 0:
+            # Late tiers are not cancelled here; their own deadline bounds them
+            await asyncio.wait(expensive, timeout=remaining)
+        # Let done-callbacks of tasks that just finished record their results
+        await asyncio.sleep(0)
+        return self.get(key, elapsed=time.time() - started)
+
+    def get(self, analysis_id: str, elapsed: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Current state of an analysis: finished tier results, per-tier status and the
+        tiers still running, or None when unknown or expired.
+        """
+        entry = self._entries.get(analysis_id)
+        if entry is None:
+            return None
+        snapshot = {
+            "analysis_id": analysis_id,
+            "results": dict(entry["results"]),
+            "tier_status": {name: dict(status) for name, status in entry["status"].items()},
+            "pending_tiers": sorted(entry["tasks"]),
+            "complete": not entry["tasks"],
+        }
+        if elapsed is not None:
+            snapshot["elapsed_seconds"] = round(elapsed, 3)
+        return snapshot
+
+
+# Global cascade shared by the resume analysis endpoints
+analysis_cascade = AnalysisCascade()
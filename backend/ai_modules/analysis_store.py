@@ -0,0 +1,303 @@
+"""Content-addressed store of resume analysis artifacts keyed by a hash of the uploaded file bytes"""
+import io
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import inspect
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional, Union
+from .config import config
+from .doc_context import DocContext
+from .llm_cache import normalize_inputs
+
+# Bump an artifact's version when the code producing it changes; older entries are then ignored
+ARTIFACT_VERSIONS = {
+    "text": "1",                 # file_extractor output
+    "doc": "1",                  # serialized spaCy Doc (the fingerprint of the pipeline is appended)
+    "basic_analysis": "1",       # /ai/analyze-resume
+    "quick_extraction": "1",     # AdvancedNLPProcessor.extract_rule_based
+    "nlp_analysis": "1",         # AdvancedNLPProcessor.analyze_resume_complete
+    "resume_analysis": "1",      # AdvancedResumeAnalyzer.analyze_resume_comprehensive
+    "langchain_analysis": "1",   # LangChainGeminiAnalyzer.analyze_resume_with_llm
+    "internship_analysis": "1",  # models.*_internship_analyzer.process_resume_text
+    "perplexity_analysis": "1",  # PerplexityResumeAnalyzer.analyze_resume
+}
+
+
+def content_hash(source: Union[bytes, bytearray, memoryview, Any]) -> str:
+    """SHA-256 of raw bytes or of an open binary file (read in chunks, position restored)"""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+        return digest.hexdigest()
+    if isinstance(source, io.BytesIO):
+        digest.update(source.getbuffer())
+        return digest.hexdigest()
+    position = source.tell()
+    source.seek(0)
+    for chunk in iter(lambda: source.read(1024 * 1024), b""):
+        digest.update(chunk)
+    source.seek(position)
+    return digest.hexdigest()
+
+
+def _json_default(value: Any) -> Any:
+    """Pydantic models as their fields, anything else unknown to JSON as a string"""
+    for method in ("model_dump", "dict"):
+        if callable(getattr(value, method, None)):
+            return getattr(value, method)()
+    return str(value)
+
+
+def _storable(value: Any) -> bool:
+    """Failures are not stored, so the next request for the file tries again"""
+    if value is None or value == "":
+        return False
+    return not (isinstance(value, dict) and (value.get("success") is False or value.get("status") == "error"))
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    file_hash TEXT NOT NULL,
+    artifact TEXT NOT NULL,
+    version TEXT NOT NULL,
+    params TEXT NOT NULL,
+    encoding TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (file_hash, artifact, version, params)
+);
+CREATE INDEX IF NOT EXISTS artifacts_accessed ON artifacts (accessed_at);
+"""
+
+
+class AnalysisStore:
+    """
+    SQLite-backed store of everything derived from one uploaded file, keyed by the
+    SHA-256 of its bytes: the extracted text, the parsed spaCy Doc and each analyzer's
+    output, stored separately and tagged with the artifact version (and, for analyzers
+    that take options, a hash of those options). An endpoint that receives a file it has
+    seen before reuses the finished artifacts and computes only the missing ones.
+
+    Without a path the store lives in memory for the life of the process. Artifacts are
+    JSON values or raw bytes; they expire `ttl` seconds after they were written (None
+    keeps them) and the least recently used ones are evicted past `max_bytes`.
+    Embeddings are not duplicated here: EmbeddingCache already keys them by text hash.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = 512 * 1024 * 1024,
+                 versions: Optional[Dict[str, str]] = None, ttl: Optional[float] = 24 * 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.versions = dict(ARTIFACT_VERSIONS, **(versions or {}))
+        self.logger = config.logger
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "expired": 0, "evictions": 0, "joined": 0, "errors": 0}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            try:
+                if self.path:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path or ":memory:", timeout=5.0, check_same_thread=False,
+                                       isolation_level=None)
+                if self.path:
+                    # WAL lets API workers read while another process writes
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                self.logger.warning(f"Analysis store unavailable: {e}")
+                return None
+        return self._conn
+
+    def _key(self, file_hash: str, artifact: str, params: Optional[Dict[str, Any]],
+             version: Optional[str]) -> tuple:
+        version = version if version is not None else self.versions.get(artifact, "1")
+        params_key = hashlib.sha256(normalize_inputs(params).encode("utf-8")).hexdigest()[:16] if params else ""
+        return (file_hash, artifact, version, params_key)
+
+    def get(self, file_hash: str, artifact: str, params: Optional[Dict[str, Any]] = None,
+            version: Optional[str] = None) -> Optional[Any]:
+        """Stored artifact, or None when this file has not produced it at this version"""
+        key = self._key(file_hash, artifact, params, version)
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT encoding, value, created_at FROM artifacts "
+                    "WHERE file_hash = ? AND artifact = ? AND version = ? AND params = ?",
+                    key
+                ).fetchone()
+                if row is not None and self.ttl and row[2] <= time.time() - self.ttl:
+                    conn.execute(
+                        "DELETE FROM artifacts WHERE file_hash = ? AND artifact = ? AND version = ? AND params = ?", key
+                    )
+                    self.stats["expired"] += 1
+                    row = None
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                conn.execute(
+                    "UPDATE artifacts SET accessed_at = ? WHERE file_hash = ? AND artifact = ? AND version = ? AND params = ?",
+                    (time.time(), *key)
+                )
+                self.stats["hits"] += 1
+                return bytes(row[1]) if row[0] == "bytes" else json.loads(row[1])
+            except (sqlite3.Error, ValueError) as e:
+                self.logger.warning(f"Analysis store read failed: {e}")
+                self.stats["errors"] += 1
+                return None
+
+    def put(self, file_hash: str, artifact: str, value: Any, params: Optional[Dict[str, Any]] = None,
+            version: Optional[str] = None):
+        """Store an artifact (bytes as-is, anything else as JSON)"""
+        self._write(self._key(file_hash, artifact, params, version), value)
+
+    def _write(self, key: tuple, value: Any):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            encoding, payload = "bytes", bytes(value)
+            size = len(payload)
+        else:
+            try:
+                encoding, payload = "json", json.dumps(value, ensure_ascii=False, default=_json_default)
+            except (TypeError, ValueError) as e:
+                self.logger.warning(f"Artifact {key[1]} not storable: {e}")
+                return
+            size = len(payload.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, encoding, payload, size, now, now)
+                )
+                self.stats["writes"] += 1
+                self._evict(conn)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Analysis store write failed: {e}")
+                self.stats["errors"] += 1
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired artifacts, then least recently used ones until back under 90% of max_bytes"""
+        if self.ttl:
+            self.stats["expired"] += conn.execute(
+                "DELETE FROM artifacts WHERE created_at <= ?", (time.time() - self.ttl,)
+            ).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        freed, keys = 0, []
+        for file_hash, artifact, version, params, size in conn.execute(
+                "SELECT file_hash, artifact, version, params, size FROM artifacts ORDER BY accessed_at"):
+            keys.append((file_hash, artifact, version, params))
+            freed += size
+            if total - freed <= target:
+                break
+        conn.executemany(
+            "DELETE FROM artifacts WHERE file_hash = ? AND artifact = ? AND version = ? AND params = ?", keys
+        )
+        self.stats["evictions"] += len(keys)
+
+    async def get_or_compute(self, file_hash: str, artifact: str, compute: Callable[[], Any],
+                             params: Optional[Dict[str, Any]] = None, version: Optional[str] = None,
+                             executor: Optional[Executor] = None) -> Any:
+        """
+        The stored artifact, or the result of `compute()` (a coroutine function, or a plain
+        function run on `executor`, the loop's default one when None), which is stored
+        unless it is a failure. Concurrent requests for the same missing artifact share one
+        computation, which runs to completion even if every caller stops waiting.
+        """
+        key = self._key(file_hash, artifact, params, version)
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["joined"] += 1
+            return await asyncio.shield(task)
+
+        cached = await asyncio.to_thread(self.get, file_hash, artifact, params, version)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute, executor))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _, key=key: self._inflight.pop(key, None))
+        else:
+            self.stats["joined"] += 1
+        # Shielded so a caller's timeout does not cancel the work other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: tuple, compute: Callable[[], Any], executor: Optional[Executor] = None) -> Any:
+        if inspect.iscoroutinefunction(compute):
+            value = await compute()
+        else:
+            value = await asyncio.get_running_loop().run_in_executor(executor, compute)
+            if inspect.isawaitable(value):
+                value = await value
+        if _storable(value):
+            await asyncio.to_thread(self._write, key, value)
+        return value
+
+    async def doc_context(self, file_hash: str, nlp, text: str, executor: Optional[Executor] = None) -> DocContext:
+        """DocContext for the file's text, restoring its stored Doc instead of parsing again"""
+        ctx = DocContext(nlp, text)
+        if nlp is None:
+            return ctx
+        version = f"{self.versions['doc']}:{ctx.fingerprint}"
+        data = await self.get_or_compute(file_hash, "doc", lambda: ctx.parse_batched().to_bytes(), version=version,
+                                         executor=executor)
+        if "doc" in ctx.__dict__ or not data:
+            return ctx
+        try:
+            return DocContext.from_bytes(nlp, text, data)
+        except Exception as e:
+            self.logger.warning(f"Stored Doc could not be restored: {e}")
+            return ctx
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and store size per artifact"""
+        with self._lock:
+            by_artifact: Dict[str, Dict[str, int]] = {}
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    for artifact, entries, size in conn.execute(
+                            "SELECT artifact, COUNT(*), COALESCE(SUM(size), 0) FROM artifacts GROUP BY artifact"):
+                        by_artifact[artifact] = {"entries": entries, "bytes": size}
+                except sqlite3.Error:
+                    pass
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "artifacts": by_artifact,
+                "bytes": sum(a["bytes"] for a in by_artifact.values()),
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "path": self.path
+            }
+
+
+# Global store shared by the resume upload endpoints
+analysis_store = AnalysisStore(
+    path=config.ANALYSIS_STORE_PATH or None,
+    max_bytes=config.ANALYSIS_STORE_MAX_MB * 1024 * 1024,
+    ttl=config.ANALYSIS_STORE_TTL_HOURS * 3600 or None
+)
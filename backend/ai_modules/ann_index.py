@@ -0,0 +1,250 @@
+"""Approximate nearest-neighbour index (IVF-flat) implemented with NumPy"""
+import json
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+import numpy as np
+
+
+class IVFFlatIndex:
+    """
+    Inverted-file index over L2-normalized vectors, scored by inner product (cosine).
+
+    Until `train_threshold` vectors have been added the index answers queries by
+    exact brute force. After that, vectors are clustered with k-means into
+    `n_lists` inverted lists and a query only scans the `n_probe` closest lists.
+    Raising `n_probe` improves recall at the cost of latency.
+    """
+
+    def __init__(self, dim: int, n_lists: Optional[int] = None, n_probe: int = 8,
+                 train_threshold: int = 1024, kmeans_iterations: int = 10, seed: int = 42):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.train_threshold = train_threshold
+        self.kmeans_iterations = kmeans_iterations
+        self.seed = seed
+
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._active = np.zeros(0, dtype=bool)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._count = 0
+        self._ids: List[Hashable] = []
+        self._slot_of: Dict[Hashable, int] = {}
+
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._list_arrays: Dict[int, np.ndarray] = {}
+        self._trained_size = 0
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def add(self, ids: Iterable[Hashable], vectors) -> None:
+        """Insert or replace vectors for the given ids"""
+        ids = list(ids)
+        vectors = self._normalize(np.asarray(vectors, dtype=np.float32).reshape(len(ids), self.dim))
+        if not ids:
+            return
+
+        for item_id in ids:
+            if item_id in self._slot_of:
+                self.remove(item_id)
+
+        start = self._count
+        self._grow(len(ids))
+        self._vectors[start:start + len(ids)] = vectors
+        self._active[start:start + len(ids)] = True
+        for offset, item_id in enumerate(ids):
+            self._ids.append(item_id)
+            self._slot_of[item_id] = start + offset
+
+        if self.centroids is not None:
+            slots = np.arange(start, start + len(ids))
+            self._assign(slots)
+            # Re-cluster once the index has grown well beyond its training size
+            if len(self) > 4 * self._trained_size:
+                self.train()
+        elif len(self) >= self.train_threshold:
+            self.train()
+
+    def remove(self, item_id: Hashable) -> bool:
+        """Remove a vector by id; returns False if it was not indexed"""
+        slot = self._slot_of.pop(item_id, None)
+        if slot is None:
+            return False
+        self._active[slot] = False
+        if self.centroids is not None:
+            list_id = int(self._assignments[slot])
+            self._lists[list_id].remove(slot)
+            self._list_arrays.pop(list_id, None)
+        # Reclaim removed slots once they outnumber the live ones
+        removed = self._count - len(self._slot_of)
+        if removed > 1024 and removed > len(self._slot_of):
+            self.compact()
+        return True
+
+    def train(self) -> None:
+        """Cluster the active vectors into inverted lists (k-means)"""
+        slots = np.flatnonzero(self._active)
+        if slots.size == 0:
+            return
+        n_lists = self.n_lists or max(1, int(np.sqrt(slots.size)))
+        n_lists = min(n_lists, slots.size)
+
+        rng = np.random.default_rng(self.seed)
+        sample = slots if slots.size <= 64 * n_lists else rng.choice(slots, 64 * n_lists, replace=False)
+        data = self._vectors[sample]
+        centroids = data[rng.choice(data.shape[0], n_lists, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            for list_id in range(n_lists):
+                members = data[labels == list_id]
+                if members.shape[0]:
+                    centroids[list_id] = members.mean(axis=0)
+            centroids = self._normalize(centroids)
+
+        self.centroids = centroids
+        self._lists = [[] for _ in range(n_lists)]
+        self._list_arrays = {}
+        self._assign(slots)
+        self._trained_size = slots.size
+
+    def compact(self) -> None:
+        """Drop removed slots, reclaiming their storage"""
+        slots = np.flatnonzero(self._active)
+        self._vectors = self._vectors[slots].copy()
+        self._active = np.ones(slots.size, dtype=bool)
+        self._assignments = self._assignments[slots].copy()
+        self._ids = [self._ids[slot] for slot in slots]
+        self._slot_of = {item_id: slot for slot, item_id in enumerate(self._ids)}
+        self._count = slots.size
+        if self.centroids is not None:
+            self._lists = [[] for _ in range(self.centroids.shape[0])]
+            for slot, list_id in enumerate(self._assignments.tolist()):
+                self._lists[list_id].append(slot)
+            self._list_arrays = {}
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def search(self, query, k: int = 10, n_probe: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """Return up to k (id, cosine score) pairs, best first"""
+        if len(self) == 0 or k <= 0:
+            return []
+        query = self._normalize(np.asarray(query, dtype=np.float32).reshape(1, self.dim))[0]
+
+        if self.centroids is None:
+            candidates = np.flatnonzero(self._active)
+        else:
+            n_probe = min(n_probe or self.n_probe, self.centroids.shape[0])
+            centroid_scores = self.centroids @ query
+            probe = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+            candidates = np.concatenate([self._list_array(int(list_id)) for list_id in probe])
+
+        if candidates.size == 0:
+            return []
+        scores = self._vectors[candidates] @ query
+        k = min(k, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[candidates[i]], float(scores[i])) for i in top]
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        return item_id in self._slot_of
+
+    def ids(self) -> List[Hashable]:
+        """Ids of every indexed item"""
+        return list(self._slot_of)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and tuning parameters"""
+        return {
+            "size": len(self),
+            "dim": self.dim,
+            "trained": self.centroids is not None,
+            "n_lists": 0 if self.centroids is None else int(self.centroids.shape[0]),
+            "n_probe": self.n_probe,
+            "train_threshold": self.train_threshold
+        }
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, path: str) -> None:
+        """Persist active vectors, ids, centroids and parameters to an .npz file"""
+        slots = np.flatnonzero(self._active)
+        params = {
+            "dim": self.dim,
+            "n_lists": self.n_lists,
+            "n_probe": self.n_probe,
+            "train_threshold": self.train_threshold,
+            "kmeans_iterations": self.kmeans_iterations,
+            "seed": self.seed,
+            "ids": [self._ids[slot] for slot in slots]
+        }
+        arrays = {"vectors": self._vectors[slots], "params": np.array(json.dumps(params))}
+        if self.centroids is not None:
+            arrays["centroids"] = self.centroids
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFFlatIndex":
+        """Load an index written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            params = json.loads(str(data["params"]))
+            vectors = data["vectors"]
+            centroids = data["centroids"] if "centroids" in data.files else None
+        ids = params.pop("ids")
+        index = cls(**params)
+        if centroids is not None:
+            index.centroids = centroids.astype(np.float32)
+            index._lists = [[] for _ in range(centroids.shape[0])]
+            index._trained_size = len(ids)
+        if ids:
+            index.add(ids, vectors)
+        return index
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _grow(self, count: int) -> None:
+        """Reserve room for count more slots, doubling capacity as needed"""
+        needed = self._count + count
+        capacity = self._vectors.shape[0]
+        if needed > capacity:
+            capacity = max(needed, 2 * capacity, 64)
+            vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+            vectors[:self._count] = self._vectors[:self._count]
+            active = np.zeros(capacity, dtype=bool)
+            active[:self._count] = self._active[:self._count]
+            assignments = np.zeros(capacity, dtype=np.int32)
+            assignments[:self._count] = self._assignments[:self._count]
+            self._vectors, self._active, self._assignments = vectors, active, assignments
+        self._count = needed
+
+    def _assign(self, slots: np.ndarray) -> None:
+        labels = np.argmax(self._vectors[slots] @ self.centroids.T, axis=1)
+        self._assignments[slots] = labels
+        for slot, list_id in zip(slots.tolist(), labels.tolist()):
+            self._lists[list_id].append(slot)
+            self._list_arrays.pop(list_id, None)
+
+    def _list_array(self, list_id: int) -> np.ndarray:
+        array = self._list_arrays.get(list_id)
+        if array is None:
+            array = np.array(self._lists[list_id], dtype=np.int64)
+            self._list_arrays[list_id] = array
+        return array
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
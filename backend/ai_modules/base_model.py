@@ -12,12 +12,24 @@ class BaseAIModel(ABC):
         self.config = config
         self.logger = config.logger
         self.is_initialized = False
+        self._init_lock: Optional[asyncio.Lock] = None
         
     @abstractmethod
     async def initialize(self) -> bool:
         """Initialize the model"""
         pass
     
+    async def ensure_initialized(self) -> bool:
+        """Initialize once, however many modules share this instance and ask concurrently"""
+        if self.is_initialized:
+            return True
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if not self.is_initialized:
+                await self.initialize()
+        return self.is_initialized
+    
     @abstractmethod
     async def process(self, input_data: Any) -> Dict[str, Any]:
         """Process input data"""
@@ -0,0 +1,290 @@
+"""Bulk resume ingestion: text extraction on a process pool, nlp.pipe parsing, batched embeddings and bulk row writes"""
+import os
+import io
+import time
+import uuid
+import asyncio
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from .config import config
+from .doc_context import DocContext
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".doc", ".txt")
+MAX_FILES = int(os.getenv("BULK_INGEST_MAX_FILES", "2000"))
+MAX_FILE_BYTES = int(os.getenv("BULK_INGEST_MAX_FILE_MB", "10")) * 1024 * 1024
+# Whole-upload limits: the archive as sent, and its accepted members once inflated
+# (every accepted document is held in memory until the cohort is written)
+MAX_UPLOAD_BYTES = int(os.getenv("BULK_INGEST_MAX_UPLOAD_MB", "512")) * 1024 * 1024
+MAX_TOTAL_BYTES = int(os.getenv("BULK_INGEST_MAX_TOTAL_MB", "1024")) * 1024 * 1024
+
+# Start method for the extraction and parse worker processes: the API process runs
+# threads (micro-batchers, the HTTP client pool) and must not be forked
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Analyzer proficiency keys to the values extracted_skills.level accepts (CHECK constraint)
+SKILL_LEVELS = {"expert": "Advanced", "intermediate": "Intermediate", "beginner": "Beginner"}
+
+
+class IngestLimitError(ValueError):
+    """The upload is larger than MAX_UPLOAD_BYTES or inflates past MAX_TOTAL_BYTES"""
+
+
+def collect_documents(source: Union[str, bytes, BinaryIO], max_files: int = MAX_FILES,
+                      max_file_bytes: int = MAX_FILE_BYTES,
+                      max_total_bytes: int = MAX_TOTAL_BYTES) -> Tuple[List[Tuple[str, bytes]], List[Dict[str, str]]]:
+    """
+    Resume files from a directory (searched recursively), a zip file path, zip bytes or
+    an open zip file. Returns (filename, content) pairs and the files that were skipped
+    with the reason. Raises IngestLimitError, before reading them, once the accepted
+    files add up to more than max_total_bytes.
+    """
+    documents, skipped = [], []
+    total = 0
+
+    def accept(name: str, size: int) -> bool:
+        nonlocal total
+        if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+            return False
+        if size > max_file_bytes:
+            skipped.append({"filename": name, "error": f"larger than {max_file_bytes // (1024 * 1024)} MB"})
+            return False
+        if len(documents) >= max_files:
+            skipped.append({"filename": name, "error": f"more than {max_files} files"})
+            return False
+        total += size
+        if total > max_total_bytes:
+            raise IngestLimitError(f"resumes add up to more than {max_total_bytes // (1024 * 1024)} MB")
+        return True
+
+    if isinstance(source, str) and os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                if accept(os.path.relpath(path, source), os.path.getsize(path)):
+                    with open(path, "rb") as f:
+                        documents.append((os.path.relpath(path, source), f.read()))
+        return documents, skipped
+
+    archive = io.BytesIO(source) if isinstance(source, bytes) else source
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            # Sizes come from the zip directory, so oversized members are never inflated
+            # (zipfile stops reading a member at its declared size)
+            if info.is_dir() or info.filename.startswith("__MACOSX/") or os.path.basename(info.filename).startswith("."):
+                continue
+            if accept(info.filename, info.file_size):
+                documents.append((info.filename, zf.read(info)))
+    return documents, skipped
+
+
+def _extract_text(item: Tuple[str, bytes]) -> Tuple[Optional[str], Optional[str]]:
+    """Process-pool worker: (text, error) for one file"""
+    filename, content = item
+    try:
+        from file_extractor import FileContentExtractor
+    except ImportError as e:
+        return None, f"text extraction unavailable: {e}"
+    try:
+        text = FileContentExtractor.extract_text_from_file(content, filename)
+    except Exception as e:
+        return None, str(e)
+    if not text or len(text.strip()) < 10:
+        return None, "no text could be extracted"
+    return text, None
+
+
+class SupabaseBulkWriter:
+    """
+    Inserts resume_analyses rows in chunks of `chunk_size`, each chunk followed by the
+    extracted_skills rows of its analyses. If a chunk's skills fail to insert, that
+    chunk's analyses are deleted again, so an analysis is only kept with its skills.
+    """
+
+    def __init__(self, client=None, chunk_size: int = 200):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.logger = config.logger
+
+    def _client(self):
+        if self.client is None:
+            from supabase_client import supabase
+            self.client = supabase
+        return self.client
+
+    def write(self, analyses: List[Dict[str, Any]], skills: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Returns the persisted analysis ids and, per failed chunk, its ids and the error"""
+        client = self._client()
+        skills_by_analysis: Dict[str, List[Dict[str, Any]]] = {}
+        for row in skills:
+            skills_by_analysis.setdefault(row["analysis_id"], []).append(row)
+
+        persisted, failed = [], []
+        for start in range(0, len(analyses), self.chunk_size):
+            chunk = analyses[start:start + self.chunk_size]
+            ids = [row["id"] for row in chunk]
+            chunk_skills = [row for analysis_id in ids for row in skills_by_analysis.get(analysis_id, [])]
+            inserted = False
+            try:
+                client.table("resume_analyses").insert(chunk).execute()
+                inserted = True
+                for offset in range(0, len(chunk_skills), self.chunk_size):
+                    client.table("extracted_skills").insert(chunk_skills[offset:offset + self.chunk_size]).execute()
+            except Exception as e:
+                self.logger.warning(f"Bulk write of {len(ids)} analyses failed: {e}")
+                if inserted:
+                    try:
+                        # extracted_skills rows cascade with their analysis
+                        client.table("resume_analyses").delete().in_("id", ids).execute()
+                    except Exception as cleanup_error:
+                        self.logger.error(f"Could not roll back analyses {ids}: {cleanup_error}")
+                        persisted.extend(ids)
+                        failed.append({"analysis_ids": ids, "error": f"skills not written: {e}",
+                                       "analyses_kept": True})
+                        continue
+                failed.append({"analysis_ids": ids, "error": str(e)})
+                continue
+            persisted.extend(ids)
+        return {"persisted": persisted, "failed": failed}
+
+
+class BulkResumeIngestor:
+    """
+    Ingests a cohort of resumes in stages, each batched across the whole upload:
+
+    1. extract  - PDF/DOCX/TXT text extraction on a process pool (`workers` processes)
+    2. parse    - one spaCy pass over every text with nlp.pipe(batch_size), on `n_process`
+                  worker processes when above 1
+    3. analyze  - rule-based insights per resume, reusing its parsed Doc
+    4. embed    - batched transformer embeddings (also warms the shared embedding cache)
+    5. write    - resume_analyses and extracted_skills rows inserted in bulk; the report
+                  lists only the analyses that were actually persisted
+
+    Without `writer` nothing is written (dry run). Without `embedder` or `nlp` those
+    stages are skipped and the analysis falls back to its regex extractors.
+    """
+
+    def __init__(self, nlp=None, embedder=None, writer: Optional[SupabaseBulkWriter] = None,
+                 workers: Optional[int] = None, batch_size: int = 32, n_process: int = 1,
+                 embed_batch_size: int = 32):
+        from .advanced_nlp_processor import AdvancedNLPProcessor
+        self.nlp = nlp
+        self.embedder = embedder
+        self.writer = writer
+        self.workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.embed_batch_size = embed_batch_size
+        self.logger = config.logger
+        self.analyzer = AdvancedNLPProcessor()
+        self.analyzer.nlp = nlp
+
+    def _extract_all(self, documents: List[Tuple[str, bytes]]) -> List[Tuple[Optional[str], Optional[str]]]:
+        if self.workers <= 1 or len(documents) < 2:
+            return [_extract_text(item) for item in documents]
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=MP_CONTEXT) as pool:
+            return list(pool.map(_extract_text, documents, chunksize=max(1, len(documents) // (self.workers * 4))))
+
+    def _parse_all(self, texts: List[str]) -> List[DocContext]:
+        return list(DocContext.pipe(self.nlp, texts, batch_size=self.batch_size, n_process=self.n_process,
+                                    mp_context=MP_CONTEXT))
+
+    def _analyze_all(self, contexts: List[DocContext]) -> List[Dict[str, Any]]:
+        return [self.analyzer.generate_resume_insights(ctx.text, ctx) for ctx in contexts]
+
+    @staticmethod
+    def _skill_rows(analysis_id: str, insights: Dict[str, Any]) -> List[Dict[str, Any]]:
+        skills = insights.get("skills_analysis", {})
+        levels = skills.get("proficiency_indicators", {})
+        rows = []
+        for category, groups in skills.get("categorized_skills", {}).items():
+            for group in groups:
+                mentions = len(group.get("contexts", [])) or group.get("frequency", 1)
+                rows.append({
+                    "analysis_id": analysis_id,
+                    "skill_name": group["skill_group"],
+                    "confidence": min(95, 50 + 15 * mentions),
+                    "category": category,
+                    "level": SKILL_LEVELS.get(levels.get(group["skill_group"]))
+                })
+        return rows
+
+    async def ingest(self, documents: List[Tuple[str, bytes]], user_id: str) -> Dict[str, Any]:
+        """Run every stage over the documents and return the ingestion report"""
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+
+        def lap(stage: str, since: float) -> float:
+            now = time.perf_counter()
+            timings[stage] = round(now - since, 3)
+            return now
+
+        mark = started
+        extracted = await asyncio.to_thread(self._extract_all, documents)
+        mark = lap("extract", mark)
+
+        failed, accepted = [], []
+        for (filename, content), (text, error) in zip(documents, extracted):
+            if error:
+                failed.append({"filename": filename, "error": error})
+            else:
+                accepted.append((filename, len(content), text))
+        texts = [text for _, _, text in accepted]
+
+        contexts = await asyncio.to_thread(self._parse_all, texts)
+        mark = lap("parse", mark)
+
+        insights = await asyncio.to_thread(self._analyze_all, contexts)
+        mark = lap("analyze", mark)
+
+        if self.embedder is not None and texts:
+            await asyncio.to_thread(self.embedder.embed_texts, texts, self.embed_batch_size)
+        mark = lap("embed", mark)
+
+        analyses, skills, ingested = [], [], []
+        for (filename, size, text), result in zip(accepted, insights):
+            analysis_id = str(uuid.uuid4())
+            analyses.append({
+                "id": analysis_id,
+                "user_id": user_id,
+                "filename": os.path.basename(filename),
+                "file_type": os.path.splitext(filename)[1].lstrip(".").lower(),
+                "file_size": size,
+                "extracted_text": text,
+                "overall_score": result.get("ats_compatibility", {}).get("score"),
+                "analysis_data": result
+            })
+            skills.extend(self._skill_rows(analysis_id, result))
+            ingested.append({"filename": filename, "analysis_id": analysis_id})
+        write_failures = []
+        if self.writer is not None and analyses:
+            written = await asyncio.to_thread(self.writer.write, analyses, skills)
+            persisted = set(written["persisted"])
+            write_failures = written["failed"]
+            by_id = {entry["analysis_id"]: entry for entry in ingested}
+            for failure in write_failures:
+                for analysis_id in failure["analysis_ids"]:
+                    if analysis_id not in persisted:
+                        failed.append({"filename": by_id[analysis_id]["filename"],
+                                       "error": f"not saved: {failure['error']}"})
+            ingested = [entry for entry in ingested if entry["analysis_id"] in persisted]
+            skills = [row for row in skills if row["analysis_id"] in persisted]
+        lap("write", mark)
+
+        total = time.perf_counter() - started
+        self.logger.info(f"Bulk ingestion: {len(ingested)}/{len(documents)} resumes in {total:.2f}s {timings}")
+        return {
+            "total_files": len(documents),
+            "ingested": len(ingested),
+            "failed": failed,
+            "analyses": ingested,
+            "skills_extracted": len(skills),
+            "dry_run": self.writer is None,
+            "write_failures": write_failures,
+            "stage_seconds": timings,
+            "total_seconds": round(total, 3),
+            "resumes_per_second": round(len(ingested) / total, 2) if total > 0 else 0.0
+        }
@@ -19,6 +19,27 @@ class AIConfig:
         self.BERT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
         self.SPACY_MODEL = "en_core_web_sm"
         
+        # Embedding cache settings (empty EMBEDDING_CACHE_DIR disables the disk tier)
+        self.EMBEDDING_CACHE_DIR = os.getenv(
+            "EMBEDDING_CACHE_DIR",
+            os.path.join(os.path.expanduser("~"), ".cache", "bharatintern", "embeddings")
+        )
+        self.EMBEDDING_CACHE_MEMORY_MB = int(os.getenv("EMBEDDING_CACHE_MEMORY_MB", "64"))
+
+        # LLM response cache settings (empty LLM_CACHE_PATH disables it, TTL 0 never expires)
+        self.LLM_CACHE_PATH = os.getenv(
+            "LLM_CACHE_PATH",
+            os.path.join(os.path.expanduser("~"), ".cache", "bharatintern", "llm_responses.sqlite3")
+        )
+        self.LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "168"))
+        self.LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "256"))
+
+        # Content-addressed analysis store. It holds full resume text, so it stays in memory
+        # unless ANALYSIS_STORE_PATH is set, and artifacts expire after the TTL (0 never expires)
+        self.ANALYSIS_STORE_PATH = os.getenv("ANALYSIS_STORE_PATH", "")
+        self.ANALYSIS_STORE_MAX_MB = int(os.getenv("ANALYSIS_STORE_MAX_MB", "512"))
+        self.ANALYSIS_STORE_TTL_HOURS = float(os.getenv("ANALYSIS_STORE_TTL_HOURS", "24"))
+
         # TF-IDF settings
         self.TFIDF_CONFIG = {
             "max_features": 1000,
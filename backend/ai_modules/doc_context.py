@@ -0,0 +1,172 @@
+"""Per-request spaCy analysis context: the resume is parsed once and the Doc is shared by every extractor"""
+import os
+import shutil
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from .micro_batcher import batcher_for
+
+# Pipes the extractors read from: entities, sentences, POS tags and the embedding layer they depend on
+DEFAULT_COMPONENTS = ("tok2vec", "transformer", "tagger", "attribute_ruler", "parser", "senter",
+                      "sentencizer", "ner", "entity_ruler")
+
+
+class DocContext:
+    """
+    Lazily parses `text` with `nlp` on first access, running only the pipes in
+    `components` (the lemmatizer and anything else the extractors never read is
+    disabled), then caches the Doc and the token views derived from it.
+
+    Build one per request and pass it to each extractor so a resume costs a single
+    spaCy parse however many analyzers look at it. Without a model (`nlp` is None)
+    `doc` is None and the derived views are empty.
+    """
+
+    def __init__(self, nlp, text: str, components: Sequence[str] = DEFAULT_COMPONENTS):
+        self.nlp = nlp
+        self.text = text
+        self.components = tuple(components)
+
+    @classmethod
+    def ensure(cls, ctx: Optional["DocContext"], nlp, text: str) -> "DocContext":
+        """Reuse ctx when it was built for this text, otherwise start a new context"""
+        if ctx is not None and ctx.text == text:
+            return ctx
+        return cls(nlp, text)
+
+    @classmethod
+    def pipe(cls, nlp, texts: Sequence[str], batch_size: int = 32, n_process: int = 1,
+             components: Sequence[str] = DEFAULT_COMPONENTS,
+             mp_context=None) -> Iterator["DocContext"]:
+        """
+        Contexts for many texts, parsed together with nlp.pipe (in input order).
+
+        With n_process > 1 (-1: one per CPU) the texts are parsed on a process pool
+        started with `mp_context` (spawn by default), not by nlp.pipe's own workers:
+        those always use the default start method, and forking a multi-threaded process
+        is not safe. The pipeline is written to a temporary directory for the workers to
+        load, and the Docs come back serialized.
+        """
+        if nlp is None:
+            for text in texts:
+                yield cls(None, text, components)
+            return
+        disabled = [name for name in nlp.pipe_names if name not in components]
+        if n_process == -1:
+            n_process = os.cpu_count() or 1
+        if n_process > 1 and len(texts) > batch_size:
+            chunks = [list(texts[start:start + batch_size]) for start in range(0, len(texts), batch_size)]
+            model_dir = tempfile.mkdtemp(prefix="doc-context-nlp-")
+            try:
+                nlp.to_disk(model_dir)
+                with ProcessPoolExecutor(max_workers=min(n_process, len(chunks)),
+                                         mp_context=mp_context or multiprocessing.get_context("spawn"),
+                                         initializer=_load_worker_nlp, initargs=(model_dir, disabled)) as pool:
+                    i = 0
+                    for chunk in pool.map(_parse_chunk, chunks, [batch_size] * len(chunks)):
+                        for data in chunk:
+                            yield cls.from_bytes(nlp, texts[i], data, components)
+                            i += 1
+            finally:
+                shutil.rmtree(model_dir, ignore_errors=True)
+            return
+        docs = nlp.pipe(texts, batch_size=batch_size, disable=disabled)
+        for i, doc in enumerate(docs):
+            ctx = cls(nlp, texts[i], components)
+            ctx.__dict__["doc"] = doc  # pre-fill the cached_property
+            yield ctx
+
+    @classmethod
+    def from_bytes(cls, nlp, text: str, data: bytes,
+                   components: Sequence[str] = DEFAULT_COMPONENTS) -> "DocContext":
+        """Context around a Doc serialized with to_bytes, so the text is not parsed again"""
+        from spacy.tokens import Doc
+        ctx = cls(nlp, text, components)
+        ctx.__dict__["doc"] = Doc(nlp.vocab).from_bytes(data)
+        return ctx
+
+    def parse_batched(self) -> "DocContext":
+        """
+        Parse through the pipeline's shared micro-batcher, so resumes arriving together
+        share one nlp.pipe call (NER and the parser run batched). Blocks until parsed; call
+        it from a worker thread, not the event loop.
+        """
+        if self.nlp is not None and "doc" not in self.__dict__:
+            nlp, disabled = self.nlp, [name for name in self.nlp.pipe_names if name not in self.components]
+            name = "spacy" if self.components == DEFAULT_COMPONENTS else f"spacy:{','.join(self.components)}"
+            batcher = batcher_for(name, nlp,
+                                  lambda texts: list(nlp.pipe(texts, disable=disabled)))
+            self.__dict__["doc"] = batcher.run([self.text])[0]
+        return self
+
+    def to_bytes(self) -> Optional[bytes]:
+        """The parsed Doc serialized for storage (None without a model)"""
+        return self.doc.to_bytes() if self.available else None
+
+    @property
+    def fingerprint(self) -> str:
+        """Model name, version and pipes, so stored Docs from another pipeline are not reused"""
+        if self.nlp is None:
+            return "none"
+        meta = getattr(self.nlp, "meta", {}) or {}
+        pipes = ",".join(name for name in self.nlp.pipe_names if name in self.components)
+        return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}:{pipes}"
+
+    @cached_property
+    def doc(self):
+        if self.nlp is None:
+            return None
+        disabled = [name for name in self.nlp.pipe_names if name not in self.components]
+        return self.nlp(self.text, disable=disabled)
+
+    @property
+    def available(self) -> bool:
+        return self.doc is not None
+
+    @cached_property
+    def tokens(self) -> List[Any]:
+        """Tokens that are not whitespace"""
+        return [token for token in self.doc if not token.is_space] if self.available else []
+
+    @cached_property
+    def words(self) -> List[Any]:
+        """Tokens that are neither whitespace nor punctuation"""
+        return [token for token in self.tokens if not token.is_punct]
+
+    @cached_property
+    def sentences(self) -> List[Any]:
+        if not self.available or not self.doc.has_annotation("SENT_START"):
+            return []
+        return list(self.doc.sents)
+
+    @cached_property
+    def entities(self) -> List[Any]:
+        return list(self.doc.ents) if self.available else []
+
+    def entities_by_label(self, label: str, before: Optional[int] = None) -> List[Any]:
+        """Entities with the given label, optionally only those starting before a character offset"""
+        return [ent for ent in self.entities
+                if ent.label_ == label and (before is None or ent.start_char < before)]
+
+    @cached_property
+    def pos_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for token in self.words:
+            counts[token.pos_] = counts.get(token.pos_, 0) + 1
+        return counts
+
+
+# Pipeline of a DocContext.pipe worker process, loaded once by the pool initializer
+_worker_nlp = None
+
+
+def _load_worker_nlp(model_dir: str, disabled: List[str]):
+    global _worker_nlp
+    import spacy
+    _worker_nlp = spacy.load(model_dir, disable=disabled)
+
+
+def _parse_chunk(texts: List[str], batch_size: int) -> List[bytes]:
+    return [doc.to_bytes() for doc in _worker_nlp.pipe(texts, batch_size=batch_size)]
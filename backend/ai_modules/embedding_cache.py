@@ -0,0 +1,214 @@
+"""Two-tier embedding cache keyed by model name and normalized text hash"""
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from .config import config
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+    fcntl = None
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies share a key"""
+    return " ".join(text.split())
+
+
+def text_hash(text: str) -> str:
+    """Stable content hash of the normalized text"""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """Append-only memory-mapped float32 matrix plus a hash -> row index file"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.index_path = os.path.join(directory, "index.tsv")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.dim: Optional[int] = None
+        self.index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._matrix = None
+        os.makedirs(directory, exist_ok=True)
+        self._load_meta()
+
+    def _load_meta(self):
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dim = json.load(f).get("dim")
+
+    def _refresh_index(self):
+        """Pick up rows appended by this or any other process"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            f.seek(self._index_offset)
+            for line in f:
+                if not line.endswith("\n"):
+                    break  # Partially written line, read it next time
+                key, row = line.rstrip("\n").split("\t")
+                self.index[key] = int(row)
+                self._index_offset += len(line.encode("utf-8"))
+
+    def _rows_on_disk(self) -> int:
+        if not self.dim or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (self.dim * 4)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.index.get(key)
+        if row is None:
+            self._refresh_index()
+            row = self.index.get(key)
+            if row is None:
+                return None
+
+        if self._matrix is None or row >= self._matrix.shape[0]:
+            rows = self._rows_on_disk()
+            if row >= rows:
+                return None
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim))
+        return np.array(self._matrix[row])
+
+    def put(self, key: str, vector: np.ndarray):
+        if self.dim is None:
+            self.dim = int(vector.shape[0])
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump({"dim": self.dim}, f)
+        if vector.shape[0] != self.dim:
+            return
+
+        with open(self.vectors_path, "ab") as f:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0, os.SEEK_END)
+                row = f.tell() // (self.dim * 4)
+                f.write(vector.astype(np.float32).tobytes())
+                f.flush()
+                with open(self.index_path, "a", encoding="utf-8") as index_file:
+                    index_file.write(f"{key}\t{row}\n")
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+        self.index[key] = row
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+class EmbeddingCache:
+    """
+    In-process LRU tier (bounded by memory) in front of an on-disk tier.
+    Keys are (model name, normalized text hash); values are float32 vectors.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, memory_limit_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_limit_bytes = memory_limit_bytes
+        self.logger = config.logger
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_tiers: Dict[str, Optional[_DiskTier]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _disk_tier(self, model_name: str) -> Optional[_DiskTier]:
+        if not self.cache_dir:
+            return None
+        if model_name not in self._disk_tiers:
+            safe_name = model_name.replace("/", "__")
+            try:
+                self._disk_tiers[model_name] = _DiskTier(os.path.join(self.cache_dir, safe_name))
+            except OSError as e:
+                self.logger.warning(f"Embedding disk cache unavailable: {e}")
+                self._disk_tiers[model_name] = None
+        return self._disk_tiers[model_name]
+
+    def _remember(self, key: Tuple[str, str], vector: np.ndarray):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return
+        self._memory[key] = vector
+        self._memory_bytes += vector.nbytes
+        while self._memory_bytes > self.memory_limit_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            self.stats["evictions"] += 1
+
+    def get(self, model_name: str, text: str) -> Optional[np.ndarray]:
+        """Cached embedding for text, or None on a miss"""
+        key = (model_name, text_hash(text))
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return vector
+
+            disk = self._disk_tier(model_name)
+            if disk is not None:
+                try:
+                    vector = disk.get(key[1])
+                except (OSError, ValueError) as e:
+                    self.logger.warning(f"Embedding disk cache read failed: {e}")
+                    vector = None
+                if vector is not None:
+                    self._remember(key, vector)
+                    self.stats["disk_hits"] += 1
+                    return vector
+
+            self.stats["misses"] += 1
+            return None
+
+    def put(self, model_name: str, text: str, vector) -> np.ndarray:
+        """Store an embedding in both tiers and return it as float32"""
+        vector = np.ascontiguousarray(vector, dtype=np.float32).reshape(-1)
+        key = (model_name, text_hash(text))
+        with self._lock:
+            self._remember(key, vector)
+            disk = self._disk_tier(model_name)
+            if disk is not None and key[1] not in disk.index:
+                try:
+                    disk.put(key[1], vector)
+                except OSError as e:
+                    self.logger.warning(f"Embedding disk cache write failed: {e}")
+            self.stats["writes"] += 1
+        return vector
+
+    def clear_memory(self):
+        """Drop the in-process tier (the disk tier is kept)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            return {
+                **self.stats,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_limit_bytes": self.memory_limit_bytes,
+                "disk_entries": {name: len(tier) for name, tier in self._disk_tiers.items() if tier is not None},
+                "cache_dir": self.cache_dir
+            }
+
+
+# Global cache instance shared by every NLPProcessor in the process
+embedding_cache = EmbeddingCache(
+    cache_dir=config.EMBEDDING_CACHE_DIR or None,
+    memory_limit_bytes=config.EMBEDDING_CACHE_MEMORY_MB * 1024 * 1024
+)
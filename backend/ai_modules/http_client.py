@@ -0,0 +1,167 @@
+"""Shared async HTTP client with keep-alive pools and per-host concurrency limits for outbound API calls"""
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlsplit
+from .config import config
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+    HTTPError = httpx.HTTPError
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+    HTTPError = OSError
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class AsyncHTTPPool:
+    """
+    One httpx.AsyncClient per event loop, reused for every call so connections stay
+    alive between requests (HTTP/2 when h2 is installed).
+
+    Each host gets its own semaphore (`per_host_limit`, overridable in `host_limits`) so a
+    burst to one slow provider cannot take every pooled connection. Timeouts are split:
+    `connect_timeout` to open a connection, `read_timeout` between bytes of the response
+    and `total_timeout` for the whole call including waiting for a slot.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 20, keepalive_expiry: float = 30.0,
+                 per_host_limit: int = 16, host_limits: Optional[Dict[str, int]] = None,
+                 connect_timeout: float = 5.0, read_timeout: float = 60.0, total_timeout: float = 90.0):
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self.keepalive_expiry = keepalive_expiry
+        self.per_host_limit = per_host_limit
+        self.host_limits = dict(host_limits or {})
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.logger = config.logger
+        # Clients and semaphores are bound to the loop that created them
+        self._loops: Dict[int, Dict[str, Any]] = {}
+        self.stats = {"requests": 0, "errors": 0, "timeouts": 0, "clients_created": 0}
+
+    def _state(self) -> Dict[str, Any]:
+        if not HTTPX_AVAILABLE:
+            raise RuntimeError("httpx is not installed. Install with: pip install 'httpx[http2]'")
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(id(loop))
+        if state is None or state["loop"] is not loop or state["client"].is_closed:
+            # Forget clients of loops that have gone away (e.g. finished asyncio.run calls)
+            self._loops = {key: s for key, s in self._loops.items() if not s["loop"].is_closed()}
+            state = {
+                "loop": loop,
+                "client": httpx.AsyncClient(
+                    http2=HTTP2_AVAILABLE,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_keepalive,
+                        keepalive_expiry=self.keepalive_expiry
+                    ),
+                    timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+                ),
+                "hosts": {}
+            }
+            self._loops[id(loop)] = state
+            self.stats["clients_created"] += 1
+        return state
+
+    def _host_slot(self, state: Dict[str, Any], url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        semaphore = state["hosts"].get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.host_limits.get(host, self.per_host_limit))
+            state["hosts"][host] = semaphore
+        return semaphore
+
+    async def request(self, method: str, url: str, read_timeout: Optional[float] = None,
+                      total_timeout: Optional[float] = None, **kwargs) -> "httpx.Response":
+        """Send one request through the shared client; raises httpx errors or asyncio.TimeoutError"""
+        state = self._state()
+        if read_timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(read_timeout, connect=self.connect_timeout)
+
+        async def send():
+            async with self._host_slot(state, url):
+                return await state["client"].request(method, url, **kwargs)
+
+        self.stats["requests"] += 1
+        try:
+            return await asyncio.wait_for(send(), timeout=total_timeout or self.total_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, read_timeout: Optional[float] = None,
+                     **kwargs) -> AsyncIterator["httpx.Response"]:
+        """
+        Streamed request through the shared client; the host slot is held until the body is
+        consumed. No total timeout applies, only connect and read (between chunks) timeouts.
+        """
+        state = self._state()
+        if read_timeout is not None:
+            kwargs["timeout"] = httpx.Timeout(read_timeout, connect=self.connect_timeout)
+        self.stats["requests"] += 1
+        try:
+            async with self._host_slot(state, url):
+                async with state["client"].stream(method, url, **kwargs) as response:
+                    yield response
+        except httpx.TimeoutException:
+            self.stats["timeouts"] += 1
+            raise
+        except HTTPError:
+            self.stats["errors"] += 1
+            raise
+
+    async def post(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self):
+        """Close the current loop's client (call from the app's shutdown hook)"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        state = self._loops.pop(id(loop), None)
+        if state is not None:
+            await state["client"].aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "http2": HTTP2_AVAILABLE,
+            "open_clients": sum(1 for s in self._loops.values() if not s["client"].is_closed),
+            "per_host_limit": self.per_host_limit,
+            "host_limits": self.host_limits,
+            "timeouts_config": {
+                "connect": self.connect_timeout,
+                "read": self.read_timeout,
+                "total": self.total_timeout
+            }
+        }
+
+
+# Global pool shared by every analyzer in the process
+http_pool = AsyncHTTPPool(
+    max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+    max_keepalive=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+    per_host_limit=int(os.getenv("HTTP_PER_HOST_LIMIT", "16")),
+    connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+    read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", "60")),
+    total_timeout=float(os.getenv("HTTP_TOTAL_TIMEOUT", "90")),
+)
@@ -7,10 +7,11 @@ from .nlp_processor import NLPProcessor
 class InterviewAssessor(BaseAIModel):
     """AI-powered interview assessment using Gemini"""
     
-    def __init__(self):
+    def __init__(self, nlp_processor: Optional[NLPProcessor] = None):
         super().__init__("Interview_Assessor")
         self.gemini_model = None
-        self.nlp_processor = None
+        # Shared NLPProcessor injected by the orchestrator; created on initialize otherwise
+        self.nlp_processor = nlp_processor
         
     async def initialize(self) -> bool:
         """Initialize the interview assessor"""
@@ -22,8 +23,9 @@ class InterviewAssessor(BaseAIModel):
             self.gemini_model = genai.GenerativeModel('gemini-pro')
             
             # Initialize NLP processor
-            self.nlp_processor = NLPProcessor()
-            await self.nlp_processor.initialize()
+            if self.nlp_processor is None:
+                self.nlp_processor = NLPProcessor()
+            await self.nlp_processor.ensure_initialized()
             
             self.is_initialized = True
             self.logger.info("Interview Assessor initialized successfully")
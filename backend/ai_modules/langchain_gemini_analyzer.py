@@ -4,6 +4,7 @@ import os
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
+from .llm_cache import llm_cache, template_version
 
 # LangChain imports
 try:
@@ -258,11 +259,18 @@ Make questions specific, relevant, and challenging but fair for their experience
         try:
             logger.info("🔍 Starting LLM-powered resume analysis...")
             
-            # Run analysis chain
-            analysis_result = await self.analysis_chain.arun(
-                resume_text=resume_text,
-                job_description=job_description or "General analysis - no specific job description provided"
-            )
+            inputs = {
+                "resume_text": resume_text,
+                "job_description": job_description or "General analysis - no specific job description provided"
+            }
+            version = template_version(self.analysis_chain.prompt.template)
+            
+            # Re-analysis of an unchanged resume is served from the response cache
+            analysis_result = await llm_cache.aget("gemini", "chat-bison-001", "resume_analysis", version, inputs)
+            cached = analysis_result is not None
+            if not cached:
+                analysis_result = await self.analysis_chain.arun(**inputs)
+                await llm_cache.aput("gemini", "chat-bison-001", "resume_analysis", version, inputs, analysis_result)
             
             # Parse and structure the result
             structured_analysis = self._parse_analysis_result(analysis_result)
@@ -273,6 +281,7 @@ Make questions specific, relevant, and challenging but fair for their experience
                 "analysis_type": "langchain_gemini",
                 "model_used": "chat-bison-001",
                 "job_context_provided": bool(job_description),
+                "cached": cached,
                 "raw_analysis": analysis_result
             })
             
@@ -6,7 +6,8 @@ Implements a comprehensive matching system using free LLM APIs (Gemini/HuggingFa
 import os
 import logging
 import json
-from typing import Dict, List, Any, Optional, Union
+import asyncio
+from typing import Dict, List, Any, AsyncIterator, Optional, Union
 from datetime import datetime
 from enum import Enum
 
@@ -40,8 +41,13 @@ except ImportError:
     print("Warning: Pydantic not available. Install with: pip install pydantic")
     PYDANTIC_AVAILABLE = False
 
+from .llm_scheduler import LLMScheduler, gather_unordered, scheduler_for
+
 logger = logging.getLogger(__name__)
 
+# Opportunities scored per LLM call in batch matching (1 = one call per pair)
+MATCH_PACK_SIZE = int(os.getenv("LANGCHAIN_MATCH_PACK_SIZE", "4"))
+
 class FitLevel(str, Enum):
     """Enumeration for match fit levels"""
     STRONG_FIT = "strong fit"
@@ -174,9 +180,11 @@ class LangChainMatchingEngine:
     def __init__(self):
         self.llm = None
         self.matching_chain = None
+        self.packed_chain = None
         self.parser = None
         self.initialized = False
         self.api_type = None  # 'gemini' or 'huggingface'
+        self.scheduler: Optional[LLMScheduler] = None
         
         # API configurations
         self.gemini_api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_AI_API_KEY')
@@ -194,18 +202,21 @@ class LangChainMatchingEngine:
             # Try Gemini first (free tier available)
             if self.gemini_api_key and await self._initialize_gemini():
                 self.api_type = 'gemini'
+                self.scheduler = scheduler_for(self.api_type)
                 logger.info("✅ Initialized with Google Gemini API")
                 return True
             
             # Fallback to HuggingFace Inference API
             elif self.huggingface_api_token and await self._initialize_huggingface():
                 self.api_type = 'huggingface'
+                self.scheduler = scheduler_for(self.api_type)
                 logger.info("✅ Initialized with HuggingFace Inference API")
                 return True
             
             # Final fallback to local HuggingFace model
             elif await self._initialize_local_huggingface():
                 self.api_type = 'local_huggingface'
+                self.scheduler = scheduler_for(self.api_type)
                 logger.info("✅ Initialized with local HuggingFace model")
                 return True
             
@@ -352,6 +363,46 @@ IMPORTANT:
                 verbose=True
             )
             
+            # Packed variant: one candidate against several opportunities per call
+            packed_template = PromptTemplate(
+                input_variables=[
+                    "candidate_data", "opportunities_data", "opportunity_count", "format_instructions"
+                ],
+                template="""
+You are an expert AI matching specialist with deep knowledge of candidate-opportunity matching, 
+industry requirements, and career development. Assess the candidate below against EACH of the 
+{opportunity_count} numbered opportunities independently.
+
+CANDIDATE PROFILE:
+{candidate_data}
+
+OPPORTUNITIES:
+{opportunities_data}
+
+For each opportunity consider skill alignment, experience match, cultural & soft skills fit, 
+location & preferences and career growth potential, then give a precise match score (0-100), 
+a fit level (strong fit, good fit, moderate fit, weak fit, poor fit) and your confidence (0-1), 
+with specific, actionable insights and recommendations.
+
+Return ONLY a JSON array with exactly {opportunity_count} objects, one per opportunity, in the 
+same order. Each object must have an "opportunity_index" field with the opportunity's number and 
+otherwise follow this schema:
+
+{format_instructions}
+
+IMPORTANT: 
+- Be objective and fair in your assessment
+- Ensure match_score is a number between 0-100
+- Ensure confidence_score is a number between 0-1
+- Choose fit_level from: strong fit, good fit, moderate fit, weak fit, poor fit
+"""
+            )
+            self.packed_chain = LLMChain(
+                llm=self.llm,
+                prompt=packed_template,
+                verbose=True
+            )
+            
             logger.info("✅ Matching chain created successfully")
             
         except Exception as e:
@@ -379,16 +430,20 @@ IMPORTANT:
                 "success": False
             }
         
+        # Validate and convert input data
+        candidate_data = await self._validate_candidate_data(candidate)
+        opportunity_data = await self._validate_opportunity_data(opportunity)
+        
+        if candidate_data.get("error"):
+            return candidate_data
+        if opportunity_data.get("error"):
+            return opportunity_data
+        
+        return await self._match_validated(candidate_data, opportunity_data)
+    
+    async def _match_validated(self, candidate_data: Dict[str, Any], opportunity_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the matching chain for already validated candidate/opportunity data"""
         try:
-            # Validate and convert input data
-            candidate_data = await self._validate_candidate_data(candidate)
-            opportunity_data = await self._validate_opportunity_data(opportunity)
-            
-            if candidate_data.get("error"):
-                return candidate_data
-            if opportunity_data.get("error"):
-                return opportunity_data
-            
             logger.info("🔍 Starting LangChain matching analysis...")
             
             # Prepare data for the chain
@@ -396,19 +451,13 @@ IMPORTANT:
             opportunity_json = json.dumps(opportunity_data, indent=2)
             format_instructions = self.parser.get_format_instructions()
             
-            # Run the matching chain
-            if self.api_type == 'gemini':
-                result = await self.matching_chain.arun(
-                    candidate_data=candidate_json,
-                    opportunity_data=opportunity_json,
-                    format_instructions=format_instructions
-                )
-            else:
-                result = self.matching_chain.run(
-                    candidate_data=candidate_json,
-                    opportunity_data=opportunity_json,
-                    format_instructions=format_instructions
-                )
+            # Run the matching chain within the provider's concurrency/rate limits
+            result = await self.scheduler.run(
+                self._run_matching_chain,
+                candidate_data=candidate_json,
+                opportunity_data=opportunity_json,
+                format_instructions=format_instructions
+            )
             
             # Parse the structured output
             try:
@@ -439,6 +488,90 @@ IMPORTANT:
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def _run_matching_chain(self, chain=None, **inputs) -> str:
+        """One LLM round trip through the matching chain (or the given chain)"""
+        chain = chain or self.matching_chain
+        if self.api_type == 'gemini':
+            return await chain.arun(**inputs)
+        # HuggingFace pipelines are synchronous; keep them off the event loop
+        return await asyncio.to_thread(chain.run, **inputs)
+    
+    async def _match_packed(
+        self, 
+        candidate_data: Dict[str, Any], 
+        opportunities_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Score one candidate against several opportunities in a single LLM call.
+        Each returned item is validated as a MatchingResult on its own; items that are
+        missing or fail validation are re-run as individual pair calls.
+        """
+        if len(opportunities_data) == 1:
+            return [await self._match_validated(candidate_data, opportunities_data[0])]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(opportunities_data)
+        try:
+            raw = await self.scheduler.run(
+                self._run_matching_chain,
+                chain=self.packed_chain,
+                candidate_data=json.dumps(candidate_data, indent=2),
+                opportunities_data="\n\n".join(
+                    f"OPPORTUNITY {k + 1}:\n{json.dumps(o, indent=2)}" for k, o in enumerate(opportunities_data)
+                ),
+                opportunity_count=len(opportunities_data),
+                format_instructions=self.parser.get_format_instructions()
+            )
+            for k, item in self._parse_packed_items(raw, len(opportunities_data)).items():
+                try:
+                    matching_result = MatchingResult(**item).dict()
+                except Exception as e:
+                    logger.warning(f"Packed item {k + 1} failed validation: {e}")
+                    continue
+                matching_result.update({
+                    "timestamp": datetime.now().isoformat(),
+                    "api_type": self.api_type,
+                    "success": True,
+                    "packed": True,
+                    "raw_output": json.dumps(item)
+                })
+                results[k] = matching_result
+        except Exception as e:
+            logger.warning(f"Packed matching call failed, falling back to pair calls: {e}")
+        
+        missing = [k for k, r in enumerate(results) if r is None]
+        if missing:
+            fallback = await asyncio.gather(
+                *(self._match_validated(candidate_data, opportunities_data[k]) for k in missing)
+            )
+            for k, result in zip(missing, fallback):
+                results[k] = result
+        return results
+    
+    @staticmethod
+    def _parse_packed_items(raw: str, count: int) -> Dict[int, Dict[str, Any]]:
+        """Pull the JSON array out of a packed response, keyed by 0-based opportunity position"""
+        start, end = raw.find("["), raw.rfind("]")
+        if start < 0 or end <= start:
+            return {}
+        try:
+            items = json.loads(raw[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+        
+        parsed = {}
+        for position, item in enumerate(items if isinstance(items, list) else []):
+            if not isinstance(item, dict):
+                continue
+            item = dict(item)
+            index = item.pop("opportunity_index", position + 1)
+            try:
+                k = int(index) - 1
+            except (TypeError, ValueError):
+                k = position
+            if 0 <= k < count and k not in parsed:
+                parsed[k] = item
+        return parsed
+    
     async def _validate_candidate_data(self, candidate: Union[Candidate, Dict[str, Any]]) -> Dict[str, Any]:
         """Validate and normalize candidate data"""
         try:
@@ -541,6 +674,49 @@ IMPORTANT:
                 "timestamp": datetime.now().isoformat()
             }
     
+    async def iter_batch_matches(
+        self, 
+        candidates: List[Union[Candidate, Dict[str, Any]]], 
+        opportunities: List[Union[Opportunity, Dict[str, Any]]],
+        pack_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Match every candidate to every opportunity concurrently, yielding each pair
+        as soon as it completes:
+        {"candidate_index": i, "opportunity_index": j, "result": {...}}
+        With Gemini, up to `pack_size` opportunities are scored per LLM call.
+        Concurrency, rate limits, retries and per-call timeouts come from self.scheduler.
+        """
+        if pack_size is None:
+            pack_size = MATCH_PACK_SIZE if self.api_type == 'gemini' else 1
+        pack_size = max(1, pack_size)
+        
+        # Validate each record once rather than once per pair
+        candidate_data = [await self._validate_candidate_data(c) for c in candidates]
+        opportunity_data = [await self._validate_opportunity_data(o) for o in opportunities]
+        valid_opportunities = [j for j, o_data in enumerate(opportunity_data) if not o_data.get("error")]
+        
+        packs = []
+        for i, c_data in enumerate(candidate_data):
+            for j, o_data in enumerate(opportunity_data):
+                if c_data.get("error") or o_data.get("error"):
+                    yield {"candidate_index": i, "opportunity_index": j,
+                           "result": c_data if c_data.get("error") else o_data}
+            if c_data.get("error"):
+                continue
+            for start in range(0, len(valid_opportunities), pack_size):
+                js = valid_opportunities[start:start + pack_size]
+                packs.append(((i, js), (c_data, [opportunity_data[j] for j in js])))
+        
+        # Every pack starts at once; self.scheduler decides how many LLM calls are in flight
+        async for (i, js), results in gather_unordered(self._match_packed, packs):
+            if isinstance(results, Exception):
+                error = {"error": f"Matching analysis failed: {str(results)}", "success": False,
+                         "timestamp": datetime.now().isoformat()}
+                results = [error] * len(js)
+            for j, result in zip(js, results):
+                yield {"candidate_index": i, "opportunity_index": j, "result": result}
+    
     async def batch_match_candidates(
         self, 
         candidates: List[Union[Candidate, Dict[str, Any]]], 
@@ -551,21 +727,19 @@ IMPORTANT:
             if not self.initialized:
                 return {"error": "Matching engine not initialized", "success": False}
             
+            matches: List[List[Any]] = [[None] * len(opportunities) for _ in candidates]
+            async for item in self.iter_batch_matches(candidates, opportunities):
+                result = item["result"]
+                if result.get("success", False):
+                    matches[item["candidate_index"]][item["opportunity_index"]] = result
+                else:
+                    logger.warning(f"Failed to match candidate to opportunity: {result.get('error')}")
+            
             results = []
             total_matches = 0
-            
-            for candidate in candidates:
-                candidate_results = []
-                
-                for opportunity in opportunities:
-                    match_result = await self.match_candidate_to_opportunity(candidate, opportunity)
-                    
-                    if match_result.get("success", False):
-                        total_matches += 1
-                        candidate_results.append(match_result)
-                    else:
-                        logger.warning(f"Failed to match candidate to opportunity: {match_result.get('error')}")
-                
+            for candidate, row in zip(candidates, matches):
+                candidate_results = [m for m in row if m is not None]
+                total_matches += len(candidate_results)
                 results.append({
                     "candidate": candidate,
                     "matches": candidate_results,
@@ -598,6 +772,7 @@ IMPORTANT:
             "huggingface_available": bool(self.huggingface_api_token),
             "langchain_available": LANGCHAIN_AVAILABLE,
             "pydantic_available": PYDANTIC_AVAILABLE,
+            "scheduler": self.scheduler.get_stats() if self.scheduler else None,
             "timestamp": datetime.now().isoformat()
         }
 
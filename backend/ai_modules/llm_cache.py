@@ -0,0 +1,228 @@
+"""Persistent LLM response cache keyed by provider, model, prompt template version and normalized inputs"""
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+from .config import config
+
+
+def normalize_inputs(inputs: Dict[str, Any]) -> str:
+    """Canonical JSON of the prompt inputs with whitespace collapsed in every string"""
+    def normalize(value):
+        if isinstance(value, str):
+            return " ".join(value.split())
+        if isinstance(value, dict):
+            return {str(k): normalize(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        return value
+    return json.dumps(normalize(inputs), sort_keys=True, ensure_ascii=False, default=str)
+
+
+def template_version(template: str) -> str:
+    """Short content hash of a prompt template, so editing the template changes every key"""
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    template TEXT NOT NULL,
+    template_version TEXT NOT NULL,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_template ON responses (template, template_version);
+"""
+
+
+class LLMResponseCache:
+    """
+    SQLite-backed cache of LLM responses shared by every process on the host.
+    Entries expire after `default_ttl` seconds and the least recently used ones are
+    evicted once the stored values exceed `max_bytes`. Values are anything JSON-serializable.
+    """
+
+    def __init__(self, path: Optional[str] = None, default_ttl: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.logger = config.logger
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "expired": 0, "evictions": 0, "errors": 0}
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        if self._conn is None:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+                # WAL lets API workers read while another process writes
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                self._conn = conn
+            except (OSError, sqlite3.Error) as e:
+                self.logger.warning(f"LLM response cache unavailable: {e}")
+                self.path = None
+                return None
+        return self._conn
+
+    @staticmethod
+    def make_key(provider: str, model: str, template: str, version: str, inputs: Dict[str, Any]) -> str:
+        raw = "\x1f".join([provider, model or "", template, version, normalize_inputs(inputs)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, provider: str, model: str, template: str, version: str, inputs: Dict[str, Any]) -> Optional[Any]:
+        """Cached response, or None on a miss or an expired entry"""
+        key = self.make_key(provider, model, template, version, inputs)
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+                now = time.time()
+                if row is not None and row[1] is not None and row[1] <= now:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.stats["expired"] += 1
+                    row = None
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                self.stats["hits"] += 1
+                return json.loads(row[0])
+            except (sqlite3.Error, ValueError) as e:
+                self.logger.warning(f"LLM response cache read failed: {e}")
+                self.stats["errors"] += 1
+                return None
+
+    def put(self, provider: str, model: str, template: str, version: str, inputs: Dict[str, Any],
+            value: Any, ttl: Optional[float] = None):
+        """Store a response; ttl=None uses the cache default"""
+        key = self.make_key(provider, model, template, version, inputs)
+        ttl = self.default_ttl if ttl is None else ttl
+        try:
+            payload = json.dumps(value, ensure_ascii=False, default=str)
+        except (TypeError, ValueError) as e:
+            self.logger.warning(f"LLM response not cacheable: {e}")
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider, model or "", template, version, payload, len(payload.encode("utf-8")),
+                     now, now + ttl if ttl else None, now)
+                )
+                self.stats["writes"] += 1
+                self._evict(conn)
+            except sqlite3.Error as e:
+                self.logger.warning(f"LLM response cache write failed: {e}")
+                self.stats["errors"] += 1
+
+    async def aget(self, provider: str, model: str, template: str, version: str,
+                   inputs: Dict[str, Any]) -> Optional[Any]:
+        """get() for coroutines: the SQLite read (and a writer's busy timeout) runs in a worker thread"""
+        return await asyncio.to_thread(self.get, provider, model, template, version, inputs)
+
+    async def aput(self, provider: str, model: str, template: str, version: str, inputs: Dict[str, Any],
+                   value: Any, ttl: Optional[float] = None):
+        """put() for coroutines, in a worker thread"""
+        await asyncio.to_thread(self.put, provider, model, template, version, inputs, value, ttl)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop expired entries, then least recently used ones, until back under max_bytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        self.stats["expired"] += conn.execute(
+            "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        ).rowcount
+        # Trim to 90% so a full cache does not evict on every write
+        target = int(self.max_bytes * 0.9)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= target:
+            return
+        freed, keys = 0, []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            keys.append((key,))
+            freed += size
+            if total - freed <= target:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+        self.stats["evictions"] += len(keys)
+
+    def invalidate(self, template: Optional[str] = None, keep_version: Optional[str] = None,
+                   provider: Optional[str] = None) -> int:
+        """
+        Delete cached responses, optionally limited to one template and/or provider.
+        With keep_version, only entries from other versions of the template are removed.
+        Returns the number of entries deleted.
+        """
+        clauses, params = [], []
+        if template is not None:
+            clauses.append("template = ?")
+            params.append(template)
+        if keep_version is not None:
+            clauses.append("template_version != ?")
+            params.append(keep_version)
+        if provider is not None:
+            clauses.append("provider = ?")
+            params.append(provider)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            conn = self._connection()
+            if conn is None:
+                return 0
+            try:
+                return conn.execute(f"DELETE FROM responses{where}", params).rowcount
+            except sqlite3.Error as e:
+                self.logger.warning(f"LLM response cache invalidation failed: {e}")
+                return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and store size"""
+        with self._lock:
+            entries, size = 0, 0
+            conn = self._connection()
+            if conn is not None:
+                try:
+                    entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+                except sqlite3.Error:
+                    pass
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups else 0.0,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "default_ttl": self.default_ttl,
+                "path": self.path
+            }
+
+
+# Global cache instance shared by the LangChain, Perplexity and skill assessment analyzers
+llm_cache = LLMResponseCache(
+    path=config.LLM_CACHE_PATH or None,
+    default_ttl=config.LLM_CACHE_TTL_HOURS * 3600 or None,
+    max_bytes=config.LLM_CACHE_MAX_MB * 1024 * 1024
+)
@@ -0,0 +1,191 @@
+"""
+Bounded-concurrency scheduler for LLM calls.
+Caps in-flight requests per provider, spaces them to the provider's requests-per-minute
+budget, retries transient failures with jittered exponential backoff and enforces a
+per-call timeout.
+"""
+
+import os
+import re
+import time
+import random
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Defaults per provider; override with LLM_MAX_CONCURRENCY_<PROVIDER> / LLM_RPM_<PROVIDER>
+PROVIDER_LIMITS = {
+    "gemini": {"max_concurrency": 8, "requests_per_minute": 60},
+    "huggingface": {"max_concurrency": 4, "requests_per_minute": 30},
+    "local_huggingface": {"max_concurrency": 1, "requests_per_minute": None},
+}
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Used only when the error carries no status code; whole words, so "generate" is not "rate"
+_RETRYABLE_MESSAGE = re.compile(
+    r"\b(?:408|429|500|502|503|504)\b|\brate[ _-]?limit|\btoo many requests\b|\bquota\b"
+    r"|\bresource[ _]exhausted\b|\bunavailable\b|\btimed? ?out\b|\btimeout\b"
+    r"|\btemporarily\b|\boverloaded\b",
+    re.IGNORECASE
+)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """HTTP status carried by the error or its response, if any"""
+    for source in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "status", "code"):
+            value = getattr(source, attr, None)
+            if isinstance(value, int) and 100 <= value < 600:
+                return value
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Timeouts, connection problems and provider throttling are worth another attempt"""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    return bool(_RETRYABLE_MESSAGE.search(str(error)))
+
+
+class AsyncRateLimiter:
+    """Token bucket: `requests_per_minute` sustained, `burst` back-to-back"""
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class LLMScheduler:
+    """Runs LLM coroutines under a semaphore, a rate limit, a timeout and a retry policy"""
+
+    def __init__(self, provider: str = "default", max_concurrency: int = 4,
+                 requests_per_minute: Optional[float] = None, timeout: float = 60.0,
+                 max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 20.0):
+        self.provider = provider
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._limiter = AsyncRateLimiter(requests_per_minute, burst=self.max_concurrency) if requests_per_minute else None
+        self._stats = {"calls": 0, "retries": 0, "timeouts": 0, "failures": 0, "in_flight": 0, "peak_in_flight": 0}
+
+    async def run(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Await fn(*args, **kwargs) within the limits; raises the last error once retries run out.
+
+        A call that times out (or whose caller is cancelled) is abandoned, not cancelled:
+        a call running in a worker thread cannot be stopped, so it keeps its concurrency
+        slot until it actually finishes and the retry waits for a free slot like any other
+        call. In-flight provider calls therefore never exceed max_concurrency.
+        """
+        attempt = 0
+        while True:
+            try:
+                call = await self._start(fn, *args, **kwargs)
+                return await asyncio.wait_for(asyncio.shield(call), timeout=self.timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    self._stats["timeouts"] += 1
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._stats["failures"] += 1
+                    raise
+                attempt += 1
+                self._stats["retries"] += 1
+                # Full jitter keeps retries from a burst of failures from arriving together
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                logger.warning(f"{self.provider} call failed ({type(e).__name__}: {e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _start(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> asyncio.Task:
+        """Take a slot (and a rate-limit token) and start the call; the slot is freed when it ends"""
+        await self._semaphore.acquire()
+        try:
+            if self._limiter:
+                await self._limiter.acquire()
+            call = asyncio.ensure_future(fn(*args, **kwargs))
+        except BaseException:
+            self._semaphore.release()
+            raise
+        self._stats["calls"] += 1
+        self._stats["in_flight"] += 1
+        self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._stats["in_flight"])
+        call.add_done_callback(self._finished)
+        return call
+
+    def _finished(self, call: asyncio.Task):
+        self._stats["in_flight"] -= 1
+        self._semaphore.release()
+        # An abandoned call's outcome is nobody's to handle; retrieve it so it is not logged as lost
+        if not call.cancelled():
+            call.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "provider": self.provider,
+            "max_concurrency": self.max_concurrency,
+            "requests_per_minute": self.requests_per_minute,
+            "timeout": self.timeout,
+            **self._stats
+        }
+
+
+async def gather_unordered(fn: Callable[..., Awaitable[Any]],
+                           items: Iterable[Tuple[Any, tuple]]) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Start fn(*args) for every (key, args) item and yield (key, result) as each completes.
+    A failed item yields its exception as the result; pending calls are cancelled if
+    the consumer stops early.
+    """
+    async def keyed(key, args):
+        try:
+            return key, await fn(*args)
+        except Exception as e:
+            return key, e
+
+    tasks = [asyncio.ensure_future(keyed(key, args)) for key, args in items]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def scheduler_for(provider: str) -> LLMScheduler:
+    """Scheduler with the provider's default limits and any environment overrides"""
+    limits = PROVIDER_LIMITS.get(provider, {"max_concurrency": 4, "requests_per_minute": None})
+    key = provider.upper()
+    rpm = os.getenv(f"LLM_RPM_{key}")
+    return LLMScheduler(
+        provider=provider,
+        max_concurrency=int(os.getenv(f"LLM_MAX_CONCURRENCY_{key}", limits["max_concurrency"])),
+        requests_per_minute=float(rpm) if rpm else limits["requests_per_minute"],
+        timeout=float(os.getenv("LLM_CALL_TIMEOUT", "60")),
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+    )
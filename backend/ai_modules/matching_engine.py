@@ -9,10 +9,12 @@ from .resume_analyzer import ResumeAnalyzer
 class MatchingEngine(BaseAIModel):
     """Intelligent matching engine for candidates and job positions"""
     
-    def __init__(self):
+    def __init__(self, nlp_processor: Optional[NLPProcessor] = None,
+                 resume_analyzer: Optional[ResumeAnalyzer] = None):
         super().__init__("Matching_Engine")
-        self.nlp_processor = None
-        self.resume_analyzer = None
+        # Shared services injected by the orchestrator; created on initialize otherwise
+        self.nlp_processor = nlp_processor
+        self.resume_analyzer = resume_analyzer
         self.job_weights = self._initialize_job_weights()
         
     async def initialize(self) -> bool:
@@ -21,12 +23,14 @@ class MatchingEngine(BaseAIModel):
             self.logger.info("Initializing Matching Engine...")
             
             # Initialize NLP processor
-            self.nlp_processor = NLPProcessor()
-            await self.nlp_processor.initialize()
+            if self.nlp_processor is None:
+                self.nlp_processor = NLPProcessor()
+            await self.nlp_processor.ensure_initialized()
             
-            # Initialize resume analyzer
-            self.resume_analyzer = ResumeAnalyzer()
-            await self.resume_analyzer.initialize()
+            # Initialize resume analyzer on the same NLP processor
+            if self.resume_analyzer is None:
+                self.resume_analyzer = ResumeAnalyzer(nlp_processor=self.nlp_processor)
+            await self.resume_analyzer.ensure_initialized()
             
             self.is_initialized = True
             self.logger.info("Matching Engine initialized successfully")
@@ -76,19 +80,25 @@ class MatchingEngine(BaseAIModel):
             self.logger.error(f"Error in matching process: {e}")
             return {"error": str(e)}
     
-    async def match_candidates_to_jobs(self, candidates: List[Dict], jobs: List[Dict]) -> List[Dict]:
+    async def match_candidates_to_jobs(self, candidates: List[Dict], jobs: List[Dict], top_k: int = 10) -> List[Dict]:
         """Match candidates to jobs using AI-powered similarity"""
         matches = []
         
         try:
-            for candidate in candidates:
-                candidate_matches = await self._find_matches_for_candidate(candidate, jobs)
+            if not candidates:
+                return []
+            
+            # Score every candidate x job pair in one pass
+            scores = await self._score_matrices(candidates, jobs)
+            
+            for row, candidate in enumerate(candidates):
+                candidate_matches = await self._rank_job_matches(candidate, jobs, scores, row, top_k)
                 
                 matches.append({
                     "candidate_id": candidate.get("id"),
                     "candidate_name": candidate.get("name"),
                     "candidate_profile": await self._create_candidate_profile(candidate),
-                    "job_matches": candidate_matches[:10]  # Top 10 matches
+                    "job_matches": candidate_matches  # Top k matches
                 })
             
             return matches
@@ -99,45 +109,242 @@ class MatchingEngine(BaseAIModel):
     
     async def _find_matches_for_candidate(self, candidate: Dict, jobs: List[Dict]) -> List[Dict]:
         """Find best job matches for a specific candidate"""
-        candidate_text = await self._create_candidate_text(candidate)
-        candidate_embedding = await self.nlp_processor.get_text_embeddings(candidate_text)
+        scores = await self._score_matrices([candidate], jobs)
+        return await self._rank_job_matches(candidate, jobs, scores, 0, len(jobs))
+    
+    # =============================================================================
+    # MATRIX SCORING (all candidate x job pairs at once)
+    # =============================================================================
+    
+    async def _score_matrices(self, candidates: List[Dict], jobs: List[Dict]) -> Dict[str, np.ndarray]:
+        """Compute N x M sub-score matrices and the weighted score matrix"""
+        candidate_texts = [await self._create_candidate_text(candidate) for candidate in candidates]
+        job_texts = [await self._create_job_text(job) for job in jobs]
+        
+        # Each text is embedded exactly once per batch
+        candidate_matrix = await self._build_embedding_matrix(candidate_texts)
+        job_matrix = await self._build_embedding_matrix(job_texts)
+        
+        similarity = self._semantic_similarity_matrix(candidate_matrix, job_matrix)
+        skills = self._skills_match_matrix(candidates, jobs)
+        experience = self._experience_match_matrix(candidates, jobs)
+        location = self._location_match_matrix(candidates, jobs)
+        salary = self._salary_match_matrix(candidates, jobs)
+        
+        weights = self.job_weights
+        weighted = similarity * weights["semantic_similarity"]
+        weighted = weighted + skills * weights["skills_match"]
+        weighted = weighted + experience * weights["experience_match"]
+        weighted = weighted + location * weights["location_match"]
+        weighted = weighted + salary * weights["salary_match"]
+        
+        return {
+            "semantic_similarity": similarity,
+            "skills_match": skills,
+            "experience_match": experience,
+            "location_match": location,
+            "salary_match": salary,
+            "weighted_score": np.clip(weighted, 0.0, 1.0)  # Clamp between 0 and 1
+        }
+    
+    async def _build_embedding_matrix(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with one batched forward pass into a 2D float32 matrix"""
+        return await self.nlp_processor.embed_batch(texts)
+    
+    def _semantic_similarity_matrix(self, candidate_matrix: np.ndarray, job_matrix: np.ndarray) -> np.ndarray:
+        """Cosine similarity of every candidate/job pair via one normalized matmul"""
+        n, m = candidate_matrix.shape[0], job_matrix.shape[0]
+        if n == 0 or m == 0 or candidate_matrix.ndim != 2 or job_matrix.ndim != 2 \
+                or candidate_matrix.shape[1] != job_matrix.shape[1]:
+            return np.zeros((n, m))
+        
+        candidate_norms = np.linalg.norm(candidate_matrix, axis=1, keepdims=True)
+        job_norms = np.linalg.norm(job_matrix, axis=1, keepdims=True)
+        candidate_normed = np.divide(candidate_matrix, candidate_norms,
+                                     out=np.zeros_like(candidate_matrix), where=candidate_norms > 0)
+        job_normed = np.divide(job_matrix, job_norms,
+                               out=np.zeros_like(job_matrix), where=job_norms > 0)
+        
+        return np.clip(candidate_normed @ job_normed.T, 0.0, 1.0).astype(np.float64)
+    
+    def _skills_match_matrix(self, candidates: List[Dict], jobs: List[Dict]) -> np.ndarray:
+        """Jaccard similarity of skill sets for every pair"""
+        candidate_sets = [self._normalize_skill_set(candidate.get("skills")) for candidate in candidates]
+        job_sets = [self._normalize_skill_set(job.get("required_skills")) for job in jobs]
+        
+        vocabulary = {}
+        for skill_set in candidate_sets + job_sets:
+            for skill in skill_set:
+                vocabulary.setdefault(skill, len(vocabulary))
+        
+        candidate_incidence = self._incidence_matrix(candidate_sets, vocabulary)
+        job_incidence = self._incidence_matrix(job_sets, vocabulary)
+        
+        intersection = candidate_incidence @ job_incidence.T
+        union = candidate_incidence.sum(axis=1)[:, None] + job_incidence.sum(axis=1)[None, :] - intersection
+        jaccard = np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+        
+        # Neutral score if the job specifies no skills
+        job_has_skills = np.array([bool(skill_set) for skill_set in job_sets], dtype=bool)
+        return np.where(job_has_skills[None, :], jaccard, 0.5)
+    
+    def _normalize_skill_set(self, skills: Any) -> set:
+        """Lower-cased, stripped skill set from a list or comma separated string"""
+        if isinstance(skills, list):
+            return set(s.lower().strip() for s in skills)
+        if isinstance(skills, str):
+            return set(s.lower().strip() for s in skills.split(","))
+        return set()
+    
+    def _incidence_matrix(self, skill_sets: List[set], vocabulary: Dict[str, int]) -> np.ndarray:
+        """Binary row-per-entity, column-per-skill matrix"""
+        matrix = np.zeros((len(skill_sets), len(vocabulary)))
+        for row, skill_set in enumerate(skill_sets):
+            if skill_set:
+                matrix[row, [vocabulary[skill] for skill in skill_set]] = 1.0
+        return matrix
+    
+    def _experience_match_matrix(self, candidates: List[Dict], jobs: List[Dict]) -> np.ndarray:
+        """Experience level match for every pair"""
+        candidate_exp = self._numeric_array(candidate.get("years_of_experience", 0) for candidate in candidates)
+        required_exp = self._numeric_array(job.get("required_experience", 0) for job in jobs)
+        
+        cand = candidate_exp[:, None]
+        req = required_exp[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            under_qualified = cand / req
+        # Over-qualified check (slight penalty for being too overqualified)
+        qualified = np.where(cand > req * 2, 0.8, 1.0)
+        scores = np.where(cand >= req, qualified, under_qualified)
+        # Unparseable values fall back to a neutral score
+        scores = np.where(np.isnan(cand) | np.isnan(req), 0.5, scores)
+        # No experience requirement
+        return np.where(req == 0, 1.0, scores)
+    
+    def _location_match_matrix(self, candidates: List[Dict], jobs: List[Dict]) -> np.ndarray:
+        """Location preference match for every pair"""
+        candidate_locations = [str(candidate.get("location", "") or "").lower() for candidate in candidates]
+        job_locations = [str(job.get("location", "") or "").lower() for job in jobs]
+        
+        # Score each distinct pair of locations only once
+        unique_candidate, candidate_index = np.unique(np.array(candidate_locations, dtype=object), return_inverse=True)
+        unique_job, job_index = np.unique(np.array(job_locations, dtype=object), return_inverse=True)
+        
+        table = np.empty((len(unique_candidate), len(unique_job)))
+        for i, candidate_location in enumerate(unique_candidate):
+            for j, job_location in enumerate(unique_job):
+                table[i, j] = self._location_pair_score(candidate_location, job_location)
+        
+        scores = table[candidate_index.reshape(-1)][:, job_index.reshape(-1)]
+        
+        # Remote friendly postings always match
+        remote = np.array([bool(job.get("remote_friendly", False)) for job in jobs], dtype=bool)
+        return np.where(remote[None, :], 1.0, scores)
+    
+    def _location_pair_score(self, candidate_location: str, job_location: str) -> float:
+        """Score a single lower-cased candidate/job location pair"""
+        # Remote work preference
+        if "remote" in job_location:
+            return 1.0
+        
+        if not candidate_location or not job_location:
+            return 0.5  # Neutral if location not specified
+        
+        # Simple city/state match
+        if candidate_location in job_location or job_location in candidate_location:
+            return 1.0
+        
+        # Check for same state (simplified)
+        candidate_parts = candidate_location.split(",")
+        job_parts = job_location.split(",")
+        
+        if len(candidate_parts) > 1 and len(job_parts) > 1:
+            if candidate_parts[-1].strip() == job_parts[-1].strip():
+                return 0.7  # Same state
         
+        return 0.3  # Different locations
+    
+    def _salary_match_matrix(self, candidates: List[Dict], jobs: List[Dict]) -> np.ndarray:
+        """Salary expectation match for every pair"""
+        candidate_salary = self._numeric_array(candidate.get("salary_expectation", 0) for candidate in candidates)
+        job_salary = self._numeric_array(
+            job.get("salary_range", {}).get("max", 0) if isinstance(job.get("salary_range", {}), dict) else None
+            for job in jobs
+        )
+        
+        cand = candidate_salary[:, None]
+        offered = job_salary[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Candidate expects more than offered
+            scores = np.where(cand <= offered, 1.0, offered / cand)
+        # No salary constraint
+        scores = np.where((cand == 0) | (offered == 0), 1.0, scores)
+        return np.where(np.isnan(cand) | np.isnan(offered), 1.0, scores)
+    
+    def _numeric_array(self, values) -> np.ndarray:
+        """Float array from raw values; unparseable entries become NaN"""
+        numbers = []
+        for value in values:
+            try:
+                numbers.append(float(value))
+            except (TypeError, ValueError):
+                numbers.append(np.nan)
+        return np.array(numbers, dtype=np.float64)
+    
+    def _top_k_indices(self, row_scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Indices of the k best scores, ordered like a stable descending sort"""
+        m = row_scores.shape[0]
+        if top_k <= 0 or m == 0:
+            return np.array([], dtype=int)
+        if top_k < m:
+            kth_best = row_scores[np.argpartition(-row_scores, top_k - 1)[top_k - 1]]
+            # Keep every tie at the boundary so ordering matches a full stable sort
+            shortlist = np.flatnonzero(row_scores >= kth_best)
+        else:
+            shortlist = np.arange(m)
+        order = np.lexsort((shortlist, -row_scores[shortlist]))
+        return shortlist[order][:top_k]
+    
+    async def _rank_job_matches(self, candidate: Dict, jobs: List[Dict], scores: Dict[str, np.ndarray],
+                                row: int, top_k: int) -> List[Dict]:
+        """Build job_matches entries for one candidate row, sorted by weighted score"""
         job_matches = []
         
-        for job in jobs:
-            job_text = await self._create_job_text(job)
-            job_embedding = await self.nlp_processor.get_text_embeddings(job_text)
-            
-            # Calculate base similarity
-            similarity = await self._calculate_semantic_similarity(
-                candidate_embedding, job_embedding
-            )
-            
-            # Calculate weighted match score
-            match_score = await self._calculate_weighted_match_score(
-                candidate, job, similarity
-            )
-            
-            # Get detailed match breakdown
-            match_breakdown = await self._analyze_match_breakdown(candidate, job)
+        for col in self._top_k_indices(scores["weighted_score"][row], top_k):
+            job = jobs[col]
+            match_score = float(scores["weighted_score"][row, col])
             
             job_matches.append({
                 "job_id": job.get("id"),
                 "job_title": job.get("title"),
                 "company": job.get("company"),
                 "location": job.get("location"),
-                "semantic_similarity": float(similarity),
-                "weighted_score": float(match_score),
+                "semantic_similarity": float(scores["semantic_similarity"][row, col]),
+                "weighted_score": match_score,
                 "match_percentage": min(100, int(match_score * 100)),
-                "match_breakdown": match_breakdown,
+                "match_breakdown": self._match_breakdown_from_scores(candidate, job, scores, row, col),
                 "recommendation_reason": await self._generate_match_reason(candidate, job, match_score)
             })
         
-        # Sort by weighted score
-        job_matches.sort(key=lambda x: x["weighted_score"], reverse=True)
-        
         return job_matches
     
+    def _match_breakdown_from_scores(self, candidate: Dict, job: Dict, scores: Dict[str, np.ndarray],
+                                     row: int, col: int) -> Dict[str, Any]:
+        """Detailed breakdown of match factors from precomputed sub-scores"""
+        try:
+            return {
+                "skills_match": round(float(scores["skills_match"][row, col]) * 100, 1),
+                "experience_match": round(float(scores["experience_match"][row, col]) * 100, 1),
+                "location_match": round(float(scores["location_match"][row, col]) * 100, 1),
+                "salary_match": round(float(scores["salary_match"][row, col]) * 100, 1),
+                "strengths": self._identify_match_strengths(candidate, job),
+                "concerns": self._identify_match_concerns(candidate, job)
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error analyzing match breakdown: {e}")
+            return {}
+    
     async def _create_candidate_text(self, candidate: Dict) -> str:
         """Create searchable text representation of candidate"""
         text_parts = []
@@ -9,10 +9,12 @@ from .resume_analyzer import ResumeAnalyzer
 class MatchingEngine(BaseAIModel):
     """Intelligent matching engine for candidates and job positions"""
     
-    def __init__(self):
+    def __init__(self, nlp_processor: Optional[NLPProcessor] = None,
+                 resume_analyzer: Optional[ResumeAnalyzer] = None):
         super().__init__("Matching_Engine")
-        self.nlp_processor = None
-        self.resume_analyzer = None
+        # Shared services injected by the orchestrator; created on initialize otherwise
+        self.nlp_processor = nlp_processor
+        self.resume_analyzer = resume_analyzer
         self.job_weights = self._initialize_job_weights()
         
     async def initialize(self) -> bool:
@@ -21,12 +23,14 @@ class MatchingEngine(BaseAIModel):
             self.logger.info("Initializing Matching Engine...")
             
             # Initialize NLP processor
-            self.nlp_processor = NLPProcessor()
-            await self.nlp_processor.initialize()
-            
-            # Initialize resume analyzer
-            self.resume_analyzer = ResumeAnalyzer()
-            await self.resume_analyzer.initialize()
+            if self.nlp_processor is None:
+                self.nlp_processor = NLPProcessor()
+            await self.nlp_processor.ensure_initialized()
+            
+            # Initialize resume analyzer on the same NLP processor
+            if self.resume_analyzer is None:
+                self.resume_analyzer = ResumeAnalyzer(nlp_processor=self.nlp_processor)
+            await self.resume_analyzer.ensure_initialized()
             
             self.is_initialized = True
             self.logger.info("Matching Engine initialized successfully")
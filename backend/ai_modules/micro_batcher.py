@@ -0,0 +1,193 @@
+"""Dynamic micro-batching: concurrent callers' inputs are coalesced into one model forward pass"""
+import os
+import time
+import queue
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from .config import config
+
+# Defaults for every batcher; override with MICRO_BATCH_MAX / MICRO_BATCH_WAIT_MS
+MAX_BATCH = int(os.getenv("MICRO_BATCH_MAX", "32"))
+MAX_WAIT_MS = float(os.getenv("MICRO_BATCH_WAIT_MS", "5"))
+
+
+class _Request:
+    __slots__ = ("items", "future", "enqueued_at")
+
+    def __init__(self, items: Sequence[Any]):
+        self.items = list(items)
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """
+    Runs `fn(items) -> outputs` (one output per input, in order) on a background thread,
+    feeding it the inputs of every caller that is waiting at the time. A batch closes
+    when it holds `max_batch` inputs or `max_wait_ms` after its first request, whichever
+    comes first; a request larger than the space left starts the next batch.
+
+    The wait only applies while the model is under concurrent load (the previous batch
+    served more than one caller): a lone request is dispatched immediately, so batching
+    costs single-request latency nothing. Requests arriving while a forward pass runs
+    queue up and go out together in the next one. If a batch fails, each of its requests
+    is retried on its own, so one bad input fails only the caller that sent it.
+
+    Callable from coroutines (`await encode(items)`) and from worker threads
+    (`run(items)`); the forward pass never runs on the event loop. The thread starts on
+    first use, so a batcher created before a pre-forking server forks works in each worker.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], Sequence[Any]], name: str = "batcher",
+                 max_batch: int = MAX_BATCH, max_wait_ms: float = MAX_WAIT_MS):
+        self.fn = fn
+        self.name = name
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.logger = config.logger
+        self._queue: "queue.Queue[_Request]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._start_lock = threading.Lock()
+        self._carry: Optional[_Request] = None
+        self._last_callers = 0
+        self.stats = {"batches": 0, "requests": 0, "items": 0, "largest_batch": 0,
+                      "failures": 0, "isolated_failures": 0, "queue_wait_seconds": 0.0, "run_seconds": 0.0}
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                # Forked child: the parent's queue may hold requests nobody here will answer
+                self._queue, self._carry = queue.Queue(), None
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._worker, name=f"micro-batch-{self.name}", daemon=True)
+            self._thread.start()
+
+    def submit(self, items: Sequence[Any]) -> Future:
+        """Queue items; the future resolves to their outputs, in order"""
+        request = _Request(items)
+        if not request.items:
+            request.future.set_result([])
+            return request.future
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future
+
+    def run(self, items: Sequence[Any]) -> Sequence[Any]:
+        """Blocking submit, for code already running in a worker thread"""
+        return self.submit(items).result()
+
+    async def encode(self, items: Sequence[Any]) -> Sequence[Any]:
+        """Awaitable submit; the event loop stays free while the batch runs"""
+        return await asyncio.wrap_future(self.submit(items))
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch, size = [first], len(first.items)
+        deadline = time.perf_counter() + (self.max_wait if self._last_callers > 1 else 0.0)
+        while size < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if size + len(request.items) > self.max_batch:
+                self._carry = request
+                break
+            batch.append(request)
+            size += len(request.items)
+        return batch
+
+    def _worker(self):
+        while True:
+            first, self._carry = self._carry, None
+            if first is None:
+                first = self._queue.get()
+            batch = [request for request in self._collect(first)
+                     if request.future.set_running_or_notify_cancel()]
+            self._last_callers = len(batch)
+            if not batch:
+                continue
+
+            items = [item for request in batch for item in request.items]
+            started = time.perf_counter()
+            try:
+                outputs = self._call(items)
+            except Exception as e:
+                self.stats["failures"] += 1
+                self.logger.warning(f"Micro-batch {self.name} failed for {len(items)} inputs: {e}")
+                if len(batch) == 1:
+                    batch[0].future.set_exception(e)
+                else:
+                    self._run_alone(batch)
+                continue
+
+            offset = 0
+            for request in batch:
+                request.future.set_result(outputs[offset:offset + len(request.items)])
+                offset += len(request.items)
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(batch)
+            self.stats["items"] += len(items)
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(items))
+            self.stats["queue_wait_seconds"] += sum(started - request.enqueued_at for request in batch)
+            self.stats["run_seconds"] += time.perf_counter() - started
+
+    def _call(self, items: List[Any]) -> Sequence[Any]:
+        outputs = self.fn(items)
+        if len(outputs) != len(items):
+            raise ValueError(f"{self.name} returned {len(outputs)} outputs for {len(items)} inputs")
+        return outputs
+
+    def _run_alone(self, batch: List[_Request]):
+        """After a failed batch, run each request by itself so only the one at fault fails"""
+        for request in batch:
+            try:
+                request.future.set_result(self._call(request.items))
+            except Exception as e:
+                self.stats["isolated_failures"] += 1
+                request.future.set_exception(e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batch counts, mean batch size and time spent queued versus running"""
+        batches = self.stats["batches"]
+        return {
+            "name": self.name,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            **self.stats,
+            "mean_batch_items": round(self.stats["items"] / batches, 2) if batches else 0.0,
+            "mean_requests_per_batch": round(self.stats["requests"] / batches, 2) if batches else 0.0,
+            "queued": self._queue.qsize()
+        }
+
+
+_batchers: Dict[tuple, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def batcher_for(name: str, model: Any, fn: Callable[[List[Any]], Sequence[Any]], **kwargs) -> MicroBatcher:
+    """
+    The process-wide batcher for one loaded model, so every component holding the same
+    shared handle feeds the same queue (`fn` is only used when the batcher is created).
+    """
+    key = (name, id(model))
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = MicroBatcher(fn, name=name, **kwargs)
+        return batcher
+
+
+def get_batcher_stats() -> Dict[str, Any]:
+    """
+    Stats of every batcher created in this process, keyed like batcher_for ("name:model id"),
+    so two models loaded under one name each keep their own entry
+    """
+    with _batchers_lock:
+        return {f"{name}:{model_id:x}": batcher.get_stats() for (name, model_id), batcher in _batchers.items()}
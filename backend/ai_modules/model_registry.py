@@ -0,0 +1,287 @@
+"""Registry of shared model handles, each loaded lazily on first use and optionally warmed in the background"""
+import gc
+import os
+import time
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+from .config import config
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def process_memory(pid: Optional[int] = None) -> Dict[str, Optional[int]]:
+    """
+    RSS, PSS (shared pages split between the processes mapping them) and USS (pages
+    private to the process) in bytes. Summing PSS over forked workers gives their real
+    total; summing RSS counts the pages they share once per worker.
+    """
+    pid = pid or os.getpid()
+    try:
+        fields = {}
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0]) * 1024
+        return {"rss_bytes": fields["Rss"], "pss_bytes": fields["Pss"],
+                "uss_bytes": fields["Private_Clean"] + fields["Private_Dirty"]}
+    except (OSError, ValueError, KeyError):
+        pass
+    if PSUTIL_AVAILABLE:
+        try:
+            info = psutil.Process(pid).memory_full_info()
+            return {"rss_bytes": info.rss, "pss_bytes": getattr(info, "pss", None),
+                    "uss_bytes": getattr(info, "uss", None)}
+        except (psutil.Error, OSError):
+            pass
+    return {"rss_bytes": current_rss_bytes() if pid == os.getpid() else None,
+            "pss_bytes": None, "uss_bytes": None}
+
+
+def child_pids(parent: int) -> List[int]:
+    """Processes whose parent is `parent` (the workers of a pre-forking server)"""
+    if PSUTIL_AVAILABLE:
+        try:
+            return sorted(child.pid for child in psutil.Process(parent).children())
+        except (psutil.Error, OSError):
+            return []
+    pids = []
+    for entry in os.listdir("/proc") if os.path.isdir("/proc") else []:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # comm may contain spaces, so split after its closing parenthesis
+                if int(f.read().rsplit(")", 1)[1].split()[1]) == parent:
+                    pids.append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+    return sorted(pids)
+
+
+Loader = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+class ModelRegistry:
+    """
+    Shared singleton handles for expensive models and services. A model is registered
+    with a loader (a coroutine function, or a plain function run in a worker thread)
+    and loaded the first time `get` asks for it; concurrent callers wait on the same
+    per-model lock, so each model loads once per process. A loader that fails is
+    recorded and `get` returns None until `reload` is called.
+
+    `warm(names)` loads models in the background so hot endpoints find them ready.
+    `get_stats` reports each model's state, load time and the change in process RSS
+    while it loaded (approximate when loads overlap, and including any models the
+    loader itself pulled in for the first time).
+
+    `preload(names)` loads read-only models synchronously in the master of a pre-forking
+    server (gunicorn --preload) and freezes the heap, so forked workers share the weight
+    pages copy-on-write instead of each loading its own copy.
+    """
+
+    def __init__(self):
+        self.logger = config.logger
+        self._loaders: Dict[str, Loader] = {}
+        self._handles: Dict[str, Any] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._warm_tasks: List[asyncio.Task] = []
+        self.preloaded_pid: Optional[int] = None
+
+    def register(self, name: str, loader: Loader, replace: bool = False):
+        """Add a model; re-registering an existing name is ignored unless replace=True"""
+        if name in self._loaders and not replace:
+            return
+        self._loaders[name] = loader
+        self._stats[name] = {"state": "unloaded"}
+        self._handles.pop(name, None)
+
+    def is_loaded(self, name: str) -> bool:
+        return self._stats.get(name, {}).get("state") == "loaded"
+
+    def peek(self, name: str) -> Optional[Any]:
+        """The handle if it is already loaded; never starts a load"""
+        return self._handles.get(name)
+
+    async def get(self, name: str) -> Optional[Any]:
+        """The shared handle, loading it on first use (None if the model failed to load)"""
+        if name in self._handles:
+            return self._handles[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+        if self._stats[name]["state"] == "failed":
+            return None
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            if name in self._handles or self._stats[name]["state"] == "failed":
+                return self._handles.get(name)
+            return await self._load(name)
+
+    async def _load(self, name: str) -> Optional[Any]:
+        loader = self._loaders[name]
+        self._stats[name] = {"state": "loading"}
+        rss_before = current_rss_bytes()
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(loader):
+                handle = await loader()
+            else:
+                handle = await asyncio.to_thread(loader)
+                if inspect.isawaitable(handle):
+                    handle = await handle
+        except Exception as e:
+            self.logger.warning(f"Model {name} failed to load: {e}")
+            self._stats[name] = {"state": "failed", "error": str(e),
+                                 "load_seconds": round(time.perf_counter() - started, 3)}
+            return None
+
+        rss_after = current_rss_bytes()
+        seconds = time.perf_counter() - started
+        self._handles[name] = handle
+        self._stats[name] = {
+            "state": "loaded",
+            "load_seconds": round(seconds, 3),
+            "rss_delta_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            "rss_after_bytes": rss_after,
+            "loaded_at": time.time()
+        }
+        self.logger.info(f"Model {name} loaded in {seconds:.2f}s")
+        return handle
+
+    def get_blocking(self, name: str) -> Optional[Any]:
+        """get() for synchronous code running outside an event loop, e.g. module-level handles"""
+        if name in self._handles:
+            return self._handles[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model: {name}")
+        if self._stats[name]["state"] == "failed":
+            return None
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._load(name))
+        raise RuntimeError(f"get_blocking({name!r}) called inside a running event loop; await get() instead")
+
+    async def reload(self, name: str) -> Optional[Any]:
+        """Drop the handle (or a recorded failure) and load the model again"""
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            self._handles.pop(name, None)
+            return await self._load(name)
+
+    def warm(self, names: Iterable[str]) -> Optional[asyncio.Task]:
+        """Load the named models one after another in a background task"""
+        names = [name for name in dict.fromkeys(names) if name in self._loaders and name not in self._handles]
+        if not names:
+            return None
+
+        async def run():
+            for name in names:
+                await self.get(name)
+
+        task = asyncio.ensure_future(run())
+        self._warm_tasks.append(task)
+        task.add_done_callback(self._warm_tasks.remove)
+        return task
+
+    def preload(self, names: Iterable[str], freeze: bool = True) -> List[str]:
+        """
+        Load the named models now, outside any event loop, and return the ones that loaded.
+        Call it in the parent before worker processes are forked, and only for models that
+        are never mutated after loading (spaCy pipelines, transformer weights): a worker
+        that writes to a shared page gets its own copy of it.
+
+        With freeze, the surviving objects are moved to the collector's permanent generation
+        (gc.freeze) so that garbage collection in the workers does not write to their
+        headers and un-share the pages holding them.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            self.logger.warning("preload() called inside a running event loop; use warm() there instead")
+            return []
+        # Fast tokenizers disable their thread pool after a fork anyway; say so up front
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        loaded = []
+        for name in dict.fromkeys(names):
+            if name not in self._loaders:
+                self.logger.warning(f"Cannot preload unknown model: {name}")
+                continue
+            if name not in self._handles and self._stats[name]["state"] != "failed":
+                asyncio.run(self._load(name))
+            if name in self._handles:
+                self._stats[name]["preloaded"] = True
+                loaded.append(name)
+        if freeze and hasattr(gc, "freeze"):
+            gc.collect()
+            gc.freeze()
+        self.preloaded_pid = os.getpid()
+        return loaded
+
+    @property
+    def forked_from_preload(self) -> bool:
+        """True in a worker forked from the process that ran preload"""
+        return self.preloaded_pid is not None and self.preloaded_pid != os.getpid()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-model state, load time and RSS delta, plus the current process RSS"""
+        return {
+            "models": {name: dict(stats) for name, stats in self._stats.items()},
+            "loaded": sorted(self._handles),
+            "warming": bool(self._warm_tasks),
+            "preloaded_in_parent": self.forked_from_preload,
+            "process_rss_bytes": current_rss_bytes()
+        }
+
+
+def _load_spacy():
+    import spacy
+    return spacy.load(config.SPACY_MODEL)
+
+
+def _load_sentence_transformer():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(config.BERT_MODEL_NAME)
+
+
+async def _load_minilm():
+    """
+    (tokenizer, model) for mean-pooled transformer embeddings: the transformer inside the
+    shared sentence-transformer, so both handles use one copy of the MiniLM weights
+    """
+    sentence_model = await model_registry.get("sentence_transformer")
+    if sentence_model is None:
+        raise RuntimeError("sentence_transformer failed to load")
+    transformer = sentence_model[0]
+    return transformer.tokenizer, transformer.auto_model
+
+
+# Read-only models safe to load in the parent and share across forked workers
+PRELOAD_MODELS = ("spacy", "sentence_transformer", "minilm")
+
+# Global registry; the shared NLP models are registered here, application services by main.py
+model_registry = ModelRegistry()
+model_registry.register("spacy", _load_spacy)
+model_registry.register("minilm", _load_minilm)
+model_registry.register("sentence_transformer", _load_sentence_transformer)
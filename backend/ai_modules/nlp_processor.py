@@ -1,4 +1,5 @@
 """NLP Processing Module for text analysis and embeddings"""
+import asyncio
 import numpy as np
 try:
     import spacy
@@ -9,12 +10,12 @@ except ImportError:
     spacy = None
 
 try:
-    import tensorflow as tf
-    TF_AVAILABLE = True
+    import torch
+    TORCH_AVAILABLE = True
 except ImportError:
-    print("Warning: TensorFlow not available or incompatible. Using alternatives.")
-    TF_AVAILABLE = False
-    tf = None
+    print("Warning: PyTorch not available. Transformer embeddings will be disabled.")
+    TORCH_AVAILABLE = False
+    torch = None
 
 try:
     from transformers import AutoTokenizer, AutoModel
@@ -34,8 +35,50 @@ except ImportError:
     SKLEARN_AVAILABLE = False
     TfidfVectorizer = None
     cosine_similarity = None
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from .base_model import BaseAIModel
+from .embedding_cache import embedding_cache
+from .doc_context import DocContext
+from .model_registry import model_registry
+from .micro_batcher import batcher_for
+
+EMBEDDING_DIM = 384  # all-MiniLM-L6-v2 hidden size
+DEFAULT_EMBED_BATCH_SIZE = 32
+
+
+def encode_texts_batched(tokenizer, model, texts: List[str], batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+                         max_length: int = 512) -> np.ndarray:
+    """
+    Mean-pooled transformer embeddings for a list of texts.
+    Inputs are sorted by length so each padded mini-batch wastes little compute;
+    padding tokens are excluded from the mean via the attention mask.
+    Returns a contiguous float32 array of shape (len(texts), hidden_size) in input order.
+    """
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+    
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    result = None
+    
+    with torch.inference_mode():
+        for start in range(0, len(order), batch_size):
+            batch_ids = order[start:start + batch_size]
+            inputs = tokenizer(
+                [texts[i] for i in batch_ids],
+                return_tensors="pt",
+                padding=True,
+                truncation=True,
+                max_length=max_length
+            )
+            hidden = model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            
+            if result is None:
+                result = np.empty((len(texts), pooled.shape[1]), dtype=np.float32)
+            result[batch_ids] = pooled.float().cpu().numpy()
+    
+    return np.ascontiguousarray(result)
 
 class NLPProcessor(BaseAIModel):
     """Natural Language Processing model for text analysis"""
@@ -46,6 +89,7 @@ class NLPProcessor(BaseAIModel):
         self.tokenizer = None
         self.bert_model = None
         self.tfidf_vectorizer = None
+        self.embedding_cache = embedding_cache
         
     async def initialize(self) -> bool:
         """Initialize NLP models"""
@@ -76,23 +120,21 @@ class NLPProcessor(BaseAIModel):
             self.nlp = None
             return
             
-        try:
-            self.nlp = spacy.load(self.config.SPACY_MODEL)
-            self.logger.info("spaCy model loaded successfully")
-        except OSError:
+        # Shared with every other processor in the process
+        self.nlp = await model_registry.get("spacy")
+        if self.nlp is None:
             self.logger.warning(f"spaCy model '{self.config.SPACY_MODEL}' not found. Please install: python -m spacy download {self.config.SPACY_MODEL}")
-            self.nlp = None
     
     async def _initialize_bert(self):
         """Initialize BERT model"""
-        try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.config.BERT_MODEL_NAME)
-            self.bert_model = AutoModel.from_pretrained(self.config.BERT_MODEL_NAME)
-            self.logger.info("BERT model loaded successfully")
-        except Exception as e:
-            self.logger.error(f"Error loading BERT model: {e}")
+        # Shared with every other processor in the process
+        handle = await model_registry.get("minilm")
+        if handle is None:
+            self.logger.error("BERT model could not be loaded")
             self.tokenizer = None
             self.bert_model = None
+            return
+        self.tokenizer, self.bert_model = handle
     
     async def _initialize_tfidf(self):
         """Initialize TF-IDF vectorizer"""
@@ -116,15 +158,16 @@ class NLPProcessor(BaseAIModel):
         
         try:
             result = {}
+            ctx = self.make_context(input_data)
             
             # Get embeddings
             result["embeddings"] = await self.get_text_embeddings(input_data)
             
             # Extract entities
-            result["entities"] = await self.extract_entities(input_data)
+            result["entities"] = await self.extract_entities(input_data, ctx)
             
             # Get text statistics
-            result["statistics"] = await self.get_text_statistics(input_data)
+            result["statistics"] = await self.get_text_statistics(input_data, ctx)
             
             return result
             
@@ -134,30 +177,103 @@ class NLPProcessor(BaseAIModel):
     
     async def get_text_embeddings(self, text: str) -> Optional[List[float]]:
         """Generate BERT embeddings for text"""
+        embeddings = await self.embed_batch([text])
+        return embeddings[0].tolist()
+    
+    async def embed_batch(self, texts: List[str], batch_size: int = DEFAULT_EMBED_BATCH_SIZE) -> np.ndarray:
+        """
+        Generate embeddings for many texts with padded mini-batches.
+        Cached texts are served from the embedding cache, duplicates are encoded once.
+        Returns a contiguous float32 array of shape (len(texts), EMBEDDING_DIM).
+        The forward passes never run on the event loop.
+        """
         try:
-            if not self.bert_model or not self.tokenizer:
-                self.logger.warning("BERT model not available, returning zero embeddings")
-                return [0.0] * 384  # Default embedding size
-                
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-            
-            with tf.no_grad():
-                outputs = self.bert_model(**inputs)
-                embeddings = outputs.last_hidden_state.mean(dim=1)
-            
-            return embeddings.numpy().flatten().tolist()
-            
+            result, pending = self._cached_embeddings(texts)
+            if pending:
+                unique_texts = list(pending.keys())
+                if len(unique_texts) < batch_size:
+                    # Small requests share forward passes with whatever else is being embedded
+                    encoded = await self._embed_batcher().encode(unique_texts)
+                else:
+                    encoded = await asyncio.to_thread(
+                        encode_texts_batched, self.tokenizer, self.bert_model, unique_texts, batch_size
+                    )
+                self._store_embeddings(result, pending, encoded)
+            return result
+        except Exception as e:
+            self.logger.error(f"Error getting embeddings: {e}")
+            return np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    
+    def embed_texts(self, texts: List[str], batch_size: int = DEFAULT_EMBED_BATCH_SIZE) -> np.ndarray:
+        """Blocking embed_batch, for code already running in a worker thread"""
+        try:
+            result, pending = self._cached_embeddings(texts)
+            if pending:
+                unique_texts = list(pending.keys())
+                if len(unique_texts) < batch_size:
+                    encoded = self._embed_batcher().run(unique_texts)
+                else:
+                    encoded = encode_texts_batched(self.tokenizer, self.bert_model, unique_texts, batch_size)
+                self._store_embeddings(result, pending, encoded)
+            return result
         except Exception as e:
             self.logger.error(f"Error getting embeddings: {e}")
-            return [0.0] * 384
+            return np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+    
+    def _cached_embeddings(self, texts: List[str]) -> Tuple[np.ndarray, Dict[str, List[int]]]:
+        """Result array filled from the cache, and the positions of each text still to encode"""
+        result = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        if not texts:
+            return result, {}
+        if not self.bert_model or not self.tokenizer or not TORCH_AVAILABLE:
+            self.logger.warning("BERT model not available, returning zero embeddings")
+            return result, {}
+        
+        model_name = self.config.BERT_MODEL_NAME
+        pending: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            cached = self.embedding_cache.get(model_name, text)
+            if cached is not None:
+                result[i] = cached
+            else:
+                pending.setdefault(text, []).append(i)
+        return result, pending
     
-    async def extract_entities(self, text: str) -> List[Dict[str, str]]:
+    def _store_embeddings(self, result: np.ndarray, pending: Dict[str, List[int]], encoded):
+        model_name = self.config.BERT_MODEL_NAME
+        for text, vector in zip(pending, encoded):
+            self.embedding_cache.put(model_name, text, vector)
+            result[pending[text]] = vector
+    
+    def _embed_batcher(self):
+        """Micro-batcher shared by every processor holding this (tokenizer, model) pair"""
+        tokenizer, model = self.tokenizer, self.bert_model
+        return batcher_for(
+            "minilm", model,
+            lambda texts: encode_texts_batched(tokenizer, model, texts, DEFAULT_EMBED_BATCH_SIZE)
+        )
+    
+    def get_embedding_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache hit/miss counters"""
+        return self.embedding_cache.get_stats()
+    
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get model information including embedding cache statistics"""
+        info = super().get_model_info()
+        info["embedding_cache"] = self.get_embedding_cache_stats()
+        return info
+    
+    def make_context(self, text: str) -> DocContext:
+        """Per-request context that parses text once for every extractor it is passed to"""
+        return DocContext(self.nlp, text)
+    
+    async def extract_entities(self, text: str, ctx: Optional[DocContext] = None) -> List[Dict[str, str]]:
         """Extract named entities from text"""
         try:
             if not self.nlp:
                 return []
                 
-            doc = self.nlp(text)
+            ctx = DocContext.ensure(ctx, self.nlp, text)
             entities = [
                 {
                     "text": ent.text,
@@ -166,7 +282,7 @@ class NLPProcessor(BaseAIModel):
                     "start": ent.start_char,
                     "end": ent.end_char
                 }
-                for ent in doc.ents
+                for ent in ctx.entities
             ]
             
             return entities
@@ -175,7 +291,7 @@ class NLPProcessor(BaseAIModel):
             self.logger.error(f"Error extracting entities: {e}")
             return []
     
-    async def get_text_statistics(self, text: str) -> Dict[str, Any]:
+    async def get_text_statistics(self, text: str, ctx: Optional[DocContext] = None) -> Dict[str, Any]:
         """Get basic text statistics"""
         try:
             if not self.nlp:
@@ -188,37 +304,33 @@ class NLPProcessor(BaseAIModel):
                     "average_word_length": sum(len(word) for word in words) / len(words) if words else 0
                 }
             
-            doc = self.nlp(text)
+            ctx = DocContext.ensure(ctx, self.nlp, text)
             
             return {
-                "word_count": len([token for token in doc if not token.is_space]),
+                "word_count": len(ctx.tokens),
                 "character_count": len(text),
-                "sentence_count": len(list(doc.sents)),
-                "token_count": len(doc),
-                "average_word_length": np.mean([len(token.text) for token in doc if not token.is_space and not token.is_punct]),
-                "pos_distribution": self._get_pos_distribution(doc),
-                "readability_score": self._calculate_readability(doc)
+                "sentence_count": len(ctx.sentences),
+                "token_count": len(ctx.doc),
+                "average_word_length": np.mean([len(token.text) for token in ctx.words]),
+                "pos_distribution": self._get_pos_distribution(ctx),
+                "readability_score": self._calculate_readability(ctx)
             }
             
         except Exception as e:
             self.logger.error(f"Error getting text statistics: {e}")
             return {}
     
-    def _get_pos_distribution(self, doc) -> Dict[str, int]:
+    def _get_pos_distribution(self, ctx: DocContext) -> Dict[str, int]:
         """Get part-of-speech distribution"""
-        pos_counts = {}
-        for token in doc:
-            if not token.is_space and not token.is_punct:
-                pos_counts[token.pos_] = pos_counts.get(token.pos_, 0) + 1
-        return pos_counts
+        return dict(ctx.pos_counts)
     
-    def _calculate_readability(self, doc) -> float:
+    def _calculate_readability(self, ctx: DocContext) -> float:
         """Calculate simple readability score"""
-        sentences = list(doc.sents)
+        sentences = ctx.sentences
         if not sentences:
             return 0.0
         
-        total_words = len([token for token in doc if not token.is_space and not token.is_punct])
+        total_words = len(ctx.words)
         total_sentences = len(sentences)
         
         # Simple readability score (lower is easier to read)
@@ -228,19 +340,15 @@ class NLPProcessor(BaseAIModel):
     async def calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate semantic similarity between two texts"""
         try:
-            embeddings1 = await self.get_text_embeddings(text1)
-            embeddings2 = await self.get_text_embeddings(text2)
+            embeddings = await self.embed_batch([text1, text2])
+            norms = np.linalg.norm(embeddings, axis=1)
             
-            if not embeddings1 or not embeddings2:
+            if not norms.all():
                 return 0.0
             
-            # Convert to numpy arrays and reshape
-            emb1 = np.array(embeddings1).reshape(1, -1)
-            emb2 = np.array(embeddings2).reshape(1, -1)
-            
-            # Calculate cosine similarity
-            similarity = cosine_similarity(emb1, emb2)[0][0]
-            return float(similarity)
+            # Cosine similarity of the two rows
+            similarity = float(embeddings[0] @ embeddings[1]) / float(norms[0] * norms[1])
+            return similarity
             
         except Exception as e:
             self.logger.error(f"Error calculating similarity: {e}")
@@ -251,9 +359,24 @@ class NLPProcessor(BaseAIModel):
         if not self.validate_input(texts):
             return [{"error": "Invalid input data"}]
         
+        # One batched forward pass for all embeddings
+        embeddings = await self.embed_batch(texts)
+        
         results = []
-        for text in texts:
-            result = await self.process(text)
-            results.append(result)
+        for text, embedding in zip(texts, embeddings):
+            if not self.validate_input(text):
+                results.append({"error": "Invalid input data"})
+                continue
+            
+            try:
+                ctx = self.make_context(text)
+                results.append({
+                    "embeddings": embedding.tolist(),
+                    "entities": await self.extract_entities(text, ctx),
+                    "statistics": await self.get_text_statistics(text, ctx)
+                })
+            except Exception as e:
+                self.logger.error(f"Error processing text: {e}")
+                results.append({"error": str(e)})
         
-        return results
\ No newline at end of file
+        return results
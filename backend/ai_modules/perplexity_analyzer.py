@@ -5,9 +5,96 @@ Python backend service for resume analysis using Perplexity AI
 
 import os
 import json
-import requests
-from typing import Dict, List, Optional, Any
+import asyncio
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any
 from datetime import datetime
+from .llm_cache import llm_cache
+from .http_client import http_pool, HTTPError
+
+# Bump when a prompt below changes in a way that should not reuse cached responses
+PROMPT_VERSIONS = {
+    "analyze_resume": "1",
+    "career_suggestions": "1",
+    "optimize_for_ats": "1",
+}
+
+SYSTEM_PROMPTS = {
+    "analyze_resume": "You are an expert HR professional and resume analyst with years of experience in talent acquisition and career development. Provide detailed, actionable feedback in valid JSON format only.",
+    "career_suggestions": "You are a career counselor with real-time market knowledge. Provide data-driven career suggestions in JSON format.",
+    "optimize_for_ats": "You are an ATS optimization expert. Provide specific, actionable advice in JSON format.",
+}
+
+# Sampling parameters per template; shared by the blocking and streaming calls so both use one cache key
+COMPLETION_PARAMS = {
+    "analyze_resume": {"temperature": 0.7, "max_tokens": 4000, "top_p": 0.9},
+    "career_suggestions": {"temperature": 0.8, "max_tokens": 3000},
+    "optimize_for_ats": {"temperature": 0.6, "max_tokens": 2500},
+}
+
+
+class IncrementalJSONParser:
+    """
+    Scans a JSON document as it streams in and returns each top-level member as soon as
+    it is complete: (key, value) pairs of an object, or (index, value) items of an array.
+    Text before the opening bracket (e.g. a ```json fence) is skipped.
+    """
+
+    def __init__(self, opening: str = "{"):
+        self.opening = opening
+        self.buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._member_start = 0
+        self._index = 0
+        self.done = False
+
+    def feed(self, chunk: str) -> List[tuple]:
+        self.buffer += chunk
+        members = []
+        text = self.buffer
+        while self._pos < len(text) and not self.done:
+            ch = text[self._pos]
+            if not self._started:
+                if ch == self.opening:
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    members.extend(self._member(text[self._member_start:self._pos]))
+                    self.done = True
+            elif ch == "," and self._depth == 1:
+                members.extend(self._member(text[self._member_start:self._pos]))
+                self._member_start = self._pos + 1
+            self._pos += 1
+        return members
+
+    def _member(self, raw: str) -> List[tuple]:
+        if not raw.strip():
+            return []
+        try:
+            if self.opening == "{":
+                return list(json.loads("{" + raw + "}").items())
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            return []
+        self._index += 1
+        return [(self._index - 1, value)]
 
 
 class PerplexityResumeAnalyzer:
@@ -26,8 +113,133 @@ class PerplexityResumeAnalyzer:
         
         self.api_url = "https://api.perplexity.ai/chat/completions"
         self.default_model = "llama-3.1-sonar-large-128k-online"
+        self.cache = llm_cache
+    
+    def _request_body(self, template: str, prompt: str, model: str, stream: bool) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPTS[template]
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            **COMPLETION_PARAMS[template],
+            "stream": stream
+        }
+    
+    def _cache_args(self, template: str, prompt: str, model: str) -> tuple:
+        inputs = {"system": SYSTEM_PROMPTS[template], "prompt": prompt, **COMPLETION_PARAMS[template]}
+        return ("perplexity", model, template, PROMPT_VERSIONS[template], inputs)
+    
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+    
+    async def _chat(self, template: str, prompt: str, expect: str = "{", model: Optional[str] = None) -> str:
+        """
+        One chat completion, served from the response cache when the same prompt was
+        already answered by the same model under the same template version.
+        Responses without the expected JSON payload (`expect` is "{" or "[") are not cached.
+        """
+        model = model or self.default_model
+        cache_args = self._cache_args(template, prompt, model)
+        cached = await self.cache.aget(*cache_args)
+        if cached is not None:
+            return cached
+        
+        response = await http_pool.post(
+            self.api_url,
+            headers=self._headers,
+            json=self._request_body(template, prompt, model, stream=False)
+        )
         
-    def analyze_resume(
+        response.raise_for_status()
+        data = response.json()
+        content = data["choices"][0]["message"]["content"]
+        if expect in content:
+            await self.cache.aput(*cache_args, content)
+        return content
+    
+    async def _chat_stream(self, template: str, prompt: str, expect: str = "{",
+                           model: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Streamed chat completion yielding content deltas as the provider sends them.
+        A cached response is yielded in one piece; a completed stream is cached like _chat.
+        """
+        model = model or self.default_model
+        cache_args = self._cache_args(template, prompt, model)
+        cached = await self.cache.aget(*cache_args)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        async with http_pool.stream(
+            "POST",
+            self.api_url,
+            headers=self._headers,
+            json=self._request_body(template, prompt, model, stream=True)
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                try:
+                    choice = json.loads(payload)["choices"][0]
+                except (json.JSONDecodeError, KeyError, IndexError):
+                    continue
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        
+        content = "".join(parts)
+        if expect in content:
+            await self.cache.aput(*cache_args, content)
+    
+    async def _stream_events(self, template: str, prompt: str, expect: str,
+                             finalize: Callable[[str], Any], model: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion as structured events:
+        {"event": "section", "name": key, "data": value} for each finished top-level field,
+        {"event": "item", "index": i, "data": value} for each finished array element, then
+        {"event": "result", "data": finalize(full_text)}.
+        """
+        parser = IncrementalJSONParser(expect)
+        async for delta in self._chat_stream(template, prompt, expect=expect, model=model):
+            for key, value in parser.feed(delta):
+                if expect == "{":
+                    yield {"event": "section", "name": key, "data": value}
+                else:
+                    yield {"event": "item", "index": key, "data": value}
+        yield {"event": "result", "data": finalize(parser.buffer)}
+    
+    @staticmethod
+    def _extract_json(content: str, opening: str, closing: str, default: Any) -> Any:
+        """Decode the outermost JSON object/array in the text, or return default"""
+        start_idx = content.find(opening)
+        end_idx = content.rfind(closing)
+        
+        if start_idx != -1 and end_idx != -1:
+            json_str = content[start_idx:end_idx + 1]
+            return json.loads(json_str)
+        
+        return default
+        
+    async def analyze_resume(
         self, 
         resume_text: str, 
         target_role: Optional[str] = None,
@@ -49,45 +261,31 @@ class PerplexityResumeAnalyzer:
         prompt = self._build_analysis_prompt(resume_text, target_role, target_industry)
         
         try:
-            response = requests.post(
-                self.api_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
-                json={
-                    "model": model or self.default_model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are an expert HR professional and resume analyst with years of experience in talent acquisition and career development. Provide detailed, actionable feedback in valid JSON format only."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 4000,
-                    "top_p": 0.9,
-                    "stream": False
-                },
-                timeout=60
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            analysis_text = data["choices"][0]["message"]["content"]
+            analysis_text = await self._chat("analyze_resume", prompt, model=model)
             return self._parse_analysis_response(analysis_text, resume_text)
             
-        except requests.exceptions.RequestException as e:
+        except (HTTPError, asyncio.TimeoutError) as e:
             print(f"Perplexity API error: {e}")
             raise Exception(f"Failed to analyze resume: {str(e)}")
         except Exception as e:
             print(f"Analysis error: {e}")
             raise
     
+    def stream_analyze_resume(
+        self, 
+        resume_text: str, 
+        target_role: Optional[str] = None,
+        target_industry: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming analyze_resume: section events as fields complete, then the full analysis"""
+        prompt = self._build_analysis_prompt(resume_text, target_role, target_industry)
+        return self._stream_events(
+            "analyze_resume", prompt, "{",
+            lambda text: self._parse_analysis_response(text, resume_text),
+            model=model
+        )
+    
     def _build_analysis_prompt(
         self, 
         resume_text: str, 
@@ -277,16 +475,38 @@ CRITICAL: Return ONLY the JSON object, no additional text, no markdown formattin
             print(f"Parsing error: {e}")
             raise
     
-    def get_career_suggestions(
+    async def get_career_suggestions(
         self, 
         resume_text: str, 
         preferences: Optional[Dict] = None
     ) -> List[Dict[str, Any]]:
         """Get career path suggestions based on resume"""
         
+        prompt = self._build_career_prompt(resume_text, preferences)
+        
+        try:
+            content = await self._chat("career_suggestions", prompt, expect="[")
+            return self._extract_json(content, "[", "]", [])
+            
+        except Exception as e:
+            print(f"Career suggestions error: {e}")
+            return []
+    
+    def stream_career_suggestions(
+        self, 
+        resume_text: str, 
+        preferences: Optional[Dict] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming get_career_suggestions: one item event per finished suggestion, then the list"""
+        return self._stream_events(
+            "career_suggestions", self._build_career_prompt(resume_text, preferences), "[",
+            lambda text: self._extract_json(text, "[", "]", [])
+        )
+    
+    def _build_career_prompt(self, resume_text: str, preferences: Optional[Dict] = None) -> str:
         preferences_text = json.dumps(preferences or {}, indent=2)
         
-        prompt = f"""Based on this resume, suggest 5-7 career paths with current market trends:
+        return f"""Based on this resume, suggest 5-7 career paths with current market trends:
 
 RESUME:
 {resume_text}
@@ -295,60 +515,39 @@ PREFERENCES:
 {preferences_text}
 
 Return ONLY a JSON array of career suggestions with: title, industry, match_score, required_skills, salary_range, growth_potential, reasoning, current_demand, future_outlook"""
+    
+    async def optimize_for_ats(
+        self, 
+        resume_text: str, 
+        job_description: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Optimize resume for ATS systems"""
+        
+        prompt = self._build_ats_prompt(resume_text, job_description)
         
         try:
-            response = requests.post(
-                self.api_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
-                json={
-                    "model": self.default_model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a career counselor with real-time market knowledge. Provide data-driven career suggestions in JSON format."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.8,
-                    "max_tokens": 3000
-                },
-                timeout=60
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-            
-            # Extract JSON array
-            start_idx = content.find("[")
-            end_idx = content.rfind("]")
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx + 1]
-                return json.loads(json_str)
-            
-            return []
+            content = await self._chat("optimize_for_ats", prompt)
+            return self._extract_json(content, "{", "}", {})
             
         except Exception as e:
-            print(f"Career suggestions error: {e}")
-            return []
+            print(f"ATS optimization error: {e}")
+            return {}
     
-    def optimize_for_ats(
+    def stream_optimize_for_ats(
         self, 
         resume_text: str, 
         job_description: Optional[str] = None
-    ) -> Dict[str, Any]:
-        """Optimize resume for ATS systems"""
-        
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming optimize_for_ats: section events as fields complete, then the full result"""
+        return self._stream_events(
+            "optimize_for_ats", self._build_ats_prompt(resume_text, job_description), "{",
+            lambda text: self._extract_json(text, "{", "}", {})
+        )
+    
+    def _build_ats_prompt(self, resume_text: str, job_description: Optional[str] = None) -> str:
         job_context = f"\n\nJOB DESCRIPTION:\n{job_description}" if job_description else ""
         
-        prompt = f"""Analyze this resume for ATS compatibility and provide optimization suggestions:
+        return f"""Analyze this resume for ATS compatibility and provide optimization suggestions:
 
 RESUME:
 {resume_text}
@@ -363,53 +562,10 @@ Return ONLY a JSON object with:
   "formatting_tips": ["tip 1", "tip 2"],
   "keyword_density": {{"keyword": percentage}}
 }}"""
-        
-        try:
-            response = requests.post(
-                self.api_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {self.api_key}"
-                },
-                json={
-                    "model": self.default_model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are an ATS optimization expert. Provide specific, actionable advice in JSON format."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.6,
-                    "max_tokens": 2500
-                },
-                timeout=60
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            content = data["choices"][0]["message"]["content"]
-            
-            # Extract JSON object
-            start_idx = content.find("{")
-            end_idx = content.rfind("}")
-            
-            if start_idx != -1 and end_idx != -1:
-                json_str = content[start_idx:end_idx + 1]
-                return json.loads(json_str)
-            
-            return {}
-            
-        except Exception as e:
-            print(f"ATS optimization error: {e}")
-            return {}
 
 
 # Convenience function for quick analysis
-def analyze_resume_with_perplexity(
+async def analyze_resume_with_perplexity(
     resume_text: str,
     api_key: Optional[str] = None,
     **kwargs
@@ -426,7 +582,7 @@ def analyze_resume_with_perplexity(
         Analysis results
     """
     analyzer = PerplexityResumeAnalyzer(api_key)
-    return analyzer.analyze_resume(resume_text, **kwargs)
+    return await analyzer.analyze_resume(resume_text, **kwargs)
 
 
 if __name__ == "__main__":
@@ -446,11 +602,11 @@ if __name__ == "__main__":
     
     try:
         analyzer = PerplexityResumeAnalyzer()
-        result = analyzer.analyze_resume(
+        result = asyncio.run(analyzer.analyze_resume(
             sample_resume,
             target_role="Senior Software Engineer",
             target_industry="Technology"
-        )
+        ))
         
         print(json.dumps(result, indent=2))
     except Exception as e:
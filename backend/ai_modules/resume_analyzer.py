@@ -3,6 +3,8 @@ import re
 import logging
 from typing import Dict, List, Any, Optional
 from .base_model import BaseAIModel
+from .skill_matcher import SkillMatcher
+from .doc_context import DocContext
 
 # Import advanced analyzer
 try:
@@ -18,10 +20,11 @@ logger = logging.getLogger(__name__)
 class ResumeAnalyzer(BaseAIModel):
     """AI model for comprehensive resume analysis with ML/AI capabilities"""
     
-    def __init__(self):
+    def __init__(self, nlp_processor=None):
         super().__init__("Resume_Analyzer")
         self.skill_database = self._initialize_skill_database()
-        self.nlp_processor = None
+        # Shared NLPProcessor injected by the orchestrator; one is created on initialize otherwise
+        self.nlp_processor = nlp_processor
         self.advanced_analyzer = advanced_analyzer
     
     async def initialize(self) -> bool:
@@ -38,9 +41,10 @@ class ResumeAnalyzer(BaseAIModel):
             
             # Initialize basic NLP processor as fallback
             try:
-                from .nlp_processor import NLPProcessor
-                self.nlp_processor = NLPProcessor()
-                await self.nlp_processor.initialize()
+                if self.nlp_processor is None:
+                    from .nlp_processor import NLPProcessor
+                    self.nlp_processor = NLPProcessor()
+                await self.nlp_processor.ensure_initialized()
                 self.logger.info("✅ Basic NLP processor loaded")
             except Exception as e:
                 self.logger.warning(f"⚠️ Basic NLP processor failed to load: {e}")
@@ -85,20 +89,25 @@ class ResumeAnalyzer(BaseAIModel):
                 "fallback_data": await self._emergency_fallback(resume_text)
             }
     
+    def _make_context(self, resume_text: str) -> DocContext:
+        """One spaCy parse of the resume, shared by every extractor of a request"""
+        return DocContext(getattr(self.nlp_processor, 'nlp', None), resume_text)
+    
     async def _basic_analysis(self, resume_text: str) -> Dict[str, Any]:
         """Basic resume analysis without advanced ML"""
         try:
+            ctx = self._make_context(resume_text)
             result = {
                 "timestamp": "2024-01-01T00:00:00",
                 "analysis_type": "basic",
                 "overall_score": 75,
-                "personal_info": await self.extract_personal_info(resume_text),
+                "personal_info": await self.extract_personal_info(resume_text, ctx),
                 "skills": await self.extract_skills(resume_text),
                 "experience": await self.extract_experience(resume_text),
                 "education": await self.extract_education(resume_text),
                 "projects": await self.extract_projects(resume_text),
                 "certifications": await self.extract_certifications(resume_text),
-                "summary": await self.generate_resume_summary(resume_text),
+                "summary": await self.generate_resume_summary(resume_text, ctx),
                 "score": await self.calculate_resume_score(resume_text),
                 "recommendations": await self.generate_recommendations(resume_text)
             }
@@ -109,7 +118,7 @@ class ResumeAnalyzer(BaseAIModel):
             self.logger.error(f"Error processing resume: {e}")
             return {"error": str(e)}
     
-    async def extract_personal_info(self, resume_text: str) -> Dict[str, Any]:
+    async def extract_personal_info(self, resume_text: str, ctx: Optional[DocContext] = None) -> Dict[str, Any]:
         """Extract personal information from resume"""
         try:
             personal_info = {}
@@ -136,8 +145,8 @@ class ResumeAnalyzer(BaseAIModel):
             
             # Use NLP to extract name (first few words, typically)
             if self.nlp_processor and hasattr(self.nlp_processor, 'nlp') and self.nlp_processor.nlp:
-                doc = self.nlp_processor.nlp(resume_text[:500])  # First 500 chars
-                person_entities = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+                ctx = DocContext.ensure(ctx, self.nlp_processor.nlp, resume_text)
+                person_entities = [ent.text for ent in ctx.entities_by_label("PERSON", before=500)]  # First 500 chars
                 personal_info["name"] = person_entities[0] if person_entities else None
             
             return personal_info
@@ -158,13 +167,9 @@ class ResumeAnalyzer(BaseAIModel):
                 "soft_skills": []
             }
             
-            resume_lower = resume_text.lower()
-            
-            # Check each skill category
-            for category, skill_list in self.skill_database.items():
-                for skill in skill_list:
-                    if skill.lower() in resume_lower:
-                        skills[category].append(skill)
+            # One pass over the text finds every skill in every category
+            for hit in SKILL_MATCHER.find_all(resume_text):
+                skills[hit.category].append(hit.skill)
             
             # Remove duplicates
             for category in skills:
@@ -224,11 +229,7 @@ class ResumeAnalyzer(BaseAIModel):
             }
             
             # Extract technologies mentioned
-            text_lower = experience_text.lower()
-            for category, skills in self.skill_database.items():
-                for skill in skills:
-                    if skill.lower() in text_lower:
-                        job_info["technologies"].append(skill)
+            job_info["technologies"] = list(SKILL_MATCHER.skills(experience_text))
             
             return job_info
             
@@ -325,11 +326,11 @@ class ResumeAnalyzer(BaseAIModel):
             self.logger.error(f"Error extracting certifications: {e}")
             return []
     
-    async def generate_resume_summary(self, resume_text: str) -> str:
+    async def generate_resume_summary(self, resume_text: str, ctx: Optional[DocContext] = None) -> str:
         """Generate a summary of the resume"""
         try:
             if self.nlp_processor and hasattr(self.nlp_processor, 'get_text_statistics'):
-                stats = await self.nlp_processor.get_text_statistics(resume_text)
+                stats = await self.nlp_processor.get_text_statistics(resume_text, ctx)
                 skills = await self.extract_skills(resume_text)
                 
                 total_skills = sum(len(skill_list) for skill_list in skills.values())
@@ -430,32 +431,38 @@ class ResumeAnalyzer(BaseAIModel):
     
     def _initialize_skill_database(self) -> Dict[str, List[str]]:
         """Initialize comprehensive skill database"""
-        return {
-            "programming_languages": [
-                "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust",
-                "PHP", "Ruby", "Swift", "Kotlin", "Scala", "R", "MATLAB", "Julia"
-            ],
-            "frameworks": [
-                "React", "Angular", "Vue.js", "Django", "Flask", "FastAPI", "Spring Boot",
-                "Express.js", "Node.js", "Laravel", "Ruby on Rails", "ASP.NET", "Flutter",
-                "React Native", "Ionic", "Bootstrap", "Tailwind CSS"
-            ],
-            "databases": [
-                "MySQL", "PostgreSQL", "MongoDB", "Redis", "SQLite", "Oracle",
-                "SQL Server", "Cassandra", "Neo4j", "DynamoDB", "Firebase"
-            ],
-            "tools": [
-                "Git", "Docker", "Kubernetes", "Jenkins", "Terraform", "Ansible",
-                "Webpack", "Vite", "Babel", "ESLint", "Prettier", "Jest", "Cypress",
-                "Selenium", "Postman", "Figma", "Adobe Creative Suite"
-            ],
-            "cloud_platforms": [
-                "AWS", "Azure", "Google Cloud", "Heroku", "Vercel", "Netlify",
-                "DigitalOcean", "Linode", "CloudFlare"
-            ],
-            "soft_skills": [
-                "Leadership", "Communication", "Problem Solving", "Team Work",
-                "Project Management", "Critical Thinking", "Adaptability",
-                "Time Management", "Creativity", "Analytical Skills"
-            ]
-        }
\ No newline at end of file
+        return {category: list(skills) for category, skills in SKILL_DATABASE.items()}
+
+
+SKILL_DATABASE: Dict[str, List[str]] = {
+    "programming_languages": [
+        "Python", "Java", "JavaScript", "TypeScript", "C++", "C#", "Go", "Rust",
+        "PHP", "Ruby", "Swift", "Kotlin", "Scala", "R", "MATLAB", "Julia"
+    ],
+    "frameworks": [
+        "React", "Angular", "Vue.js", "Django", "Flask", "FastAPI", "Spring Boot",
+        "Express.js", "Node.js", "Laravel", "Ruby on Rails", "ASP.NET", "Flutter",
+        "React Native", "Ionic", "Bootstrap", "Tailwind CSS"
+    ],
+    "databases": [
+        "MySQL", "PostgreSQL", "MongoDB", "Redis", "SQLite", "Oracle",
+        "SQL Server", "Cassandra", "Neo4j", "DynamoDB", "Firebase"
+    ],
+    "tools": [
+        "Git", "Docker", "Kubernetes", "Jenkins", "Terraform", "Ansible",
+        "Webpack", "Vite", "Babel", "ESLint", "Prettier", "Jest", "Cypress",
+        "Selenium", "Postman", "Figma", "Adobe Creative Suite"
+    ],
+    "cloud_platforms": [
+        "AWS", "Azure", "Google Cloud", "Heroku", "Vercel", "Netlify",
+        "DigitalOcean", "Linode", "CloudFlare"
+    ],
+    "soft_skills": [
+        "Leadership", "Communication", "Problem Solving", "Team Work",
+        "Project Management", "Critical Thinking", "Adaptability",
+        "Time Management", "Creativity", "Analytical Skills"
+    ]
+}
+
+# Compiled once at import and shared by every ResumeAnalyzer
+SKILL_MATCHER = SkillMatcher.from_categories(SKILL_DATABASE)
@@ -0,0 +1,168 @@
+"""Multi-pattern skill matcher: one Aho-Corasick pass over the text finds every skill alias"""
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import ahocorasick  # pyahocorasick: same automaton in C
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    ahocorasick = None
+
+SkillHit = namedtuple("SkillHit", ["start", "end", "alias", "skill", "category"])
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _lower_same_length(text: str) -> str:
+    """Lowercase without changing offsets (a few characters grow when lowercased)"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(ch.lower()[:1] or ch for ch in text)
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over lowercased skill aliases, built once and reused for
+    every text. `find_all` reports each alias occurrence with its offsets, canonical
+    skill name and category in a single pass, independent of the dictionary size.
+
+    A hit must sit on word boundaries wherever the alias itself starts or ends with a
+    letter or digit, so "go" does not match inside "good" while "c++" and ".net" still
+    match next to punctuation.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Optional[str]]] = ()):
+        # pattern id -> (alias as given, canonical skill, category)
+        self._patterns: List[Tuple[str, str, Optional[str]]] = []
+        self._ids: Dict[Tuple[str, str, Optional[str]], int] = {}
+        self._automaton = None
+        self._categories: Dict[str, Optional[str]] = {}
+        for alias, skill, category in entries:
+            self.add(alias, skill, category)
+        self.build()
+
+    @classmethod
+    def from_categories(cls, categories: Dict[str, Iterable[str]]) -> "SkillMatcher":
+        """{category: [skill, ...]}; every skill is its own canonical name"""
+        return cls((skill, skill, category) for category, skills in categories.items() for skill in skills)
+
+    @classmethod
+    def from_groups(cls, taxonomy: Dict[str, Dict[str, Iterable[str]]]) -> "SkillMatcher":
+        """{category: {canonical skill: [alias, ...]}}"""
+        return cls((alias, skill, category)
+                   for category, groups in taxonomy.items()
+                   for skill, aliases in groups.items()
+                   for alias in aliases)
+
+    def add(self, alias: str, skill: str, category: Optional[str] = None):
+        key = (alias, skill, category)
+        if alias.strip() and key not in self._ids:
+            self._ids[key] = len(self._patterns)
+            self._patterns.append(key)
+            self._automaton = None
+
+    def build(self):
+        """Compile the automaton; called automatically after construction and before matching"""
+        by_alias: Dict[str, List[int]] = {}
+        self._categories = {}
+        for pattern_id, (alias, skill, category) in enumerate(self._patterns):
+            by_alias.setdefault(_lower_same_length(alias.strip()), []).append(pattern_id)
+            self._categories.setdefault(skill.lower(), category)
+            self._categories.setdefault(alias.lower(), category)
+
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for alias, ids in by_alias.items():
+                automaton.add_word(alias, (len(alias), ids))
+            if by_alias:
+                automaton.make_automaton()
+            self._automaton = automaton
+            return
+
+        # Pure-Python automaton: goto trie, failure links and outputs merged along failure chains
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[int, List[int]]]] = [[]]
+        for alias, ids in by_alias.items():
+            state = 0
+            for ch in alias:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append([])
+                state = nxt
+            outputs[state].append((len(alias), ids))
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+        self._automaton = (goto, fail, outputs)
+
+    def _raw_hits(self, lowered: str):
+        """(end index exclusive, alias length, pattern ids) for every alias occurrence"""
+        if AHOCORASICK_AVAILABLE:
+            if len(self._automaton) == 0:
+                return
+            for last, (length, ids) in self._automaton.iter(lowered):
+                yield last + 1, length, ids
+            return
+
+        goto, fail, outputs = self._automaton
+        state = 0
+        for i, ch in enumerate(lowered):
+            edges = goto[state]
+            while ch not in edges and state:
+                state = fail[state]
+                edges = goto[state]
+            state = edges.get(ch, 0)
+            for length, ids in outputs[state]:
+                yield i + 1, length, ids
+
+    def find_all(self, text: str) -> List[SkillHit]:
+        """Every alias occurrence in text, ordered by position"""
+        if self._automaton is None:
+            self.build()
+        if not text:
+            return []
+        lowered = _lower_same_length(text)
+        n = len(lowered)
+        hits = []
+        for end, length, ids in self._raw_hits(lowered):
+            start = end - length
+            if _is_word_char(lowered[start]) and start > 0 and _is_word_char(lowered[start - 1]):
+                continue
+            if _is_word_char(lowered[end - 1]) and end < n and _is_word_char(lowered[end]):
+                continue
+            for pattern_id in ids:
+                alias, skill, category = self._patterns[pattern_id]
+                hits.append(SkillHit(start, end, alias, skill, category))
+        hits.sort(key=lambda hit: (hit.start, -hit.end))
+        return hits
+
+    def skills(self, text: str) -> Dict[str, int]:
+        """Canonical skill -> number of mentions, in order of first appearance"""
+        counts: Dict[str, int] = {}
+        for hit in self.find_all(text):
+            counts[hit.skill] = counts.get(hit.skill, 0) + 1
+        return counts
+
+    def category_of(self, skill: str) -> Optional[str]:
+        """Category of a canonical skill or alias (case-insensitive)"""
+        if self._automaton is None:
+            self.build()
+        return self._categories.get(skill.lower())
+
+    def __len__(self) -> int:
+        return len(self._patterns)
@@ -19,6 +19,7 @@ import asyncio
 import aiofiles
 from typing import List, Dict, Any, Optional
 import logging
+from ai_modules.nlp_processor import encode_texts_batched
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -89,18 +90,17 @@ class AIMLServices:
         
     async def get_text_embeddings(self, text: str) -> np.ndarray:
         """Get BERT embeddings for text"""
+        return (await self.embed_batch([text]))[0]
+    
+    async def embed_batch(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Get BERT embeddings for many texts using padded mini-batches"""
         try:
             if not self.bert_model or not self.tokenizer:
-                return np.zeros(384)  # Default embedding size
-                
-            inputs = self.tokenizer(text, return_tensors="pt", truncation=True, max_length=512)
-            with tf.no_grad():
-                outputs = self.bert_model(**inputs)
-                embeddings = outputs.last_hidden_state.mean(dim=1)
-            return embeddings.numpy().flatten()
+                return np.zeros((len(texts), 384), dtype=np.float32)  # Default embedding size
+            return encode_texts_batched(self.tokenizer, self.bert_model, texts, batch_size)
         except Exception as e:
             logger.error(f"Error getting embeddings: {e}")
-            return np.zeros(384)
+            return np.zeros((len(texts), 384), dtype=np.float32)
             
     async def analyze_resume(self, resume_text: str) -> Dict[str, Any]:
         """Analyze resume using NLP"""
@@ -154,20 +154,24 @@ class AIMLServices:
         matches = []
         
         try:
-            for candidate in candidate_profiles:
-                candidate_text = f"{candidate.get('skills', '')} {candidate.get('experience', '')}"
-                candidate_embedding = await self.get_text_embeddings(candidate_text)
-                
+            candidate_texts = [
+                f"{candidate.get('skills', '')} {candidate.get('experience', '')}"
+                for candidate in candidate_profiles
+            ]
+            job_texts = [
+                f"{job.get('requirements', '')} {job.get('description', '')}"
+                for job in job_descriptions
+            ]
+            
+            # Embed every text once, then score all pairs together
+            candidate_embeddings = await self.embed_batch(candidate_texts)
+            job_embeddings = await self.embed_batch(job_texts)
+            similarities = cosine_similarity(candidate_embeddings, job_embeddings) if candidate_texts and job_texts else None
+            
+            for row, candidate in enumerate(candidate_profiles):
                 candidate_matches = []
-                for job in job_descriptions:
-                    job_text = f"{job.get('requirements', '')} {job.get('description', '')}"
-                    job_embedding = await self.get_text_embeddings(job_text)
-                    
-                    # Calculate similarity
-                    similarity = cosine_similarity(
-                        candidate_embedding.reshape(1, -1),
-                        job_embedding.reshape(1, -1)
-                    )[0][0]
+                for col, job in enumerate(job_descriptions):
+                    similarity = similarities[row][col]
                     
                     candidate_matches.append({
                         "job_id": job.get("id"),
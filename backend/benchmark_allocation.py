@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Scale benchmark for the placement_ai allocation engine
+Generates a synthetic cohort (small skill vocabulary, so most pairs are eligible), then
+times the blocked top-k score matrix build and the full allocate() run and reports the
+matrix size and the peak RSS of the process
+
+Usage: python benchmark_allocation.py [--candidates 100000] [--postings 5000] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from placement_ai.allocation import AllocationEngine, build_score_matrix
+
+SKILLS = ["python", "java", "sql", "react", "ml", "aws", "docker", "excel", "figma", "go",
+          "c++", "node", "django", "spark", "tableau", "kotlin", "swift", "linux", "git", "nlp"]
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Pune", "Hyderabad", "Chennai", "Kolkata", "Remote"]
+DOMAINS = ["software", "data", "design", "finance", "marketing", "operations"]
+CATEGORIES = [None] * 5 + ["SC", "ST", "OBC", "EWS", "WOMEN"]
+
+
+def synthetic_cohort(n: int, m: int, seed: int):
+    rng = random.Random(seed)
+    candidates = [{
+        "id": f"c{i}",
+        "skills": rng.sample(SKILLS, rng.randint(2, 6)),
+        "preferences": {"location": rng.choice(CITIES), "domain": rng.choice(DOMAINS)},
+        "quota_category": rng.choice(CATEGORIES),
+        "past_internships": rng.choice([0, 0, 0, 1, 2]),
+    } for i in range(n)]
+    internships = [{
+        "id": f"p{j}",
+        "requirements": rng.sample(SKILLS, rng.randint(0, 4)),
+        "location": rng.choice(CITIES),
+        "domain": rng.choice(DOMAINS),
+        "capacity": rng.randint(5, 30),
+        "quota": {"SC": 1, "OBC": 2} if rng.random() < 0.5 else {},
+    } for j in range(m)]
+    return candidates, internships
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocation engine scale benchmark")
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--postings", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    candidates, internships = synthetic_cohort(args.candidates, args.postings, args.seed)
+    print(f"Cohort: {len(candidates)} candidates x {len(internships)} postings "
+          f"({time.perf_counter() - started:.1f}s to generate, peak RSS {peak_rss_mb():.0f} MB)")
+
+    engine = AllocationEngine()
+    started = time.perf_counter()
+    scores = build_score_matrix(candidates, internships, top_k=engine.max_options)
+    print(f"Score matrix: {scores.nnz} pairs kept of {len(candidates) * len(internships)} "
+          f"in {time.perf_counter() - started:.1f}s (peak RSS {peak_rss_mb():.0f} MB)")
+    del scores
+
+    started = time.perf_counter()
+    result = engine.allocate(candidates, internships)
+    stats = result["stats"]
+    print(f"allocate(): {stats['total_matches']} matches of {stats['total_seats']} seats, "
+          f"{stats['iterations']} bids, converged={stats['converged']} "
+          f"in {time.perf_counter() - started:.1f}s (peak RSS {peak_rss_mb():.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the regex-based resume parsing in AdvancedNLPProcessor
+Times contact, experience, education and skill extraction per resume (spaCy is not loaded)
+
+Usage: python benchmark_resume_parsing.py [--runs 200] [--file resume.txt]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules.advanced_nlp_processor import AdvancedNLPProcessor
+
+SAMPLE_RESUME = """
+Priya Sharma
+Bengaluru, India | priya.sharma@example.com | +91 98765 43210
+linkedin.com/in/priya-sharma | github.com/priyasharma | https://priyasharma.dev
+
+SUMMARY
+Senior Software Engineer with 5+ years of experience building data platforms and APIs.
+Expert in Python and Django, working knowledge of Go, familiar with Kubernetes and Helm.
+
+EXPERIENCE
+Senior Backend Engineer, Acme Analytics (2021 - Present)
+- Designed REST and GraphQL microservices in Python, FastAPI and PostgreSQL serving 2M requests/day
+- Migrated batch pipelines from Hadoop to Spark and Airflow on AWS (EC2, S3, Lambda)
+- Introduced pytest and GitHub Actions based CI/CD, cutting release time by 40%
+
+Software Developer, Bright Labs (2019 - 2021)
+- Built React and TypeScript dashboards backed by Node.js and MongoDB
+- Trained XGBoost and scikit-learn models for churn prediction; exposure to PyTorch and NLP with spaCy
+
+EDUCATION
+Bachelor of Technology in Computer Science, National Institute of Technology (2015 - 2019)
+GPA: 8.7/10
+M.Tech Data Science, Indian Institute of Science (2019 - 2021)
+
+CERTIFICATIONS
+AWS Certified Solutions Architect
+Certified Kubernetes Administrator certification
+Google Cloud Professional Data Engineer certification
+
+SKILLS
+Python, Java, C++, JavaScript, SQL, Docker, Kubernetes, Redis, Elasticsearch, Tableau, Power BI, Git
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AdvancedNLPProcessor regex parsing")
+    parser.add_argument("--runs", type=int, default=200, help="resumes parsed per measurement")
+    parser.add_argument("--file", help="plain-text resume to parse instead of the built-in sample")
+    args = parser.parse_args()
+
+    text = SAMPLE_RESUME
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            text = f.read()
+
+    processor = AdvancedNLPProcessor()
+    stages = [
+        ("contact", processor.extract_contact_information),
+        ("experience", processor.extract_experience_details),
+        ("education", processor.extract_education_details),
+        ("skills", processor.analyze_skills_with_ml),
+    ]
+
+    print(f"📄 Resume: {len(text)} chars, {args.runs} runs per stage")
+    total = 0.0
+    for name, fn in stages:
+        fn(text)  # warm-up
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            fn(text)
+        per_resume = (time.perf_counter() - start) / args.runs * 1000
+        total += per_resume
+        print(f"  {name:<12} {per_resume:8.3f} ms/resume")
+    print(f"  {'total':<12} {total:8.3f} ms/resume")
+
+
+if __name__ == "__main__":
+    main()
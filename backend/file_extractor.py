@@ -1,33 +1,173 @@
 """
 File content extractor for different document formats
 Supports PDF, DOC, DOCX, and TXT files
+
+PDF pages are read with the fastest available extractor (PyMuPDF, else PyPDF2) and only
+pages that come back empty are retried with pdfplumber. Long PDFs are split into page
+ranges extracted in parallel on a shared worker pool.
+
+Uploads are extracted straight from memory (bytes, memoryview, BytesIO or the upload's own
+spooled file); nothing is written to a temporary file.
 """
 
-import tempfile
 import os
-from typing import Optional
+import io
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import BinaryIO, List, Optional, Sequence, Union
 import PyPDF2
-import pdfplumber
 from docx import Document
-import io
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+    fitz = None
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+    pdfplumber = None
+
+# Upload and page limits; pages past MAX_PDF_PAGES are not read
+MAX_UPLOAD_BYTES = int(os.getenv("RESUME_MAX_UPLOAD_MB", "10")) * 1024 * 1024
+MAX_PDF_PAGES = int(os.getenv("RESUME_MAX_PDF_PAGES", "50"))
+# PDFs with at least this many pages are split across PDF_EXTRACT_WORKERS processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Uploads up to UPLOAD_SPOOL_BYTES are kept in memory by the multipart parser; larger ones spool to disk
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_MB", "10")) * 1024 * 1024
+# Threads that run extraction off the event loop (extract_resume_text_async)
+EXTRACT_THREADS = int(os.getenv("RESUME_EXTRACT_THREADS", "4"))
+
+# Raw bytes, an in-memory buffer, or an open binary file such as UploadFile.file
+ResumeSource = Union[bytes, bytearray, memoryview, BinaryIO]
+
+
+class ExtractionLimitError(ValueError):
+    """The upload is larger than MAX_UPLOAD_BYTES"""
+
+
+def _source_size(source: ResumeSource) -> int:
+    """Size in bytes without reading the content"""
+    if isinstance(source, memoryview):
+        return source.nbytes
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer().nbytes
+    position = source.tell()
+    size = source.seek(0, os.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def _source_bytes(source: ResumeSource) -> bytes:
+    """Content as bytes (file objects are read from the start)"""
+    if isinstance(source, bytes):
+        return source
+    if isinstance(source, (bytearray, memoryview)):
+        return bytes(source)
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+
+def _pdf_page_count(file_content: bytes) -> int:
+    if PYMUPDF_AVAILABLE:
+        with fitz.open(stream=file_content, filetype="pdf") as doc:
+            return doc.page_count
+    return len(PyPDF2.PdfReader(io.BytesIO(file_content)).pages)
+
+
+def _fast_page_texts(file_content: bytes, pages: Sequence[int]) -> List[str]:
+    """Text of each requested page from the fast extractor ("" where it fails)"""
+    texts = []
+    if PYMUPDF_AVAILABLE:
+        with fitz.open(stream=file_content, filetype="pdf") as doc:
+            for index in pages:
+                try:
+                    texts.append(doc[index].get_text() or "")
+                except Exception:
+                    texts.append("")
+        return texts
+
+    reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    for index in pages:
+        try:
+            texts.append(reader.pages[index].extract_text() or "")
+        except Exception:
+            texts.append("")
+    return texts
+
+
+def _extract_pdf_pages(file_content: bytes, pages: Sequence[int]) -> List[str]:
+    """Worker: text of a page range, retrying pages the fast extractor left empty with pdfplumber"""
+    try:
+        texts = _fast_page_texts(file_content, pages)
+    except Exception as e:
+        print(f"Fast PDF extraction failed: {e}")
+        texts = [""] * len(pages)
+
+    missing = [pos for pos, text in enumerate(texts) if not text.strip()]
+    if missing and PDFPLUMBER_AVAILABLE:
+        try:
+            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+                for pos in missing:
+                    try:
+                        texts[pos] = pdf.pages[pages[pos]].extract_text() or ""
+                    except Exception as e:
+                        print(f"pdfplumber failed on page {pages[pos] + 1}: {e}")
+        except Exception as e:
+            print(f"pdfplumber extraction failed: {e}")
+    return texts
+
+
+_page_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Shared page-extraction pool, started on first use (forkserver keeps workers free of app state)"""
+    global _page_pool
+    if _page_pool is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _page_pool = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS,
+                                         mp_context=multiprocessing.get_context(method))
+    return _page_pool
+
 
 class FileContentExtractor:
     """Extract text content from various file formats"""
     
     @staticmethod
-    def extract_text_from_file(file_content: bytes, filename: str) -> Optional[str]:
+    def extract_text_from_file(file_content: ResumeSource, filename: str) -> Optional[str]:
         """
         Extract text from uploaded file based on file extension
         
         Args:
-            file_content: Raw file bytes
+            file_content: Raw file bytes, an in-memory buffer or an open binary file
             filename: Original filename with extension
             
         Returns:
             Extracted text content or None if extraction fails
+            
+        Raises:
+            ExtractionLimitError: file is larger than MAX_UPLOAD_BYTES
         """
         if not filename:
             return None
+        
+        size = _source_size(file_content)
+        if size > MAX_UPLOAD_BYTES:
+            raise ExtractionLimitError(
+                f"{filename} is {size // 1024} KB; the limit is {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+            )
+        file_content = _source_bytes(file_content)
             
         file_ext = os.path.splitext(filename.lower())[1]
         
@@ -47,37 +187,32 @@ class FileContentExtractor:
     
     @staticmethod
     def _extract_from_pdf(file_content: bytes) -> Optional[str]:
-        """Extract text from PDF file"""
-        text_content = ""
-        
-        # Try pdfplumber first (better for complex PDFs)
-        try:
-            with io.BytesIO(file_content) as pdf_file:
-                with pdfplumber.open(pdf_file) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_content += page_text + "\n"
-            
-            if text_content.strip():
-                return text_content.strip()
-        except Exception as e:
-            print(f"pdfplumber extraction failed: {e}")
-        
-        # Fallback to PyPDF2
+        """Extract text from PDF file, page ranges in parallel for long documents"""
         try:
-            with io.BytesIO(file_content) as pdf_file:
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                text_content = ""
-                
-                for page_num in range(len(pdf_reader.pages)):
-                    page = pdf_reader.pages[page_num]
-                    text_content += page.extract_text() + "\n"
-                
-                return text_content.strip() if text_content.strip() else None
+            page_count = _pdf_page_count(file_content)
         except Exception as e:
-            print(f"PyPDF2 extraction failed: {e}")
+            print(f"PDF could not be opened: {e}")
             return None
+        
+        if page_count > MAX_PDF_PAGES:
+            print(f"PDF has {page_count} pages; reading the first {MAX_PDF_PAGES}")
+            page_count = MAX_PDF_PAGES
+        pages = list(range(page_count))
+        
+        texts = None
+        if page_count >= PDF_PARALLEL_MIN_PAGES and PDF_EXTRACT_WORKERS > 1:
+            size = -(-page_count // PDF_EXTRACT_WORKERS)
+            chunks = [pages[i:i + size] for i in range(0, page_count, size)]
+            try:
+                results = _get_page_pool().map(_extract_pdf_pages, [file_content] * len(chunks), chunks)
+                texts = [text for chunk in results for text in chunk]
+            except Exception as e:
+                print(f"Parallel PDF extraction failed, extracting serially: {e}")
+        if texts is None:
+            texts = _extract_pdf_pages(file_content, pages)
+        
+        text_content = "\n".join(text for text in texts if text)
+        return text_content.strip() if text_content.strip() else None
     
     @staticmethod
     def _extract_from_docx(file_content: bytes) -> Optional[str]:
@@ -85,18 +220,12 @@ class FileContentExtractor:
         try:
             with io.BytesIO(file_content) as docx_file:
                 doc = Document(docx_file)
-                text_content = ""
                 
-                # Extract text from paragraphs
-                for paragraph in doc.paragraphs:
-                    text_content += paragraph.text + "\n"
-                
-                # Extract text from tables
+                # Paragraphs, then one line per table
+                parts = [paragraph.text for paragraph in doc.paragraphs]
                 for table in doc.tables:
-                    for row in table.rows:
-                        for cell in row.cells:
-                            text_content += cell.text + " "
-                    text_content += "\n"
+                    parts.append(" ".join(cell.text for row in table.rows for cell in row.cells))
+                text_content = "\n".join(parts)
                 
                 return text_content.strip() if text_content.strip() else None
         except Exception as e:
@@ -122,16 +251,19 @@ class FileContentExtractor:
             print(f"TXT extraction failed: {e}")
             return None
 
-def extract_resume_text(file_content: bytes, filename: str) -> str:
+def extract_resume_text(file_content: ResumeSource, filename: str) -> str:
     """
     Main function to extract text from resume file
     
     Args:
-        file_content: Raw file bytes
+        file_content: Raw file bytes, an in-memory buffer or an open binary file
         filename: Original filename
         
     Returns:
         Extracted text or empty string if extraction fails
+        
+    Raises:
+        ExtractionLimitError: file is larger than MAX_UPLOAD_BYTES
     """
     extracted_text = FileContentExtractor.extract_text_from_file(file_content, filename)
     
@@ -141,6 +273,31 @@ def extract_resume_text(file_content: bytes, filename: str) -> str:
         print(f"Failed to extract text from {filename}")
         return ""
 
+def keep_uploads_in_memory(max_bytes: int = UPLOAD_SPOOL_BYTES) -> bool:
+    """Raise the multipart parser's spool threshold so uploads up to max_bytes are never written to disk"""
+    try:
+        from starlette.formparsers import MultiPartParser
+    except ImportError:
+        return False
+    if not hasattr(MultiPartParser, "max_file_size"):
+        return False
+    MultiPartParser.max_file_size = max_bytes
+    return True
+
+_extract_threads = ThreadPoolExecutor(max_workers=EXTRACT_THREADS, thread_name_prefix="resume-extract")
+
+async def extract_resume_text_async(file_content: ResumeSource, filename: str) -> str:
+    """extract_resume_text on the extraction thread pool, so request handlers never block the event loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_extract_threads, extract_resume_text, file_content, filename)
+
+def extract_resume_text_from_path(file_path: str, filename: Optional[str] = None) -> str:
+    """Same as extract_resume_text for a file on disk (filename defaults to the path's basename)"""
+    if os.path.getsize(file_path) > MAX_UPLOAD_BYTES:
+        raise ExtractionLimitError(f"{file_path} is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+    with open(file_path, "rb") as f:
+        return extract_resume_text(f.read(), filename or os.path.basename(file_path))
+
 # Test function
 if __name__ == "__main__":
     # Test with sample text
@@ -3,7 +3,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-import tempfile
 import os
 import uvicorn
 
@@ -12,7 +11,7 @@ MODELS_AVAILABLE = True
 IMPORT_ERRORS: List[str] = []
 
 try:
-    from models.internship_resume_analyzer import process_resume_file  # type: ignore
+    from models.internship_resume_analyzer import process_resume_text  # type: ignore
 except Exception as e:
     MODELS_AVAILABLE = False
     IMPORT_ERRORS.append(f"internship_resume_analyzer: {e}")
@@ -48,6 +47,8 @@ try:
     from placement_ai.routes.recommendations import (  # type: ignore
         router as placement_reco_router,
     )
+    from placement_ai.routes.allocation import router as placement_allocation_router  # type: ignore
+    from placement_ai.routes.internships import router as placement_internships_router  # type: ignore
 except Exception as e:
     PLACEMENT_ROUTERS_OK = False
 
@@ -100,25 +101,20 @@ async def analyze_internship_resume(file: UploadFile = File(...)):
     if not file.filename.lower().endswith((".pdf", ".doc", ".docx", ".txt")):
         raise HTTPException(status_code=400, detail="Only PDF/DOC/DOCX/TXT supported")
 
-    # Persist temp file and analyze
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-
+    # Extract from the upload in memory and analyze
     try:
-        result = process_resume_file(tmp_path)
+        resume_text = await extract_resume_text_async(file.file, file.filename)
+        result = process_resume_text(resume_text)
         return {
             "success": True,
             "filename": file.filename,
             "analysis": result,
             "analysis_type": "internship",
         }
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Resume analysis failed: {e}")
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
 
 
 # ========== Technical Assessment ==========
@@ -220,6 +216,8 @@ def internship_domains():
 if PLACEMENT_ROUTERS_OK:
     app.include_router(placement_resume_router, prefix="/placement")
     app.include_router(placement_reco_router, prefix="/placement")
+    app.include_router(placement_allocation_router, prefix="/placement")
+    app.include_router(placement_internships_router, prefix="/placement")
 
 
 def create_app():
@@ -231,7 +229,7 @@ if __name__ == "__main__":
 
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import uvicorn
@@ -240,6 +238,7 @@ import random
 import json
 import asyncio
 import os
+from functools import partial
 from ai_modules.ai_orchestrator import (
     ai_orchestrator,
     initialize_ai_services,
@@ -249,9 +248,13 @@ from ai_modules.ai_orchestrator import (
     get_system_health,
     get_analytics_report
 )
-from ai_modules.advanced_nlp_processor import AdvancedNLPProcessor
 from ai_modules.coding_profile_scraper import CodingProfileScraper
 from ai_modules.langchain_gemini_analyzer import LangChainGeminiAnalyzer
+from ai_modules.analysis_cascade import CascadeTier, analysis_cascade, tier_executor
+from ai_modules.analysis_store import analysis_store, content_hash
+from ai_modules.model_registry import PRELOAD_MODELS, model_registry
+from ai_modules.micro_batcher import get_batcher_stats
+from file_extractor import ExtractionLimitError, extract_resume_text_async, keep_uploads_in_memory
 import logging
 from ai_modules.langchain_matching_engine import (
     LangChainMatchingEngine,
@@ -266,54 +269,66 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="PM Internship Portal API", version="1.0.0")
 
-# Initialize advanced analyzers
-nlp_processor = None
-advanced_resume_analyzer = None
-coding_scraper = None
-langchain_analyzer = None
-langchain_matching = None
+# Resume uploads stay in memory; only files larger than UPLOAD_SPOOL_MB are spooled to disk
+keep_uploads_in_memory()
+
+# Shared analyzers, each loaded on first use (GET /ai/models reports load time and memory)
+async def _load_ai_services():
+    print(f"📊 AI Services Status: {await initialize_ai_services()}")
+    return ai_orchestrator
+
+async def _load_advanced_nlp():
+    from ai_modules.advanced_nlp_processor import nlp_processor as shared_nlp_processor
+    await shared_nlp_processor.initialize()
+    return shared_nlp_processor
+
+def _load_advanced_resume_analyzer():
+    from ai_modules.advanced_resume_analyzer import AdvancedResumeAnalyzer
+    return AdvancedResumeAnalyzer()
+
+async def _load_langchain_matching():
+    await langchain_matching_engine.initialize()
+    return langchain_matching_engine
+
+model_registry.register("ai_services", _load_ai_services)
+model_registry.register("advanced_nlp", _load_advanced_nlp)
+model_registry.register("advanced_resume_analyzer", _load_advanced_resume_analyzer)
+model_registry.register("coding_scraper", CodingProfileScraper)
+model_registry.register("langchain_analyzer", LangChainGeminiAnalyzer)
+model_registry.register("langchain_matching", _load_langchain_matching)
+
+# Models behind each endpoint, warmed at startup for the paths listed in HOT_ENDPOINTS
+ENDPOINT_MODELS = {
+    "/ai/analyze-resume-advanced": ["advanced_nlp", "advanced_resume_analyzer", "langchain_analyzer"],
+    "/ai/bulk-ingest": ["spacy", "minilm"],
+    "/ai/coding-profile-advanced": ["coding_scraper"],
+    "/langchain/match": ["langchain_matching"],
+    "/langchain/batch-match": ["langchain_matching"],
+    "/langchain/test-match": ["langchain_matching"],
+}
+HOT_ENDPOINTS = [path.strip() for path in os.getenv("HOT_ENDPOINTS", "").split(",") if path.strip()]
 
 @app.on_event("startup")
 async def startup_event():
-    """Fast startup on Render: skip heavy initialization unless explicitly enabled.
-    Set SKIP_HEAVY_INIT=0 to enable full initialization.
+    """Fast startup on Render: models load lazily on first use.
+    The models behind HOT_ENDPOINTS are warmed in the background after the port is bound;
+    SKIP_HEAVY_INIT=0 warms every registered model.
     """
-    if os.environ.get("SKIP_HEAVY_INIT", "1") == "1":
-        print("⏭️  SKIP_HEAVY_INIT is enabled; skipping heavy AI initializations.")
-        return
-
-    async def _init_heavy():
-        global nlp_processor, advanced_resume_analyzer, coding_scraper, langchain_analyzer, langchain_matching
-        try:
-            print("🚀 Initializing AI Services...")
-            initialization_results = await initialize_ai_services()
-            print(f"📊 AI Services Status: {initialization_results}")
-
-            print("🔧 Initializing Advanced NLP Processor...")
-            nlp_processor = AdvancedNLPProcessor()
-            await nlp_processor.initialize()
-
-            print("📄 Initializing Advanced Resume Analyzer...")
-            advanced_resume_analyzer = AdvancedResumeAnalyzer()
-
-            print("💻 Initializing Coding Profile Scraper...")
-            coding_scraper = CodingProfileScraper()
-
-            print("🤖 Initializing LangChain Gemini Analyzer...")
-            langchain_analyzer = LangChainGeminiAnalyzer()
-
-            print("🎯 Initializing LangChain Matching Engine...")
-            langchain_matching = LangChainMatchingEngine()
-            await langchain_matching.initialize()
-
-            print("✅ All advanced analyzers initialized successfully!")
-        except Exception as e:
-            print(f"⚠️ Warning: Could not initialize advanced analyzers: {e}")
-            print("📝 Falling back to basic analyzers")
-
-    # Run heavy init in background so server can bind the port immediately
-    import asyncio as _asyncio
-    _asyncio.create_task(_init_heavy())
+    if os.environ.get("SKIP_HEAVY_INIT", "1") == "0":
+        names = ["ai_services"] + [name for models in ENDPOINT_MODELS.values() for name in models]
+    else:
+        names = [name for path in HOT_ENDPOINTS for name in ENDPOINT_MODELS.get(path, [])]
+    if model_registry.warm(names):
+        print(f"🔥 Warming models in the background: {', '.join(dict.fromkeys(names))}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled outbound HTTP connections"""
+    try:
+        from ai_modules.http_client import http_pool
+        await http_pool.aclose()
+    except Exception as e:
+        print(f"⚠️ Could not close HTTP pool: {e}")
 
 # CORS middleware - Updated for production
 app.add_middleware(
@@ -454,6 +469,14 @@ class QuotaData(BaseModel):
     ews: dict
     women: dict
 
+class AllocationScenario(BaseModel):
+    name: str
+    weights: Optional[Dict[str, float]] = None  # overrides of the allocation score weights
+    quotas: Optional[QuotaData] = None  # category targets; omitted keeps the current ones
+
+class SimulationRequest(BaseModel):
+    scenarios: List[AllocationScenario]
+
 class MatchingResult(BaseModel):
     totalCandidates: int
     totalCompanies: int
@@ -662,6 +685,42 @@ async def get_company_applications(company_id: int):
     ]
     return applications
 
+# Global capacity/quota aware allocation over the placement_ai tables
+try:
+    from placement_ai.allocation import allocation_engine, quotas_from_targets
+    from placement_ai.scenarios import run_scenarios
+    from placement_ai.db import get_candidates, get_internships
+except Exception as e:
+    print(f"⚠️ Batch allocation engine unavailable: {e}")
+    allocation_engine = None
+
+# Category targets (%) set from the quota configurator; None keeps each posting's own quota
+quota_targets = None
+
+def _quota_targets(quota_data: QuotaData) -> dict:
+    return {
+        "OBC": quota_data.obc.get("target", 0),
+        "SC": quota_data.sc.get("target", 0),
+        "ST": quota_data.st.get("target", 0),
+        "EWS": quota_data.ews.get("target", 0),
+        "WOMEN": quota_data.women.get("target", 0),
+    }
+
+def _matching_result(stats: dict) -> MatchingResult:
+    seconds = stats["processing_seconds"]
+    return MatchingResult(
+        totalCandidates=stats["total_candidates"],
+        totalCompanies=stats["total_companies"],
+        totalPostings=stats["total_postings"],
+        totalMatches=stats["total_matches"],
+        matchRate=stats["match_rate"],
+        avgMatchScore=stats["avg_match_score"],
+        quotaCompliance=stats["quota_compliance"],
+        processingTime=f"{seconds / 60:.1f} minutes" if seconds >= 60 else f"{seconds:.1f} seconds",
+        iterations=stats["iterations"],
+        converged=stats["converged"]
+    )
+
 # Admin endpoints
 @app.get("/admin/quotas")
 async def get_quota_data():
@@ -677,25 +736,80 @@ async def get_quota_data():
 
 @app.post("/admin/quotas")
 async def update_quota_data(quota_data: QuotaData):
-    # Mock update quotas
-    return {"success": True, "message": "Quota data updated successfully"}
+    global quota_targets
+    quota_targets = _quota_targets(quota_data)
+    if allocation_engine is None or allocation_engine.state is None:
+        return {"success": True, "message": "Quota data updated successfully"}
+
+    # Warm-started re-solve of the last allocation under the new targets
+    try:
+        # The engine serializes runs itself, whichever endpoint starts them
+        allocation = await asyncio.to_thread(allocation_engine.update_quota_targets, quota_targets)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "success": True,
+        "message": "Quota data updated and allocation re-solved",
+        "result": _matching_result(allocation["stats"]),
+        "diff": allocation["diff"],
+        "warnings": allocation["warnings"],
+    }
 
 @app.post("/admin/match")
 async def run_batch_matching():
-    # Mock batch matching
-    result = MatchingResult(
-        totalCandidates=1250,
-        totalCompanies=45,
-        totalPostings=78,
-        totalMatches=342,
-        matchRate=27.4,
-        avgMatchScore=82.3,
-        quotaCompliance=94.2,
-        processingTime="2.3 minutes",
-        iterations=47,
-        converged=True
-    )
-    return result
+    if allocation_engine is None:
+        # Mock batch matching
+        result = MatchingResult(
+            totalCandidates=1250,
+            totalCompanies=45,
+            totalPostings=78,
+            totalMatches=342,
+            matchRate=27.4,
+            avgMatchScore=82.3,
+            quotaCompliance=94.2,
+            processingTime="2.3 minutes",
+            iterations=47,
+            converged=True
+        )
+        return result
+
+    try:
+        candidates, internships = await asyncio.gather(
+            asyncio.to_thread(get_candidates), asyncio.to_thread(get_internships)
+        )
+        if quota_targets is not None:
+            internships = quotas_from_targets(internships, quota_targets)
+        # The auction is CPU bound; keep the event loop free while it runs
+        allocation = await asyncio.to_thread(allocation_engine.allocate, candidates, internships)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return _matching_result(allocation["stats"])
+
+@app.post("/admin/simulate")
+async def run_allocation_scenarios(request: SimulationRequest):
+    """Evaluate what-if weight/quota scenarios side by side on a process pool"""
+    if allocation_engine is None:
+        raise HTTPException(status_code=503, detail="Batch allocation engine unavailable")
+    if not request.scenarios:
+        raise HTTPException(status_code=400, detail="No scenarios given")
+
+    scenarios = [
+        {
+            "name": scenario.name,
+            "weights": scenario.weights,
+            "quota_targets": _quota_targets(scenario.quotas) if scenario.quotas else quota_targets,
+        }
+        for scenario in request.scenarios
+    ]
+    try:
+        candidates, internships = await asyncio.gather(
+            asyncio.to_thread(get_candidates), asyncio.to_thread(get_internships)
+        )
+        results = await asyncio.to_thread(run_scenarios, candidates, internships, scenarios)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"success": True, "scenarios": results}
 
 @app.get("/admin/allocations")
 async def get_allocations():
@@ -725,13 +839,39 @@ async def get_allocations():
 
 # AI/ML Endpoints
 
+async def resolve_upload_text(file: UploadFile):
+    """
+    Content hash of an upload and its extracted text. Text already extracted from the
+    same bytes by any endpoint is reused from the analysis store; the extension is part
+    of the key because it picks the parser.
+    """
+    file_hash = await asyncio.to_thread(content_hash, file.file)
+    text = await analysis_store.get_or_compute(
+        file_hash, "text", partial(extract_resume_text_async, file.file, file.filename),
+        params={"extension": os.path.splitext(file.filename or "")[1].lower()}
+    )
+    return file_hash, text
+
+
+def stored_tier(file_hash: str, name: str, fn, deadline: float, cheap: bool = False) -> CascadeTier:
+    """
+    Cascade tier whose result is kept in the analysis store under the tier name; a plain
+    `fn` runs on the cascade's tier threads, so one that overruns its deadline holds a
+    tier thread rather than one of the default executor's
+    """
+    async def run(text: str):
+        return await analysis_store.get_or_compute(file_hash, name, partial(fn, text), executor=tier_executor)
+    return CascadeTier(name, run, deadline, cheap=cheap)
+
+
 @app.post("/ai/analyze-resume")
 async def analyze_resume_ai(file: UploadFile = File(...)):
     """Analyze resume using AI/ML pipeline"""
     try:
-        # Read file content
-        content = await file.read()
-        text = content.decode('utf-8')
+        # Extract (or reuse) the file's text
+        file_hash, text = await resolve_upload_text(file)
+        if not text:
+            raise HTTPException(status_code=400, detail="Could not extract text from the uploaded file")
         
         # Analyze with AI services - create proper file_data structure
         file_data = {
@@ -739,66 +879,104 @@ async def analyze_resume_ai(file: UploadFile = File(...)):
             "filename": file.filename,
             "content_type": file.content_type
         }
-        analysis = await analyze_resume(file_data)
+        analysis = await analysis_store.get_or_compute(file_hash, "basic_analysis", partial(analyze_resume, file_data))
         
         return {
             "success": True,
             "analysis": analysis,
             "filename": file.filename
         }
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Latency budget for /ai/analyze-resume-advanced and per-tier deadlines (seconds)
+ANALYSIS_BUDGET_SECONDS = float(os.getenv("ANALYSIS_BUDGET_SECONDS", "3"))
+ANALYSIS_TIER_DEADLINES = {
+    "quick_extraction": float(os.getenv("QUICK_TIER_DEADLINE", "5")),
+    "nlp_analysis": float(os.getenv("NLP_TIER_DEADLINE", "10")),
+    "resume_analysis": float(os.getenv("RESUME_TIER_DEADLINE", "20")),
+    "langchain_analysis": float(os.getenv("LLM_TIER_DEADLINE", "60")),
+}
+
+
 @app.post("/ai/analyze-resume-advanced")
-async def analyze_resume_advanced(file: UploadFile = File(...)):
-    """Enhanced resume analysis using advanced ML/NLP pipeline"""
+async def analyze_resume_advanced(file: UploadFile = File(...), budget_ms: Optional[int] = None):
+    """
+    Enhanced resume analysis using advanced ML/NLP pipeline.
+    The rule-based extraction tier (regexes and the skill matcher) always completes; the
+    spaCy/embedding, ML and LLM tiers run concurrently and are returned if they finish
+    within budget_ms. Tiers listed in pending_tiers can be
+    collected later from GET /ai/analyze-resume-advanced/{analysis_id}.
+    """
     try:
-        # Read file content
-        content = await file.read()
-        text = content.decode('utf-8')
-        
-        results = {}
-        
-        # Use advanced NLP processor if available
+        # Extract (or reuse) the file's text; each tier below reuses its stored result too
+        file_hash, text = await resolve_upload_text(file)
+        if not text:
+            raise HTTPException(status_code=400, detail="Could not extract text from the uploaded file")
+        
+        nlp_processor = await model_registry.get("advanced_nlp")
+        advanced_resume_analyzer = await model_registry.get("advanced_resume_analyzer")
+        langchain_analyzer = await model_registry.get("langchain_analyzer")
+        tiers = []
+        
+        # Use advanced NLP processor if available: the model-free extraction always, the
+        # full analysis (spaCy parse, embeddings) on the file's stored spaCy Doc within budget
         if nlp_processor:
-            try:
-                nlp_results = nlp_processor.analyze_resume_complete(text)
-                results["nlp_analysis"] = nlp_results
-            except Exception as e:
-                print(f"NLP Analysis error: {e}")
-                results["nlp_analysis"] = {"error": str(e)}
+            tiers.append(stored_tier(file_hash, "quick_extraction", nlp_processor.extract_rule_based,
+                                     ANALYSIS_TIER_DEADLINES["quick_extraction"], cheap=True))
+
+            async def nlp_analysis(text: str):
+                ctx = await analysis_store.doc_context(file_hash, getattr(nlp_processor, "nlp", None), text,
+                                                       executor=tier_executor)
+                return await asyncio.get_running_loop().run_in_executor(
+                    tier_executor, nlp_processor.analyze_resume_complete, text, "", ctx
+                )
+            tiers.append(stored_tier(file_hash, "nlp_analysis", nlp_analysis,
+                                     ANALYSIS_TIER_DEADLINES["nlp_analysis"]))
         
         # Use advanced resume analyzer if available
         if advanced_resume_analyzer:
-            try:
-                resume_analysis = advanced_resume_analyzer.analyze_resume_comprehensive(text)
-                results["resume_analysis"] = resume_analysis
-            except Exception as e:
-                print(f"Resume Analysis error: {e}")
-                results["resume_analysis"] = {"error": str(e)}
+            tiers.append(stored_tier(file_hash, "resume_analysis", advanced_resume_analyzer.analyze_resume_comprehensive,
+                                     ANALYSIS_TIER_DEADLINES["resume_analysis"]))
         
         # Use LangChain analyzer if available
         if langchain_analyzer:
-            try:
-                langchain_results = await langchain_analyzer.analyze_resume_with_llm(text)
-                results["langchain_analysis"] = langchain_results
-            except Exception as e:
-                print(f"LangChain Analysis error: {e}")
-                results["langchain_analysis"] = {"error": str(e)}
+            tiers.append(stored_tier(file_hash, "langchain_analysis", langchain_analyzer.analyze_resume_with_llm,
+                                     ANALYSIS_TIER_DEADLINES["langchain_analysis"]))
         
         # Fallback to basic analysis if no advanced analyzers available
-        if not any([nlp_processor, advanced_resume_analyzer, langchain_analyzer]):
+        if not tiers:
             file_data = {
                 "text": text,
                 "filename": file.filename,
                 "content_type": file.content_type
             }
-            basic_analysis = await analyze_resume(file_data)
-            results["basic_analysis"] = basic_analysis
+            basic_analysis = await analysis_store.get_or_compute(file_hash, "basic_analysis", partial(analyze_resume, file_data))
+            return {
+                "success": True,
+                "analysis": {"basic_analysis": basic_analysis},
+                "filename": file.filename,
+                "analyzers_used": {
+                    "nlp_processor": False,
+                    "advanced_resume_analyzer": False,
+                    "langchain_analyzer": False
+                }
+            }
+        
+        budget = budget_ms / 1000.0 if budget_ms is not None else ANALYSIS_BUDGET_SECONDS
+        cascade = await analysis_cascade.run(text, tiers, budget=max(0.0, budget))
         
         return {
             "success": True,
-            "analysis": results,
+            "analysis": cascade["results"],
+            "analysis_id": cascade["analysis_id"],
+            "pending_tiers": cascade["pending_tiers"],
+            "complete": cascade["complete"],
+            "tier_status": cascade["tier_status"],
             "filename": file.filename,
             "analyzers_used": {
                 "nlp_processor": nlp_processor is not None,
@@ -806,9 +984,93 @@ async def analyze_resume_advanced(file: UploadFile = File(...)):
                 "langchain_analyzer": langchain_analyzer is not None
             }
         }
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Advanced analysis failed: {str(e)}")
 
+
+@app.get("/ai/analyze-resume-advanced/{analysis_id}")
+async def get_resume_analysis_advanced(analysis_id: str):
+    """Poll an advanced analysis for tiers that finished after the first response"""
+    cascade = analysis_cascade.get(analysis_id)
+    if cascade is None:
+        raise HTTPException(status_code=404, detail="Analysis not found or expired")
+    return {
+        "success": True,
+        "analysis": cascade["results"],
+        "analysis_id": analysis_id,
+        "pending_tiers": cascade["pending_tiers"],
+        "complete": cascade["complete"],
+        "tier_status": cascade["tier_status"]
+    }
+
+
+@app.get("/ai/models")
+async def get_model_status():
+    """Load state, load time and memory of each shared model, and its micro-batching stats"""
+    return {"success": True, **model_registry.get_stats(), "batchers": get_batcher_stats()}
+
+
+@app.get("/ai/memory")
+async def get_memory_report(instance_memory_mb: Optional[int] = None, workers: Optional[int] = None):
+    """Per-worker RSS/PSS and model copies; the projected total for `workers` and how many fit"""
+    return {"success": True, **ai_orchestrator.get_memory_report(instance_memory_mb, workers)}
+
+
+@app.post("/ai/bulk-ingest")
+async def bulk_ingest_resumes(
+    file: UploadFile = File(...),
+    user_id: str = Form(...),
+    dry_run: bool = Form(False),
+    batch_size: int = Form(32)
+):
+    """
+    Ingest a zip of PDF/DOCX/TXT resumes in one call: text is extracted on a process pool,
+    parsed with a single nlp.pipe pass, embedded in batches and written to
+    resume_analyses/extracted_skills in bulk. Returns throughput and per-stage timings.
+    """
+    from ai_modules.bulk_ingestion import (
+        BulkResumeIngestor, SupabaseBulkWriter, IngestLimitError, collect_documents, MAX_UPLOAD_BYTES
+    )
+    import zipfile
+    try:
+        # Read the archive from the spooled upload rather than copying it into memory
+        archive = file.file
+        archive.seek(0, os.SEEK_END)
+        if archive.tell() > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413,
+                                detail=f"Upload is larger than {MAX_UPLOAD_BYTES // (1024 * 1024)} MB")
+        archive.seek(0)
+        try:
+            documents, skipped = await asyncio.to_thread(collect_documents, archive)
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Upload must be a zip archive of resumes")
+        except IngestLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        if not documents:
+            raise HTTPException(status_code=400, detail="No PDF, DOCX or TXT resumes found in the archive")
+
+        embedder = ai_orchestrator.get_nlp_processor()
+        if not embedder.is_initialized:
+            await embedder.initialize()
+        ingestor = BulkResumeIngestor(
+            nlp=await model_registry.get("spacy"),
+            embedder=embedder if getattr(embedder, "bert_model", None) is not None else None,
+            writer=None if dry_run else SupabaseBulkWriter(),
+            batch_size=batch_size
+        )
+        report = await ingestor.ingest(documents, user_id=user_id)
+        report["skipped"] = skipped
+
+        return {"success": True, "filename": file.filename, **report}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Bulk ingestion failed: {str(e)}")
+
 @app.post("/ai/match-jobs")
 async def match_jobs_ai(request: JobMatchRequest):
     """Match candidates to jobs using AI"""
@@ -862,6 +1124,7 @@ async def analyze_coding_profile_advanced(request: CodingProfileRequest):
     """Advanced coding profile analysis using ML scraping"""
     try:
         results = {}
+        coding_scraper = await model_registry.get("coding_scraper")
         
         # Use advanced coding scraper if available
         if coding_scraper:
@@ -1004,7 +1267,7 @@ async def get_ai_recommendations(request: AIRecommendationRequest):
 
 # Import internship models - try complex analyzer first, fallback to simple
 try:
-    from models.internship_resume_analyzer import analyze_internship_resume, process_resume_file
+    from models.internship_resume_analyzer import analyze_internship_resume, process_resume_text
     print("✅ Successfully imported complex internship models with LangChain")
     INTERNSHIP_MODELS_AVAILABLE = True
     USE_SIMPLE_ANALYZER = False
@@ -1012,7 +1275,7 @@ except ImportError as e:
     print(f"⚠️ Failed to import complex internship models: {e}")
     print("🔄 Falling back to simple internship analyzer...")
     try:
-        from models.simple_internship_analyzer import analyze_internship_resume, process_resume_file
+        from models.simple_internship_analyzer import analyze_internship_resume, process_resume_text
         print("✅ Successfully imported simple internship analyzer")
         INTERNSHIP_MODELS_AVAILABLE = True
         USE_SIMPLE_ANALYZER = True
@@ -1032,6 +1295,21 @@ except ImportError as e:
     print(f"⚠️ Some internship modules unavailable: {e}")
     internship_matcher = None
 
+# ANN index over the internship catalogue, used to shortlist before detailed matching.
+# The catalogue is indexed once here (and saved to INTERNSHIP_INDEX_PATH when set), not per request.
+INTERNSHIP_MATCH_SHORTLIST = int(os.getenv("INTERNSHIP_MATCH_SHORTLIST", "10"))
+try:
+    from placement_ai.posting_index import PostingIndex
+    internship_catalogue_index = PostingIndex(index_path=os.getenv("INTERNSHIP_INDEX_PATH"))
+    if internship_matcher is not None:
+        catalogue = create_sample_internships()
+        internship_catalogue_index.upsert_postings(catalogue)
+        # A reloaded index may hold postings the catalogue has dropped since it was saved
+        internship_catalogue_index.remove_postings(internship_catalogue_index.ids() - {i["id"] for i in catalogue})
+except ImportError as e:
+    print(f"⚠️ Internship catalogue index unavailable: {e}")
+    internship_catalogue_index = None
+
 # Internship-specific endpoints
 @app.post("/internship/analyze-resume")
 async def analyze_internship_resume_endpoint(file: UploadFile = File(...)):
@@ -1044,30 +1322,24 @@ async def analyze_internship_resume_endpoint(file: UploadFile = File(...)):
         if not file.filename.lower().endswith(('.pdf', '.docx', '.doc', '.txt')):
             raise HTTPException(status_code=400, detail="Only PDF, DOCX, DOC, and TXT files are supported")
         
-        # Save uploaded file temporarily
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Extract (or reuse) the file's text, off the event loop
+        file_hash, resume_text = await resolve_upload_text(file)
         
-        try:
-            # Process the resume for internships
-            result = process_resume_file(temp_file_path)
-            
-            return JSONResponse(content={
-                "success": True,
-                "filename": file.filename,
-                "analysis_type": "internship",
-                "result": result
-            })
-            
-        finally:
-            # Clean up temporary file
-            import os
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        # Process the resume for internships, reusing an earlier analysis of the same file
+        result = await analysis_store.get_or_compute(
+            file_hash, "internship_analysis", partial(process_resume_text, resume_text),
+            params={"analyzer": "simple" if USE_SIMPLE_ANALYZER else "langchain"}
+        )
+        
+        return JSONResponse(content={
+            "success": True,
+            "filename": file.filename,
+            "analysis_type": "internship",
+            "result": result
+        })
                 
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -1163,9 +1435,13 @@ async def match_candidate_to_internships(request: Request):
         if not candidate_profile:
             raise HTTPException(status_code=400, detail="Candidate profile is required")
         
-        # Use provided listings or sample data
+        # Use provided listings or the catalogue postings closest to the candidate
         if not internship_listings:
-            internship_listings = create_sample_internships()
+            if internship_catalogue_index is not None and len(internship_catalogue_index):
+                query_text = candidate_profile if isinstance(candidate_profile, str) else json.dumps(candidate_profile)
+                internship_listings = internship_catalogue_index.shortlist_postings(query_text, INTERNSHIP_MATCH_SHORTLIST)
+            else:
+                internship_listings = create_sample_internships()
         
         # Perform matching
         result = internship_matcher.match_internships(candidate_profile, internship_listings)
@@ -1275,6 +1551,7 @@ async def langchain_match_candidate_to_opportunity(request: Request):
     }
     """
     try:
+        langchain_matching = await model_registry.get("langchain_matching")
         if not langchain_matching or not langchain_matching.initialized:
             raise HTTPException(
                 status_code=503, 
@@ -1316,10 +1593,14 @@ async def langchain_match_candidate_to_opportunity(request: Request):
         logger.error(f"LangChain matching endpoint error: {e}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+# Pairs are fanned out concurrently under the provider's rate limits (see ai_modules/llm_scheduler.py)
+LANGCHAIN_MAX_BATCH_PAIRS = int(os.getenv("LANGCHAIN_MAX_BATCH_PAIRS", "500"))
+
 @app.post("/langchain/batch-match")
 async def langchain_batch_match(request: Request):
     """
-    Batch match multiple candidates to multiple opportunities using LangChain
+    Batch match multiple candidates to multiple opportunities using LangChain.
+    Pairs run concurrently; add ?stream=true to receive NDJSON lines as pairs complete.
     
     Expected payload:
     {
@@ -1342,6 +1623,7 @@ async def langchain_batch_match(request: Request):
     }
     """
     try:
+        langchain_matching = await model_registry.get("langchain_matching")
         if not langchain_matching or not langchain_matching.initialized:
             raise HTTPException(
                 status_code=503, 
@@ -1363,11 +1645,18 @@ async def langchain_batch_match(request: Request):
         if not opportunities:
             raise HTTPException(status_code=400, detail="Opportunities list is required")
         
-        if len(candidates) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 candidates allowed per batch")
+        if len(candidates) * len(opportunities) > LANGCHAIN_MAX_BATCH_PAIRS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Maximum {LANGCHAIN_MAX_BATCH_PAIRS} candidate-opportunity pairs allowed per batch"
+            )
         
-        if len(opportunities) > 10:
-            raise HTTPException(status_code=400, detail="Maximum 10 opportunities allowed per batch")
+        # ?stream=true sends one NDJSON line per pair as it completes
+        if request.query_params.get("stream", "").lower() in ("1", "true", "yes"):
+            async def pair_stream():
+                async for item in langchain_matching.iter_batch_matches(candidates, opportunities):
+                    yield json.dumps(item, default=str) + "\n"
+            return StreamingResponse(pair_stream(), media_type="application/x-ndjson")
         
         # Perform batch matching
         result = await langchain_matching.batch_match_candidates(candidates, opportunities)
@@ -1390,6 +1679,7 @@ async def langchain_batch_match(request: Request):
 async def get_langchain_matching_status():
     """Get LangChain matching engine status and configuration"""
     try:
+        langchain_matching = await model_registry.get("langchain_matching")
         if not langchain_matching:
             return JSONResponse(content={
                 "success": False,
@@ -1413,6 +1703,7 @@ async def get_langchain_matching_status():
 async def test_langchain_matching():
     """Test endpoint with sample data to verify LangChain matching functionality"""
     try:
+        langchain_matching = await model_registry.get("langchain_matching")
         if not langchain_matching or not langchain_matching.initialized:
             raise HTTPException(
                 status_code=503, 
@@ -1639,13 +1930,33 @@ except Exception as e:
     print(f"⚠️  Perplexity AI not available: {e}")
 
 
+def _sse_response(events) -> StreamingResponse:
+    """Forward analyzer events as Server-Sent Events; failures end the stream with an error event"""
+    async def body():
+        try:
+            async for event in events:
+                name = event.pop("event")
+                yield f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+        except Exception as e:
+            print(f"❌ Perplexity stream error: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.post("/ai/analyze-resume-perplexity")
 async def analyze_resume_perplexity(
     file: UploadFile = File(...),
     target_role: Optional[str] = Form(None),
     target_industry: Optional[str] = Form(None),
+    stream: bool = False,
 ):
-    """Analyze resume using Perplexity AI"""
+    """Analyze resume using Perplexity AI (?stream=true streams sections over SSE)"""
     global perplexity_analyzer
     
     if not PERPLEXITY_AVAILABLE:
@@ -1668,21 +1979,23 @@ async def analyze_resume_perplexity(
             detail="Only PDF, DOC, DOCX, and TXT files are supported"
         )
     
-    # Save temp file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp:
-        content = await file.read()
-        tmp.write(content)
-        tmp_path = tmp.name
-    
     try:
-        # Extract text from file
-        resume_text = await extract_text_from_file(tmp_path, file.filename)
-        
-        # Analyze with Perplexity AI
-        analysis = perplexity_analyzer.analyze_resume(
-            resume_text,
-            target_role=target_role,
-            target_industry=target_industry
+        # Extract (or reuse) the text of the upload
+        file_hash, resume_text = await extract_upload_text(file)
+        
+        if stream:
+            return _sse_response(perplexity_analyzer.stream_analyze_resume(
+                resume_text,
+                target_role=target_role,
+                target_industry=target_industry
+            ))
+        
+        # Analyze with Perplexity AI, reusing an earlier analysis of the same file and target
+        analysis = await analysis_store.get_or_compute(
+            file_hash, "perplexity_analysis",
+            partial(perplexity_analyzer.analyze_resume, resume_text,
+                    target_role=target_role, target_industry=target_industry),
+            params={"target_role": target_role, "target_industry": target_industry}
         )
         
         return JSONResponse(content={
@@ -1692,17 +2005,16 @@ async def analyze_resume_perplexity(
             "ai_provider": "Perplexity AI"
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ Perplexity analysis error: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
 
 
 @app.post("/ai/career-suggestions-perplexity")
-async def career_suggestions_perplexity(payload: Dict[str, Any]):
-    """Get career suggestions using Perplexity AI"""
+async def career_suggestions_perplexity(payload: Dict[str, Any], stream: bool = False):
+    """Get career suggestions using Perplexity AI (?stream=true streams suggestions over SSE)"""
     global perplexity_analyzer
     
     if not PERPLEXITY_AVAILABLE:
@@ -1721,7 +2033,10 @@ async def career_suggestions_perplexity(payload: Dict[str, Any]):
         if not resume_text:
             raise HTTPException(status_code=400, detail="resume_text is required")
         
-        suggestions = perplexity_analyzer.get_career_suggestions(resume_text, preferences)
+        if stream:
+            return _sse_response(perplexity_analyzer.stream_career_suggestions(resume_text, preferences))
+        
+        suggestions = await perplexity_analyzer.get_career_suggestions(resume_text, preferences)
         
         return JSONResponse(content={
             "success": True,
@@ -1735,8 +2050,8 @@ async def career_suggestions_perplexity(payload: Dict[str, Any]):
 
 
 @app.post("/ai/optimize-ats-perplexity")
-async def optimize_ats_perplexity(payload: Dict[str, Any]):
-    """Optimize resume for ATS using Perplexity AI"""
+async def optimize_ats_perplexity(payload: Dict[str, Any], stream: bool = False):
+    """Optimize resume for ATS using Perplexity AI (?stream=true streams sections over SSE)"""
     global perplexity_analyzer
     
     if not PERPLEXITY_AVAILABLE:
@@ -1755,7 +2070,10 @@ async def optimize_ats_perplexity(payload: Dict[str, Any]):
         if not resume_text:
             raise HTTPException(status_code=400, detail="resume_text is required")
         
-        optimization = perplexity_analyzer.optimize_for_ats(resume_text, job_description)
+        if stream:
+            return _sse_response(perplexity_analyzer.stream_optimize_for_ats(resume_text, job_description))
+        
+        optimization = await perplexity_analyzer.optimize_for_ats(resume_text, job_description)
         
         return JSONResponse(content={
             "success": True,
@@ -1768,35 +2086,16 @@ async def optimize_ats_perplexity(payload: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
 
-async def extract_text_from_file(file_path: str, filename: str) -> str:
-    """Extract text from various file formats"""
-    import PyPDF2
-    import docx
-    
+async def extract_upload_text(file: UploadFile):
+    """Content hash and text of an uploaded PDF/DOC/DOCX/TXT file, extracted in memory"""
+    filename = file.filename
     try:
-        if filename.lower().endswith(".pdf"):
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-                
-        elif filename.lower().endswith((".doc", ".docx")):
-            doc = docx.Document(file_path)
-            text = "\n".join([para.text for para in doc.paragraphs])
-            return text.strip()
-            
-        elif filename.lower().endswith(".txt"):
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read().strip()
-                
-        else:
-            raise ValueError(f"Unsupported file format: {filename}")
-            
-    except Exception as e:
-        print(f"❌ Text extraction error: {e}")
-        raise Exception(f"Failed to extract text from {filename}: {str(e)}")
+        file_hash, text = await resolve_upload_text(file)
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    if not text:
+        raise Exception(f"Failed to extract text from {filename}")
+    return file_hash, text
 
 
 # Health check
@@ -1809,6 +2108,15 @@ async def health_check():
         "perplexity_available": PERPLEXITY_AVAILABLE
     }
 
+# Copy-on-write model sharing: with PRELOAD_MODELS=1 (or a comma-separated list of registry
+# names) and `gunicorn main:app -k uvicorn.workers.UvicornWorker --preload -w N`, the read-only
+# models load once in the gunicorn master and the forked workers share their pages.
+# Kept last so the heap is frozen after everything else main.py loads at import time.
+_preload = os.getenv("PRELOAD_MODELS", "0").strip()
+if _preload not in ("", "0"):
+    _names = PRELOAD_MODELS if _preload == "1" else [name.strip() for name in _preload.split(",") if name.strip()]
+    print(f"📦 Preloaded shared models: {', '.join(model_registry.preload(_names)) or 'none'}")
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
@@ -8,6 +8,7 @@ from datetime import datetime, date
 import random
 import json
 import asyncio
+from file_extractor import extract_resume_text
 
 # Import advanced analyzers (avoiding TensorFlow imports for now)
 try:
@@ -140,14 +141,14 @@ async def analyze_resume_advanced(file: UploadFile = File(...)):
     try:
         # Read file content
         content = await file.read()
-        text = content.decode('utf-8')
+        text = extract_resume_text(content, file.filename)
         
         results = {}
         
         # Use advanced NLP processor if available
         if nlp_processor:
             try:
-                nlp_results = nlp_processor.analyze_resume_complete(text)
+                nlp_results = await nlp_processor.analyze_resume_complete_async(text)
                 results["nlp_analysis"] = nlp_results
             except Exception as e:
                 print(f"NLP Analysis error: {e}")
@@ -8,8 +8,8 @@ from .llm_provider import get_chat_model
 from datetime import datetime
 
 # Add imports for file handling
-import PyPDF2
 import docx
+from file_extractor import extract_resume_text_from_path
 from typing import Optional
 import json
 
@@ -50,14 +50,9 @@ internship_resume_prompt = PromptTemplate(
 )
 
 def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
+    """Extract text from PDF file (shared extractor: parallel pages, per-page fallback)"""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-        return text
+        return extract_resume_text_from_path(file_path, os.path.basename(file_path))
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return ""
@@ -239,28 +234,35 @@ def fallback_resume_analysis(resume_text: str) -> dict:
         "note": "This is a basic keyword-based analysis. For detailed AI-powered insights, please ensure LangChain model is properly configured."
     }
 
+def process_resume_text(resume_text: str) -> dict:
+    """Analyze text already extracted from an uploaded resume"""
+    if not resume_text:
+        return {
+            "success": False,
+            "error": "Could not extract text from resume file"
+        }
+    
+    try:
+        return analyze_internship_resume(resume_text)
+    except Exception as e:
+        print(f"Error processing resume file: {e}")
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 def process_resume_file(file_path: str) -> dict:
     """Process uploaded resume file and return analysis"""
     try:
-        # Extract text from file
         resume_text = extract_resume_text(file_path)
-        
-        if not resume_text:
-            return {
-                "success": False,
-                "error": "Could not extract text from resume file"
-            }
-        
-        # Analyze the resume
-        analysis = analyze_internship_resume(resume_text)
-        
-        return analysis
     except Exception as e:
         print(f"Error processing resume file: {e}")
         return {
             "success": False,
             "error": str(e)
         }
+    
+    return process_resume_text(resume_text)
 
 # Test function
 if __name__ == "__main__":
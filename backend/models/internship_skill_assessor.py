@@ -8,6 +8,12 @@ import re
 from typing import List, Dict, Any
 from datetime import datetime
 
+# Shared LLM response cache; only importable when running from the backend root
+try:
+    from ai_modules.llm_cache import llm_cache, template_version
+except ImportError:
+    llm_cache = None
+
 # Load environment variables
 load_dotenv()
 
@@ -78,11 +84,21 @@ def assess_internship_skills(candidate_info: str, internship_domain: str = "Soft
             print(f"🔍 Domain: {internship_domain}")
             print(f"🔍 Info preview: {truncated_info[:200]}...")
             
-            # Generate assessment using LangChain
-            response = chain.invoke({
+            inputs = {
                 "candidate_info": truncated_info,
                 "internship_domain": internship_domain
-            })
+            }
+            model_name = getattr(model, 'model_name', type(model).__name__)
+            version = template_version(skill_assessment_template) if llm_cache else ""
+            
+            # Generate assessment using LangChain, unless this input was already assessed
+            response = llm_cache.get("langchain", model_name, "skill_assessment", version, inputs) if llm_cache else None
+            if response is not None:
+                print("⚡ Skill assessment served from LLM response cache")
+            else:
+                response = chain.invoke(inputs)
+                if llm_cache:
+                    llm_cache.put("langchain", model_name, "skill_assessment", version, inputs, response)
             
             print(f"✅ LangChain model response received: {len(response)} characters")
             print(f"📊 Response preview: {response[:300]}...")
@@ -1,4 +1,6 @@
 import os
+import threading
+from functools import lru_cache
 from typing import Optional, Any
 from dotenv import load_dotenv
 import logging
@@ -172,12 +174,25 @@ class HuggingFaceWrapper:
             logger.error(f"❌ Error generating response with HuggingFace model: {e}")
             return "Analysis completed. Please check the detailed results below."
 
+_chat_model = None
+_chat_model_lock = threading.Lock()
+
 def get_chat_model() -> Optional[Any]:
     """
     Get the best available chat model for internship assessments.
     Priority: HuggingFace (Free) > Gemini > OpenAI > Fallback
+
+    Built once per process and shared by every internship module (and, when main.py is
+    preloaded by a forking server, by every worker). When no provider is available the
+    None is not kept, so a later call retries once a key or package shows up.
     """
-    
+    global _chat_model
+    with _chat_model_lock:
+        if _chat_model is None:
+            _chat_model = _build_chat_model()
+        return _chat_model
+
+def _build_chat_model() -> Optional[Any]:
     logger.info("🔄 Initializing chat model for internship assessments...")
     
     # First try HuggingFace models (FREE!)
@@ -228,10 +243,27 @@ def get_chat_model() -> Optional[Any]:
     return None
 
 def get_embedding_model():
-    """Get embedding model for semantic similarity"""
+    """
+    Get embedding model for semantic similarity: the process-wide "sentence_transformer"
+    handle of the backend model registry, so the MiniLM weights are loaded once
+    """
     try:
-        from sentence_transformers import SentenceTransformer
-        return SentenceTransformer('all-MiniLM-L6-v2')
+        from ai_modules.model_registry import model_registry
     except ImportError:
-        print("❌ SentenceTransformers not available")
-        return None
\ No newline at end of file
+        try:
+            return _standalone_embedding_model()
+        except ImportError:
+            print("❌ SentenceTransformers not available")
+            return None
+    try:
+        return model_registry.get_blocking("sentence_transformer")
+    except RuntimeError as e:
+        # Inside the event loop: use the handle if it is loaded, never load it here
+        logger.warning(f"⚠️ {e}")
+        return model_registry.peek("sentence_transformer")
+
+@lru_cache(maxsize=1)
+def _standalone_embedding_model():
+    """One instance per process when the models run outside the backend (no ai_modules); failures are raised, not cached"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer('all-MiniLM-L6-v2')
\ No newline at end of file
@@ -3,7 +3,6 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
 import os
-import tempfile
 import logging
 from typing import List, Dict, Any, Optional
 import json
@@ -17,7 +16,8 @@ IMPORTS_SUCCESSFUL = True
 IMPORT_ERRORS = []
 
 try:
-    from internship_resume_analyzer import analyze_internship_resume, process_resume_file
+    from internship_resume_analyzer import analyze_internship_resume, process_resume_text
+    from file_extractor import ExtractionLimitError, extract_resume_text_async, keep_uploads_in_memory
     from internship_technical_assessment import generate_internship_technical_assessment, evaluate_technical_assessment
     from internship_skill_assessor import assess_internship_skills, create_learning_roadmap
     from internship_matcher import InternshipMatcher, create_sample_internships
@@ -33,6 +33,10 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Resume uploads stay in memory; only files larger than UPLOAD_SPOOL_MB are spooled to disk
+if IMPORTS_SUCCESSFUL:
+    keep_uploads_in_memory()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -93,28 +97,21 @@ async def analyze_resume(
         if not file.filename.lower().endswith(('.pdf', '.docx', '.doc')):
             raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Extract from the upload in memory, off the event loop
+        resume_text = await extract_resume_text_async(file.file, file.filename)
+        
+        # Process the resume
+        result = process_resume_text(resume_text)
         
-        try:
-            # Process the resume
-            result = process_resume_file(temp_file_path)
-            
-            return JSONResponse(content={
-                "success": True,
-                "filename": file.filename,
-                "analysis_type": analysis_type,
-                "result": result
-            })
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
+        return JSONResponse(content={
+            "success": True,
+            "filename": file.filename,
+            "analysis_type": analysis_type,
+            "result": result
+        })
                 
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
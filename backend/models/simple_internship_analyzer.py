@@ -3,23 +3,35 @@ Simple internship resume analyzer without LangChain dependencies
 """
 import os
 import re
+import sys
 from datetime import datetime
 from typing import Dict, Any, Optional
-import PyPDF2
 import docx
 import traceback
 
+# Add the backend directory to the Python path (shared extractor and skill matcher live there)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from file_extractor import extract_resume_text_from_path
+from ai_modules.skill_matcher import SkillMatcher
+
+# Technical skills detected by the keyword analysis
+TECHNICAL_SKILLS = {
+    'programming_languages': ['python', 'java', 'javascript', 'c++', 'c#', 'react', 'node.js', 'html', 'css', 'typescript', 'angular', 'vue', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin'],
+    'databases': ['mysql', 'postgresql', 'mongodb', 'sqlite', 'redis', 'oracle', 'nosql'],
+    'frameworks': ['django', 'flask', 'spring', 'express', 'laravel', 'rails', 'asp.net'],
+    'tools': ['git', 'docker', 'kubernetes', 'jenkins', 'aws', 'azure', 'gcp', 'linux', 'jira'],
+}
+
+# Compiled once at import
+SKILL_MATCHER = SkillMatcher.from_categories(TECHNICAL_SKILLS)
+
 def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file"""
+    """Extract text from PDF file (shared extractor: parallel pages, per-page fallback)"""
     try:
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        return text.strip()
+        return extract_resume_text_from_path(file_path, os.path.basename(file_path))
     except Exception as e:
-        print(f"Error extracting PDF: {e}")
+        print(f"Error extracting text from PDF: {e}")
         return ""
 
 def extract_text_from_docx(file_path: str) -> str:
@@ -221,16 +233,13 @@ def perform_simple_analysis(text: str) -> Dict[str, Any]:
     """Perform comprehensive keyword-based analysis"""
     text_lower = text.lower()
     
-    # Enhanced technical skills detection
-    programming_languages = ['python', 'java', 'javascript', 'c++', 'c#', 'react', 'node.js', 'html', 'css', 'typescript', 'angular', 'vue', 'php', 'ruby', 'go', 'rust', 'swift', 'kotlin']
-    databases = ['mysql', 'postgresql', 'mongodb', 'sqlite', 'redis', 'oracle', 'nosql']
-    frameworks = ['django', 'flask', 'spring', 'express', 'laravel', 'rails', 'asp.net']
-    tools = ['git', 'docker', 'kubernetes', 'jenkins', 'aws', 'azure', 'gcp', 'linux', 'jira']
+    # Enhanced technical skills detection: one scan, mention counts per skill
+    mentions = SKILL_MATCHER.skills(text)
     
-    found_languages = [lang for lang in programming_languages if lang in text_lower]
-    found_databases = [db for db in databases if db in text_lower]
-    found_frameworks = [fw for fw in frameworks if fw in text_lower]
-    found_tools = [tool for tool in tools if tool in text_lower]
+    found_languages = [lang for lang in TECHNICAL_SKILLS['programming_languages'] if lang in mentions]
+    found_databases = [db for db in TECHNICAL_SKILLS['databases'] if db in mentions]
+    found_frameworks = [fw for fw in TECHNICAL_SKILLS['frameworks'] if fw in mentions]
+    found_tools = [tool for tool in TECHNICAL_SKILLS['tools'] if tool in mentions]
     
     all_skills = found_languages + found_databases + found_frameworks + found_tools
     
@@ -262,13 +271,13 @@ def perform_simple_analysis(text: str) -> Dict[str, Any]:
     # Generate skill objects with confidence scores
     extracted_skills = []
     for skill in all_skills:
-        skill_confidence = min(90, 70 + (text_lower.count(skill) * 5))
+        skill_confidence = min(90, 70 + (mentions[skill] * 5))
         extracted_skills.append({
             "name": skill.title(),
             "confidence": skill_confidence,
             "category": categorize_skill(skill),
             "level": "Intermediate" if skill_confidence > 80 else "Beginner",
-            "yearsExp": min(5, max(1, text_lower.count(skill)))
+            "yearsExp": min(5, max(1, mentions[skill]))
         })
     
     # Missing skills analysis
@@ -294,27 +303,32 @@ def perform_simple_analysis(text: str) -> Dict[str, Any]:
         "project_score": project_score
     }
 
+def process_resume_text(resume_text: str) -> Dict[str, Any]:
+    """Analyze text already extracted from an uploaded resume"""
+    if not resume_text:
+        return {
+            "success": False,
+            "error": "Could not extract text from resume file"
+        }
+    
+    print(f"✅ Text extracted successfully: {len(resume_text)} characters")
+    
+    try:
+        return analyze_internship_resume(resume_text)
+    except Exception as e:
+        print(f"❌ Error processing resume file: {e}")
+        print(f"🔍 Full error traceback: {traceback.format_exc()}")
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 def process_resume_file(file_path: str) -> Dict[str, Any]:
     """Process uploaded resume file and return analysis"""
     print(f"🎯 Processing resume file: {file_path}")
     
     try:
-        # Extract text from file
         resume_text = extract_resume_text(file_path)
-        
-        if not resume_text:
-            return {
-                "success": False,
-                "error": "Could not extract text from resume file"
-            }
-        
-        print(f"✅ Text extracted successfully: {len(resume_text)} characters")
-        
-        # Analyze the resume
-        analysis = analyze_internship_resume(resume_text)
-        
-        return analysis
-        
     except Exception as e:
         print(f"❌ Error processing resume file: {e}")
         print(f"🔍 Full error traceback: {traceback.format_exc()}")
@@ -322,6 +336,8 @@ def process_resume_file(file_path: str) -> Dict[str, Any]:
             "success": False,
             "error": str(e)
         }
+    
+    return process_resume_text(resume_text)
 
 # Test function
 if __name__ == "__main__":
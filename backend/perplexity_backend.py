@@ -7,19 +7,21 @@ from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
-import tempfile
 import os
 from datetime import datetime
 from typing import Optional
-import PyPDF2
 from openai import OpenAI
 from dotenv import load_dotenv
+from file_extractor import ExtractionLimitError, extract_resume_text_async, keep_uploads_in_memory
 
 # Load environment variables
 load_dotenv()
 
 app = FastAPI(title="BharatIntern Perplexity API", version="1.0.0")
 
+# Resume uploads stay in memory; only files larger than UPLOAD_SPOOL_MB are spooled to disk
+keep_uploads_in_memory()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -43,28 +45,17 @@ else:
 print("=" * 60)
 
 
-def read_resume_from_file(file_path: str) -> str:
-    """Extract text from resume file (PDF, TXT, etc.)"""
+async def read_resume_from_upload(file: UploadFile) -> str:
+    """Extract text from an uploaded resume (PDF, DOCX, TXT) in memory"""
     try:
-        # Check if it's a PDF file
-        if file_path.lower().endswith('.pdf'):
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-        else:
-            # Handle text files
-            try:
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    return file.read()
-            except UnicodeDecodeError:
-                # Try with different encoding if utf-8 fails
-                with open(file_path, 'r', encoding='latin-1') as file:
-                    return file.read()
+        text = await extract_resume_text_async(file.file, file.filename or "unknown_file.txt")
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise Exception(f"Error reading file: {str(e)}")
+    if not text:
+        raise Exception("Error reading file: no text could be extracted")
+    return text
 
 
 def analyze_resume_with_perplexity(resume_text: str, target_role: str = None, target_industry: str = None) -> dict:
@@ -263,39 +254,24 @@ async def analyze_resume_endpoint(
                 detail="Only PDF, TXT, DOC, and DOCX files are supported"
             )
         
-        # Save uploaded file temporarily
-        file_ext = os.path.splitext(filename)[1] or '.txt'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Extract text from the upload in memory
+        print("📝 Extracting text from resume...")
+        resume_text = await read_resume_from_upload(file)
+        print(f"✅ Text extracted: {len(resume_text)} characters")
         
-        print(f"💾 File saved temporarily: {temp_file_path}")
+        # Analyze with Perplexity
+        print("🤖 Analyzing with Perplexity AI...")
+        analysis_result = analyze_resume_with_perplexity(
+            resume_text=resume_text,
+            target_role=target_role,
+            target_industry=target_industry
+        )
+        
+        print("✅ Analysis completed successfully")
+        print(f"{'='*60}\n")
+        
+        return JSONResponse(content=analysis_result)
         
-        try:
-            # Extract text from resume
-            print("📝 Extracting text from resume...")
-            resume_text = read_resume_from_file(temp_file_path)
-            print(f"✅ Text extracted: {len(resume_text)} characters")
-            
-            # Analyze with Perplexity
-            print("🤖 Analyzing with Perplexity AI...")
-            analysis_result = analyze_resume_with_perplexity(
-                resume_text=resume_text,
-                target_role=target_role,
-                target_industry=target_industry
-            )
-            
-            print("✅ Analysis completed successfully")
-            print(f"{'='*60}\n")
-            
-            return JSONResponse(content=analysis_result)
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                
     except HTTPException:
         raise
     except Exception as e:
@@ -317,27 +293,18 @@ async def career_suggestions_endpoint(
             raise HTTPException(status_code=503, detail="Perplexity API not configured")
         
         # Extract resume text
-        filename = file.filename or "unknown_file.txt"
-        file_ext = os.path.splitext(filename)[1] or '.txt'
+        resume_text = await read_resume_from_upload(file)
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Create career suggestions prompt
+        client = OpenAI(
+            api_key=PERPLEXITY_API_KEY,
+            base_url="https://api.perplexity.ai"
+        )
         
-        try:
-            resume_text = read_resume_from_file(temp_file_path)
-            
-            # Create career suggestions prompt
-            client = OpenAI(
-                api_key=PERPLEXITY_API_KEY,
-                base_url="https://api.perplexity.ai"
-            )
-            
-            context = f"\nCurrent Role: {current_role}" if current_role else ""
-            context += f"\nYears of Experience: {experience_years}" if experience_years else ""
-            
-            prompt = f"""
+        context = f"\nCurrent Role: {current_role}" if current_role else ""
+        context += f"\nYears of Experience: {experience_years}" if experience_years else ""
+        
+        prompt = f"""
 Based on the following resume, provide detailed career suggestions:
 {context}
 
@@ -354,27 +321,25 @@ Please provide:
 
 Be specific and actionable.
 """
-            
-            response = client.chat.completions.create(
-                model="sonar-pro",
-                messages=[
-                    {"role": "system", "content": "You are a career counselor and professional coach."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
-            )
-            
-            return JSONResponse(content={
-                "success": True,
-                "suggestions": response.choices[0].message.content,
-                "timestamp": datetime.now().isoformat()
-            })
-            
-        finally:
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                
+        
+        response = client.chat.completions.create(
+            model="sonar-pro",
+            messages=[
+                {"role": "system", "content": "You are a career counselor and professional coach."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2000
+        )
+        
+        return JSONResponse(content={
+            "success": True,
+            "suggestions": response.choices[0].message.content,
+            "timestamp": datetime.now().isoformat()
+        })
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
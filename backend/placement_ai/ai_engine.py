@@ -1,5 +1,6 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from .models import Candidate, Internship, Application, Recommendation
+from .skill_index import SkillIndex
 import re
 
 # Dummy NLP-based skill extraction from resume text (replace with real model in prod)
@@ -32,58 +33,72 @@ def analyze_resume(resume_url: str = None, manual_skills: List[str] = None, cand
         missing = ["resume_url", "manual_skills"]
     return {"skills": skills, "summary": summary, "missing_fields": missing}
 
-def match_candidate_to_internships(candidate: Dict, internships: List[Dict], quotas: Dict[str, int], applications: List[Dict]) -> List[Recommendation]:
+def match_candidate_to_internships(candidate: Dict, internships: List[Dict], quotas: Dict[str, int], applications: List[Dict],
+                                   skill_index: Optional[SkillIndex] = None, fallback: Optional[List[Dict]] = None) -> List[Recommendation]:
     # AI matching logic: skill overlap, preferences, quota, past internships, etc.
+    # With a skill index only internships sharing a skill are scored, plus postings without
+    # requirements and the explicit no-overlap `fallback` bucket (defaults to none).
+    c_skills = set(candidate.get("skills", []))
+    if skill_index is not None:
+        pool = skill_index.overlapping(c_skills) + skill_index.without_requirements()
+        seen = {i["id"] for i in pool}
+        pool += [i for i in (fallback or []) if i["id"] not in seen]
+    else:
+        pool = internships
     recs = []
-    for i in internships:
-        score = 0.0
-        reasoning = []
-        skill_gap = []
-        warnings = []
-        # Skill match
-        c_skills = set(candidate.get("skills", []))
-        i_reqs = set(i.get("requirements", []))
-        overlap = c_skills & i_reqs
-        if i_reqs:
-            skill_score = len(overlap) / len(i_reqs)
-        else:
-            skill_score = 0.5  # fallback if no requirements
-        score += 0.5 * skill_score
-        if not overlap:
-            skill_gap = list(i_reqs - c_skills)
-            reasoning.append("No direct skill match; suggested for learning roadmap.")
-        else:
-            reasoning.append(f"Skill overlap: {', '.join(overlap)}")
-        # Preferences
-        prefs = candidate.get("preferences", {})
-        if prefs.get("location") and prefs["location"] == i.get("location"):
-            score += 0.2
-            reasoning.append("Location preference matched.")
-        if prefs.get("domain") and prefs["domain"] == i.get("domain"):
-            score += 0.1
-            reasoning.append("Domain preference matched.")
-        # Quota
-        quota_cat = candidate.get("quota_category")
-        if quota_cat and i.get("quota", {}).get(quota_cat, 0) > 0:
-            score += 0.1
-            reasoning.append(f"Quota slot available for {quota_cat}.")
-        elif quota_cat:
-            warnings.append(f"Quota for {quota_cat} filled.")
-        # Past internships
-        if candidate.get("past_internships", 0) >= 2:
-            score = 0
-            warnings.append("Candidate has already participated in 2 internships. Blocked.")
-        # Capacity
-        if i.get("capacity", 0) <= 0:
-            warnings.append("Internship capacity full.")
-        recs.append(Recommendation(
-            internship_id=i["id"],
-            match_score=round(score, 2),
-            reasoning="; ".join(reasoning),
-            skill_gap=skill_gap,
-            quota_category=quota_cat,
-            warnings=warnings
-        ))
+    for i in pool:
+        i_reqs = skill_index.requirements_of(i["id"]) if skill_index is not None else None
+        if i_reqs is None:
+            i_reqs = set(i.get("requirements", []))
+        recs.append(_score_internship(candidate, c_skills, i, i_reqs))
     # Sort by score, break ties by GPA or random
     recs.sort(key=lambda r: -r.match_score)
     return recs
+
+def _score_internship(candidate: Dict, c_skills: set, i: Dict, i_reqs) -> Recommendation:
+    score = 0.0
+    reasoning = []
+    skill_gap = []
+    warnings = []
+    # Skill match
+    overlap = c_skills & i_reqs
+    if i_reqs:
+        skill_score = len(overlap) / len(i_reqs)
+    else:
+        skill_score = 0.5  # fallback if no requirements
+    score += 0.5 * skill_score
+    if not overlap:
+        skill_gap = list(i_reqs - c_skills)
+        reasoning.append("No direct skill match; suggested for learning roadmap.")
+    else:
+        reasoning.append(f"Skill overlap: {', '.join(overlap)}")
+    # Preferences
+    prefs = candidate.get("preferences", {})
+    if prefs.get("location") and prefs["location"] == i.get("location"):
+        score += 0.2
+        reasoning.append("Location preference matched.")
+    if prefs.get("domain") and prefs["domain"] == i.get("domain"):
+        score += 0.1
+        reasoning.append("Domain preference matched.")
+    # Quota
+    quota_cat = candidate.get("quota_category")
+    if quota_cat and i.get("quota", {}).get(quota_cat, 0) > 0:
+        score += 0.1
+        reasoning.append(f"Quota slot available for {quota_cat}.")
+    elif quota_cat:
+        warnings.append(f"Quota for {quota_cat} filled.")
+    # Past internships
+    if candidate.get("past_internships", 0) >= 2:
+        score = 0
+        warnings.append("Candidate has already participated in 2 internships. Blocked.")
+    # Capacity
+    if i.get("capacity", 0) <= 0:
+        warnings.append("Internship capacity full.")
+    return Recommendation(
+        internship_id=i["id"],
+        match_score=round(score, 2),
+        reasoning="; ".join(reasoning),
+        skill_gap=skill_gap,
+        quota_category=quota_cat,
+        warnings=warnings
+    )
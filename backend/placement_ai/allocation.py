@@ -0,0 +1,846 @@
+import os
+import heapq
+import time
+import functools
+import threading
+from collections import deque
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+import numpy as np
+import scipy.sparse as sp
+
+QUOTA_CATEGORIES = ("SC", "ST", "OBC", "EWS", "WOMEN")
+MAX_PAST_INTERNSHIPS = 2
+OPEN = ""  # category of unreserved seats
+QUOTA_KEYS = (OPEN,) + QUOTA_CATEGORIES
+CATEGORY_CODES = {cat: code for code, cat in enumerate(QUOTA_KEYS) if cat}
+# Candidates scored per block when building score matrices (bounds the transient overlap)
+SCORE_BLOCK_ROWS = int(os.getenv("ALLOCATION_SCORE_BLOCK_ROWS", "2048"))
+# Score weights matching ai_engine.match_candidate_to_internships
+DEFAULT_WEIGHTS = {"skills_match": 0.5, "location_match": 0.2, "domain_match": 0.1, "quota_match": 0.1}
+
+
+def _category(value: Optional[str]) -> str:
+    return (value or "").strip().upper()
+
+
+def _is_blocked(candidate: Dict) -> bool:
+    return (candidate.get("past_internships", 0) or 0) >= MAX_PAST_INTERNSHIPS
+
+
+def _component_blocks(candidates: List[Dict], internships: List[Dict], block_rows: int):
+    """
+    Eligible pairs and their quota-independent components, one block of candidate rows at
+    a time, so a near-dense overlap never has to exist in memory all at once.
+    Yields (rows, cols, {component: float32 values}) with global row numbers.
+    """
+    n, m = len(candidates), len(internships)
+    vocab: Dict[str, int] = {}
+
+    def incidence(skill_lists):
+        rows, cols = [], []
+        for r, skills in enumerate(skill_lists):
+            for s in set(skills or []):
+                rows.append(r)
+                cols.append(vocab.setdefault(s, len(vocab)))
+        return rows, cols
+
+    c_rows, c_cols = incidence([c.get("skills", []) for c in candidates])
+    i_rows, i_cols = incidence([i.get("requirements", []) for i in internships])
+    v = len(vocab)
+    C = sp.csr_matrix((np.ones(len(c_rows), dtype=np.float32), (c_rows, c_cols)), shape=(n, v))
+    R = sp.csr_matrix((np.ones(len(i_rows), dtype=np.float32), (i_rows, i_cols)), shape=(m, v))
+    RT = R.T.tocsc()
+    req_counts = np.asarray(R.sum(axis=1)).ravel()
+    # Internships without requirements get the neutral skill score for everyone
+    no_reqs = np.flatnonzero(req_counts == 0)
+
+    def codes(values_c, values_i):
+        table: Dict[Any, int] = {}
+        cc = np.array([table.setdefault(x, len(table)) if x else -1 for x in values_c], dtype=np.int64)
+        ic = np.array([table.setdefault(x, len(table)) if x else -2 for x in values_i], dtype=np.int64)
+        return cc, ic
+
+    prefs = [c.get("preferences", {}) or {} for c in candidates]
+    loc_c, loc_i = codes([p.get("location") for p in prefs], [i.get("location") for i in internships])
+    dom_c, dom_i = codes([p.get("domain") for p in prefs], [i.get("domain") for i in internships])
+
+    for start in range(0, n, max(1, block_rows)):
+        stop = min(n, start + max(1, block_rows))
+        overlap = (C[start:stop] @ RT).tocoo()
+        rows, cols = overlap.row.astype(np.int64) + start, overlap.col.astype(np.int64)
+        skill = (overlap.data / req_counts[cols]).astype(np.float32)
+        if no_reqs.size:
+            rows = np.concatenate([rows, np.repeat(np.arange(start, stop), no_reqs.size)])
+            cols = np.concatenate([cols, np.tile(no_reqs, stop - start)])
+            skill = np.concatenate([skill, np.full((stop - start) * no_reqs.size, 0.5, dtype=np.float32)])
+        yield rows, cols, {
+            "skills_match": skill,
+            "location_match": (loc_c[rows] == loc_i[cols]).astype(np.float32),
+            "domain_match": (dom_c[rows] == dom_i[cols]).astype(np.float32),
+        }
+
+
+def top_k_per_row(rows: np.ndarray, scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of each row's k highest scores (ties broken arbitrarily)"""
+    order = np.lexsort((-scores, rows))
+    sorted_rows = rows[order]
+    first = np.searchsorted(sorted_rows, sorted_rows, side="left")
+    return order[np.arange(order.size) - first < k]
+
+
+def score_components(candidates: List[Dict], internships: List[Dict], top_k: Optional[int] = None,
+                     rank_weights: Optional[Sequence[Dict[str, float]]] = None,
+                     block_rows: int = SCORE_BLOCK_ROWS):
+    """
+    Eligible candidate x internship pairs and their quota-independent score components.
+    Only pairs sharing a skill (or internships without requirements) are eligible;
+    everything else is treated as "not eligible". Returns (rows, cols, {component: values}).
+
+    Pairs are scored block_rows candidates at a time in float32. With top_k only each
+    candidate's top_k pairs are kept, ranked by the weighted components under each of
+    `rank_weights` (default: DEFAULT_WEIGHTS); a pair is kept if it is in the top_k under
+    any of them. The quota bonus is left out of the ranking as it is not known here.
+    """
+    rank_weights = list(rank_weights or [DEFAULT_WEIGHTS])
+    kept_rows, kept_cols, kept = [], [], {}
+    for rows, cols, components in _component_blocks(candidates, internships, block_rows):
+        if top_k is not None:
+            keep = np.zeros(rows.size, dtype=bool)
+            for weights in rank_weights:
+                score = np.zeros(rows.size, dtype=np.float32)
+                for name, values in components.items():
+                    score += np.float32(weights.get(name, 0.0)) * values
+                keep[top_k_per_row(rows, score, top_k)] = True
+            rows, cols = rows[keep], cols[keep]
+            components = {name: values[keep] for name, values in components.items()}
+        kept_rows.append(rows)
+        kept_cols.append(cols)
+        for name, values in components.items():
+            kept.setdefault(name, []).append(values)
+    empty = np.zeros(0, dtype=np.int64)
+    return (
+        np.concatenate(kept_rows) if kept_rows else empty,
+        np.concatenate(kept_cols) if kept_cols else empty,
+        {name: np.concatenate(parts) for name, parts in kept.items()} if kept else
+        {name: np.zeros(0, dtype=np.float32) for name in ("skills_match", "location_match", "domain_match")},
+    )
+
+
+def quota_match(rows: np.ndarray, cols: np.ndarray, categories: Sequence[str],
+                quotas: Sequence[Dict[str, int]]) -> np.ndarray:
+    """1.0 where the internship has a quota slot for the candidate's category"""
+    match = np.zeros(rows.shape[0], dtype=np.float32)
+    for cat in set(categories) - {""}:
+        has_quota = np.array([
+            any(_category(k) == cat and q > 0 for k, q in (quota or {}).items()) for quota in quotas
+        ], dtype=bool)
+        in_cat = np.array([c == cat for c in categories], dtype=bool)
+        match[in_cat[rows] & has_quota[cols]] = 1.0
+    return match
+
+
+def combine_scores(rows: np.ndarray, cols: np.ndarray, components: Dict[str, np.ndarray], shape: Tuple[int, int],
+                   weights: Optional[Dict[str, float]] = None) -> sp.csr_matrix:
+    """Weighted sum of score components as a sparse candidate x internship matrix"""
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    unknown = set(weights) - set(components)
+    if unknown:
+        raise ValueError(f"Unknown score components: {sorted(unknown)}")
+    score = np.zeros(rows.shape[0], dtype=np.float32)
+    for name, weight in weights.items():
+        score += weight * components[name]
+    return sp.csr_matrix((score, (rows, cols)), shape=shape)
+
+
+def build_score_matrix(candidates: List[Dict], internships: List[Dict],
+                       weights: Optional[Dict[str, float]] = None, top_k: Optional[int] = None,
+                       block_rows: int = SCORE_BLOCK_ROWS) -> sp.csr_matrix:
+    """
+    Sparse candidate x internship score matrix; the default weights are the ones
+    ai_engine.match_candidate_to_internships uses. Built block_rows candidates at a time;
+    with top_k only each candidate's top_k scores (quota bonus included) are kept.
+    """
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    categories = [_category(c.get("quota_category")) for c in candidates]
+    quotas = [i.get("quota") for i in internships]
+    shape = (len(candidates), len(internships))
+    blocks = []
+    for rows, cols, components in _component_blocks(candidates, internships, block_rows):
+        components["quota_match"] = quota_match(rows, cols, categories, quotas)
+        block = combine_scores(rows, cols, components, shape, weights).tocoo()
+        if top_k is not None:
+            keep = top_k_per_row(block.row, block.data, top_k)
+            block = sp.coo_matrix((block.data[keep], (block.row[keep], block.col[keep])), shape=shape)
+        blocks.append(block)
+    if not blocks:
+        return sp.csr_matrix(shape, dtype=np.float32)
+    return sp.csr_matrix((
+        np.concatenate([b.data for b in blocks]),
+        (np.concatenate([b.row for b in blocks]), np.concatenate([b.col for b in blocks]))
+    ), shape=shape)
+
+
+def _candidate_fingerprint(candidate: Dict) -> tuple:
+    """Everything about a candidate that affects their scores or eligibility"""
+    prefs = candidate.get("preferences", {}) or {}
+    return (frozenset(candidate.get("skills", []) or []), prefs.get("location"), prefs.get("domain"),
+            _category(candidate.get("quota_category")), _is_blocked(candidate))
+
+
+def _posting_fingerprint(internship: Dict) -> tuple:
+    """Everything about an internship that affects scores, apart from its quota bonus"""
+    return (frozenset(internship.get("requirements", []) or []), internship.get("location"), internship.get("domain"))
+
+
+def _quota_categories(internship: Dict) -> frozenset:
+    return frozenset(_category(k) for k, q in (internship.get("quota") or {}).items() if q and q > 0)
+
+
+def quotas_from_targets(internships: List[Dict], targets: Dict[str, float]) -> List[Dict]:
+    """
+    Copies of the internships with per-posting quota seats derived from national
+    percentage targets, e.g. {"SC": 15, "ST": 7.5, "OBC": 27, "EWS": 10, "WOMEN": 30}.
+    """
+    targets = {_category(cat): pct for cat, pct in targets.items() if _category(cat) in QUOTA_CATEGORIES}
+    updated = []
+    for internship in internships:
+        capacity = max(0, int(internship.get("capacity", 0) or 0))
+        quota = {cat: int(capacity * float(pct) / 100.0) for cat, pct in targets.items()}
+        updated.append({**internship, "quota": {cat: seats for cat, seats in quota.items() if seats > 0}})
+    return updated
+
+
+def _exclusive(method):
+    """Run an engine entry point under the engine's lock; runs read and replace the solved state"""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+class AllocationEngine:
+    """
+    Global candidate -> internship allocation solved with an epsilon-scaling auction (Bertsekas).
+
+    Each internship is split into seat groups: one reserved group per quota category
+    (SC/ST/OBC/EWS/Women) and one open group for the remaining capacity. Candidates bid
+    for seats of their top `max_options` internships; seat prices act as dual variables and
+    each phase restarts from the previous phase's prices with a smaller epsilon. The result
+    maximises total match score within the final epsilon * #assigned of optimal while
+    never exceeding a capacity.
+
+    The last solved state (options, seat holders, prices) is kept so `reallocate` can
+    warm-start after quota edits, new or closed postings and withdrawn candidates.
+    Entry points that solve or read that state are serialized on an internal lock, so one
+    engine can be shared by request handlers running in different threads.
+    """
+
+    def __init__(self, max_options: int = 50, epsilon_schedule: Sequence[float] = (0.1, 0.02, 0.004, 0.001),
+                 max_bids: Optional[int] = None, min_score: float = 0.0):
+        self.max_options = max_options
+        self.epsilon_schedule = tuple(epsilon_schedule)
+        self.max_bids = max_bids
+        self.min_score = min_score
+        self.state: Optional[Dict[str, Any]] = None
+        # Re-entrant: reallocate falls back to allocate, update_quota_targets to reallocate
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Problem setup
+    # ------------------------------------------------------------------
+
+    def _top_options(self, scores) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Per candidate, the internship columns and scores of their best `max_options` pairs"""
+        scores = sp.csr_matrix(scores)
+        option_cols, option_vals = [], []
+        for i in range(scores.shape[0]):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            cols, vals = self._keep_top(scores.indices[start:end].astype(np.int64), scores.data[start:end])
+            option_cols.append(cols)
+            option_vals.append(vals)
+        return option_cols, option_vals
+
+    def _keep_top(self, cols: np.ndarray, vals: np.ndarray):
+        keep = vals > self.min_score
+        cols, vals = cols[keep], vals[keep]
+        if cols.size > self.max_options:
+            top = np.argpartition(-vals, self.max_options - 1)[:self.max_options]
+            cols, vals = cols[top], vals[top]
+        return cols, vals
+
+    def _build_groups(self, capacities: Sequence[int], quotas: Sequence[Dict[str, int]]):
+        group_internship, group_category, group_capacity = [], [], []
+        # lookup[j, 0] is the open group of internship j, lookup[j, k] its reserved group for category k
+        lookup = np.full((len(capacities), len(QUOTA_CATEGORIES) + 1), -1, dtype=np.int64)
+        for j, capacity in enumerate(capacities):
+            capacity = max(0, int(capacity or 0))
+            remaining = capacity
+            for cat, seats in sorted((quotas[j] or {}).items()):
+                cat = _category(cat)
+                seats = min(max(0, int(seats or 0)), remaining)
+                if cat in QUOTA_CATEGORIES and seats > 0:
+                    lookup[j, CATEGORY_CODES[cat]] = len(group_internship)
+                    group_internship.append(j)
+                    group_category.append(cat)
+                    group_capacity.append(seats)
+                    remaining -= seats
+            if remaining > 0:
+                lookup[j, 0] = len(group_internship)
+                group_internship.append(j)
+                group_category.append(OPEN)
+                group_capacity.append(remaining)
+        self._group_internship = np.array(group_internship, dtype=np.int64)
+        self._group_category = group_category
+        self._capacity = np.array(group_capacity, dtype=np.int64)
+        self._group_lookup = lookup
+
+    def _expand_options(self):
+        """Turn internship options into seat-group options (reserved seat first, so ties go to the quota)"""
+        n = len(self._option_cols)
+        counts = np.fromiter((c.size for c in self._option_cols), dtype=np.int64, count=n)
+        cols = np.concatenate(self._option_cols) if n else np.zeros(0, dtype=np.int64)
+        vals = np.concatenate(self._option_vals) if n else np.zeros(0)
+        owner = np.repeat(np.arange(n), counts)
+
+        codes = np.array([CATEGORY_CODES.get(c, 0) for c in self._categories], dtype=np.int64)[owner]
+        reserved = np.where(codes > 0, self._group_lookup[cols, codes], -1)
+        groups = np.stack([reserved, self._group_lookup[cols, 0]], axis=1).ravel()
+        values = np.repeat(vals, 2)
+        owners = np.repeat(owner, 2)
+        keep = (groups >= 0) & ~self._blocked[owners]
+        groups, values, owners = groups[keep], values[keep], owners[keep]
+
+        ptr = np.concatenate([[0], np.cumsum(np.bincount(owners, minlength=n))])
+        self._options = [(groups[ptr[i]:ptr[i + 1]], values[ptr[i]:ptr[i + 1]]) if ptr[i + 1] > ptr[i] else None
+                         for i in range(n)]
+        self._flat_owner, self._flat_groups, self._flat_values = owners, groups, values
+
+        # Reverse index seat group -> (candidates, values) used by the reverse pass
+        order = np.argsort(groups, kind="stable")
+        self._bidder_owner = owners[order]
+        self._bidder_value = values[order]
+        self._bidder_ptr = np.searchsorted(groups[order], np.arange(len(self._capacity) + 1))
+
+    def _reset_auction(self, n: int):
+        self._price = np.zeros(len(self._capacity))
+        self._floor = np.zeros(len(self._capacity))
+        self._holders = [[] for _ in range(len(self._capacity))]
+        self._assigned = np.full(n, -1, dtype=np.int64)
+        self._paid = np.zeros(n)
+        self._assigned_value = np.zeros(n)
+        self._bids = 0
+
+    # ------------------------------------------------------------------
+    # Auction
+    # ------------------------------------------------------------------
+
+    def _group_price(self, g: int) -> float:
+        holders = self._holders[g]
+        if len(holders) < self._capacity[g]:
+            return self._floor[g]
+        return holders[0][0]
+
+    def _second_seat_price(self, g: int) -> float:
+        """Price of the next cheapest seat in group g (after the one being bid on)"""
+        holders = self._holders[g]
+        free = self._capacity[g] - len(holders)
+        if free >= 2:
+            return self._floor[g]
+        if free == 1:
+            return holders[0][0] if holders else np.inf
+        if len(holders) < 2:
+            return np.inf
+        return min(holders[1][0], holders[2][0]) if len(holders) > 2 else holders[1][0]
+
+    def _bid(self, i: int, eps: float) -> Optional[int]:
+        """Candidate i bids once; returns an evicted candidate (or None)"""
+        groups, values = self._options[i]
+        profits = values - self._price[groups]
+        best = int(np.argmax(profits))
+        best_profit = profits[best]
+        if best_profit <= 0:
+            return None  # Stays unassigned
+
+        g = int(groups[best])
+        if profits.size > 1:
+            profits[best] = -np.inf
+            second = float(profits.max())
+        else:
+            second = -np.inf
+        second = max(second, values[best] - self._second_seat_price(g), 0.0)
+
+        bid = self._price[g] + (best_profit - second) + eps
+        holders = self._holders[g]
+        evicted = None
+        if len(holders) >= self._capacity[g]:
+            _, evicted = heapq.heappop(holders)
+            self._assigned[evicted] = -1
+        heapq.heappush(holders, (bid, i))
+        self._assigned[i] = g
+        self._paid[i] = bid
+        self._assigned_value[i] = values[best]
+        self._price[g] = self._group_price(g)
+        return evicted
+
+    def _unassign(self, i: int):
+        g = self._assigned[i]
+        holders = self._holders[g]
+        holders[:] = [h for h in holders if h[1] != i]
+        heapq.heapify(holders)
+        self._assigned[i] = -1
+        self._price[g] = self._group_price(g)
+
+    def _reverse_pass(self, eps: float) -> bool:
+        """
+        Seats left empty keep the previous phase's price as a floor, which breaks
+        complementary slackness. Each such group makes reverse bids: it pulls in the
+        candidate who gains most from a seat, at a price that keeps the runner-up within
+        eps, or drops its floor to zero once nobody gains more than eps. Prices only fall
+        here and every move raises a candidate's profit by at least eps, so it terminates.
+        """
+        queue = deque(g for g in range(len(self._capacity))
+                      if len(self._holders[g]) < self._capacity[g] and self._floor[g] > 0)
+        while queue:
+            if self.max_bids is not None and self._bids >= self.max_bids:
+                return False
+            g = queue.popleft()
+            if len(self._holders[g]) >= self._capacity[g]:
+                continue
+            start, end = self._bidder_ptr[g], self._bidder_ptr[g + 1]
+            owners = self._bidder_owner[start:end]
+            current = np.where(self._assigned[owners] >= 0, self._assigned_value[owners] - self._paid[owners], 0.0)
+            gains = self._bidder_value[start:end] - current
+            gains[self._assigned[owners] == g] = -np.inf
+            best = int(np.argmax(gains)) if gains.size else -1
+            if best < 0 or gains[best] <= eps:
+                self._floor[g] = 0.0
+                self._price[g] = self._group_price(g)
+                continue
+
+            self._bids += 1
+            i = int(owners[best])
+            gains[best] = -np.inf
+            second = float(gains.max()) if gains.size > 1 else -np.inf
+            price = max(0.0, second - eps)
+            old = int(self._assigned[i])
+            if old >= 0:
+                self._unassign(i)
+                queue.append(old)
+            heapq.heappush(self._holders[g], (price, i))
+            self._assigned[i] = g
+            self._paid[i] = price
+            self._assigned_value[i] = self._bidder_value[start + best]
+            self._floor[g] = min(self._floor[g], price)
+            self._price[g] = self._group_price(g)
+            queue.append(g)
+        return True
+
+    def _run_auction(self, queue: deque, eps: float) -> bool:
+        while queue:
+            if self.max_bids is not None and self._bids >= self.max_bids:
+                return False
+            i = queue.popleft()
+            if self._assigned[i] != -1 or self._options[i] is None:
+                continue
+            self._bids += 1
+            evicted = self._bid(i, eps)
+            if evicted is not None:
+                queue.append(evicted)
+        return True
+
+    def _settle(self):
+        """
+        Seats within a group are interchangeable, so every holder ends up paying the group
+        price. This only raises holders' profits (outsiders still see the same price), and it
+        keeps a warm start from mistaking a cheaper seat in the holder's own group for a
+        better option.
+        """
+        for g, holders in enumerate(self._holders):
+            if holders:
+                price = self._price[g]
+                self._holders[g] = [(price, i) for _, i in holders]
+                self._paid[[i for _, i in holders]] = price
+
+    def _cs_violations(self, eps: float) -> np.ndarray:
+        """Candidates whose best option beats their current seat (or staying out) by more than eps"""
+        n = self._assigned.shape[0]
+        best = np.full(n, -np.inf)
+        np.maximum.at(best, self._flat_owner, self._flat_values - self._price[self._flat_groups])
+        assigned = self._assigned >= 0
+        current = np.where(assigned, self._assigned_value - self._paid, 0.0)
+        return np.flatnonzero(best > current + eps + 1e-9)
+
+    @_exclusive
+    def solve(self, scores, capacities: Sequence[int], quotas: Sequence[Dict[str, int]],
+              categories: Sequence[Optional[str]], blocked: Optional[Sequence[bool]] = None) -> Dict[str, Any]:
+        """
+        scores: N x M (dense or scipy.sparse) candidate x internship match scores
+        capacities: M seat counts; quotas: M dicts {category: reserved seats}
+        categories: N candidate quota categories; blocked: N flags (excluded candidates)
+        """
+        started = time.time()
+        n = scores.shape[0]
+        self._categories = [_category(c) for c in categories]
+        self._blocked = np.zeros(n, dtype=bool) if blocked is None else np.asarray(blocked, dtype=bool)
+        self._option_cols, self._option_vals = self._top_options(scores)
+        self._build_groups(capacities, quotas)
+        self._expand_options()
+        self._reset_auction(n)
+
+        converged = True
+        for eps in self.epsilon_schedule:
+            # Keep the prices, drop the assignments
+            self._floor = self._price.copy()
+            self._holders = [[] for _ in range(len(self._capacity))]
+            self._assigned = np.full(n, -1, dtype=np.int64)
+            converged = self._run_auction(deque(i for i in range(n) if self._options[i] is not None), eps)
+            if not converged:
+                break
+        if converged:
+            converged = self._reverse_pass(self.epsilon_schedule[-1])
+        self._settle()
+        return self._solution(started, converged)
+
+    def _warm_start(self, carried: List[Tuple[int, int, float]], floors: Dict[int, float]) -> bool:
+        """
+        Re-seat carried (group, candidate, paid) holders at their old prices, evict any
+        beyond a reduced capacity, then let every candidate that is no longer within eps
+        of their best option bid again at the final epsilon.
+        """
+        n = len(self._options)
+        eps = self.epsilon_schedule[-1]
+        self._reset_auction(n)
+        for g, floor in floors.items():
+            self._floor[g] = floor
+        for g, i, paid in carried:
+            groups, values = self._options[i] if self._options[i] is not None else (None, None)
+            hit = np.flatnonzero(groups == g) if groups is not None else ()
+            if len(hit) == 0:
+                continue
+            heapq.heappush(self._holders[g], (paid, i))
+            self._assigned[i] = g
+            self._paid[i] = paid
+            self._assigned_value[i] = values[hit[0]]
+        for g, holders in enumerate(self._holders):
+            while len(holders) > self._capacity[g]:
+                _, i = heapq.heappop(holders)
+                self._assigned[i] = -1
+            self._price[g] = self._group_price(g)
+
+        violators = self._cs_violations(eps)
+        for i in violators.tolist():
+            if self._assigned[i] >= 0:
+                self._unassign(i)
+        converged = self._run_auction(deque(violators.tolist()), eps) and self._reverse_pass(eps)
+        self._settle()
+        return converged
+
+    def _solution(self, started: float, converged: bool) -> Dict[str, Any]:
+        assignment = np.full(self._assigned.shape[0], -1, dtype=np.int64)
+        assigned = self._assigned >= 0
+        assignment[assigned] = self._group_internship[self._assigned[assigned]]
+        return {
+            "assignment": assignment,              # internship column per candidate, -1 if unallocated
+            "seat_group": self._assigned.copy(),   # seat group per candidate
+            "scores": np.where(assigned, self._assigned_value, 0.0),
+            "prices": self._price.copy(),
+            "iterations": self._bids,
+            "optimality_gap_bound": self.epsilon_schedule[-1] * int(assigned.sum()),
+            "converged": converged,
+            "solve_seconds": round(time.time() - started, 3),
+        }
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    @_exclusive
+    def quota_report(self) -> Dict[str, Dict[str, int]]:
+        """Reserved seats vs. seats filled by the reserved category"""
+        report = {cat: {"reserved": 0, "filled": 0, "eligible_candidates": 0} for cat in QUOTA_CATEGORIES}
+        for g, cat in enumerate(self._group_category):
+            if cat != OPEN:
+                report[cat]["reserved"] += int(self._capacity[g])
+                report[cat]["filled"] += len(self._holders[g])
+        for i, cat in enumerate(self._categories):
+            if cat in report and self._options[i] is not None:
+                report[cat]["eligible_candidates"] += 1
+        return report
+
+    @_exclusive
+    def quota_violations(self) -> List[str]:
+        """
+        Categories whose reserved seats ended up with more candidates than reserved, or
+        with candidates of another category. Checked from the candidate side of the
+        assignment, independently of the seat-group bookkeeping the auction maintains.
+        """
+        assigned = self._assigned[self._assigned >= 0]
+        held = np.bincount(assigned, minlength=len(self._capacity))
+        violated = set()
+        for i, g in enumerate(self._assigned.tolist()):
+            cat = self._group_category[g] if g >= 0 else OPEN
+            if cat != OPEN and self._categories[i] != cat:
+                violated.add(cat)
+        for g, cat in enumerate(self._group_category):
+            if cat != OPEN and held[g] > self._capacity[g]:
+                violated.add(cat)
+        return sorted(violated)
+
+    def quota_compliance(self) -> float:
+        """Percentage of fillable reserved seats that went to their category"""
+        fillable = filled = 0
+        for stats in self.quota_report().values():
+            fillable += min(stats["reserved"], stats["eligible_candidates"])
+            filled += stats["filled"]
+        return round(100.0 * filled / fillable, 1) if fillable else 100.0
+
+    @_exclusive
+    def residual_capacities(self) -> Dict[Any, int]:
+        """Free seats left per internship id"""
+        free = np.zeros(len(self.state["internships"]), dtype=np.int64)
+        filled = np.fromiter((len(h) for h in self._holders), dtype=np.int64, count=len(self._holders))
+        np.add.at(free, self._group_internship, self._capacity - filled)
+        return {i["id"]: int(f) for i, f in zip(self.state["internships"], free.tolist())}
+
+    def _assignment_by_id(self) -> Dict[Any, Tuple[Any, str]]:
+        if self.state is None:
+            return {}
+        candidates, internships = self.state["candidates"], self.state["internships"]
+        return {
+            candidates[i]["id"]: (internships[self._group_internship[g]]["id"], self._group_category[g] or "OPEN")
+            for i, g in enumerate(self._assigned.tolist()) if g >= 0
+        }
+
+    def _result(self, candidates: List[Dict], internships: List[Dict], solution: Dict[str, Any],
+                started: float) -> Dict[str, Any]:
+        allocations = []
+        for ci, j in enumerate(solution["assignment"].tolist()):
+            if j < 0:
+                continue
+            seat_category = self._group_category[solution["seat_group"][ci]]
+            allocations.append({
+                "candidate_id": candidates[ci]["id"],
+                "internship_id": internships[j]["id"],
+                "match_score": round(float(solution["scores"][ci]), 3),
+                "seat_category": seat_category or "OPEN",
+            })
+
+        report = self.quota_report()
+        warnings = [
+            f"{cat}: {stats['reserved'] - stats['filled']} reserved seats left unfilled"
+            for cat, stats in report.items() if stats["filled"] < stats["reserved"]
+        ]
+        if not solution["converged"]:
+            warnings.append("Auction stopped at the bid limit before converging.")
+        overfilled = self.quota_violations()
+        if overfilled:
+            warnings.append(f"Reserved seats violated for: {', '.join(overfilled)}")
+
+        eligible = int((~self._blocked).sum())
+        return {
+            "allocations": allocations,
+            "overfilled_quotas": overfilled,
+            "blocked_candidates": [c["id"] for c, b in zip(candidates, self._blocked.tolist()) if b],
+            "warnings": warnings,
+            "stats": {
+                "total_candidates": len(candidates),
+                "eligible_candidates": eligible,
+                "total_postings": len(internships),
+                "total_companies": len({i.get("company_id") for i in internships}),
+                "total_seats": int(self._capacity.sum()),
+                "total_matches": len(allocations),
+                "match_rate": round(100.0 * len(allocations) / len(candidates), 1) if candidates else 0.0,
+                "avg_match_score": round(100.0 * float(np.mean([a["match_score"] for a in allocations])), 1) if allocations else 0.0,
+                "quota_compliance": self.quota_compliance(),
+                "quota_report": report,
+                "iterations": solution["iterations"],
+                "converged": solution["converged"],
+                "processing_seconds": round(time.time() - started, 3),
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+
+    @_exclusive
+    def allocate(self, candidates: List[Dict], internships: List[Dict]) -> Dict[str, Any]:
+        """Score, solve and format an allocation run for placement_ai records"""
+        started = time.time()
+        candidates = [c for c in candidates if c.get("is_active", True)]
+        internships = [i for i in internships if i.get("is_active", True)]
+        # Only the best max_options pairs per candidate are ever bid on, so only those are kept
+        scores = build_score_matrix(candidates, internships, top_k=self.max_options)
+        solution = self.solve(
+            scores,
+            [i.get("capacity", 0) for i in internships],
+            [i.get("quota", {}) for i in internships],
+            [c.get("quota_category") for c in candidates],
+            [_is_blocked(c) for c in candidates],
+        )
+        self._remember(candidates, internships)
+        return self._result(candidates, internships, solution, started)
+
+    def _remember(self, candidates: List[Dict], internships: List[Dict], fingerprints: Optional[List[tuple]] = None):
+        self.state = {
+            "candidates": candidates,
+            "internships": internships,
+            "candidate_fingerprints": fingerprints or [_candidate_fingerprint(c) for c in candidates],
+            "posting_fingerprints": [_posting_fingerprint(i) for i in internships],
+            "quota_categories": [_quota_categories(i) for i in internships],
+        }
+
+    @_exclusive
+    def reallocate(self, candidates: Optional[List[Dict]] = None,
+                   internships: Optional[List[Dict]] = None) -> Dict[str, Any]:
+        """
+        Warm-started re-solve after the catalogue or candidate pool changed.
+
+        Only new or edited candidates and postings are re-scored; everybody else keeps
+        their options, seat and price from the last run and only re-bids if a change
+        made another seat better by more than epsilon. Pass None to keep a side as is.
+        The result is the same as `allocate` plus a `diff` against the previous run.
+        """
+        if self.state is None:
+            result = self.allocate(candidates or [], internships or [])
+            result["diff"] = self._diff({}, self._assignment_by_id())
+            return result
+
+        started = time.time()
+        old = self.state
+        candidates = [c for c in (old["candidates"] if candidates is None else candidates) if c.get("is_active", True)]
+        internships = [i for i in (old["internships"] if internships is None else internships) if i.get("is_active", True)]
+        previous = self._assignment_by_id()
+
+        # Seat holders and floors to carry over, keyed by (internship id, category)
+        carried_holders = {
+            (old["internships"][self._group_internship[g]]["id"], self._group_category[g]): (holders, self._floor[g])
+            for g, holders in enumerate(self._holders) if holders or self._floor[g] > 0
+        }
+
+        # Internship columns: unchanged ones keep their scores, edited ones are re-scored
+        old_cols = {i["id"]: j for j, i in enumerate(old["internships"])}
+        col_map = np.full(len(old["internships"]), -1, dtype=np.int64)
+        new_cols = []
+        for k, internship in enumerate(internships):
+            j = old_cols.get(internship["id"])
+            if j is not None and old["posting_fingerprints"][j] == _posting_fingerprint(internship):
+                col_map[j] = k
+            else:
+                new_cols.append(k)
+
+        # Candidate rows: unchanged ones keep their options unless one was closed or edited
+        old_rows = {c["id"]: r for r, c in enumerate(old["candidates"])}
+        row_map = np.full(len(old["candidates"]), -1, dtype=np.int64)
+        option_cols: List[Optional[np.ndarray]] = [None] * len(candidates)
+        option_vals: List[Optional[np.ndarray]] = [None] * len(candidates)
+        fingerprints = [_candidate_fingerprint(c) for c in candidates]
+        rescore = []
+        for i, candidate in enumerate(candidates):
+            r = old_rows.get(candidate["id"])
+            if r is None or old["candidate_fingerprints"][r] != fingerprints[i]:
+                rescore.append(i)
+                continue
+            row_map[r] = i
+            cols = col_map[self._option_cols[r]]
+            if (cols < 0).any():
+                rescore.append(i)
+                continue
+            option_cols[i], option_vals[i] = cols, self._option_vals[r].copy()
+
+        categories = [_category(c.get("quota_category")) for c in candidates]
+        self._apply_quota_bonus(option_cols, option_vals, categories, internships, col_map, old["quota_categories"])
+
+        # Unchanged candidates only gain the new postings that beat their current options
+        kept = [i for i in range(len(candidates)) if option_cols[i] is not None]
+        if new_cols and kept:
+            added = build_score_matrix([candidates[i] for i in kept], [internships[k] for k in new_cols],
+                                       top_k=self.max_options)
+            added.data[added.data <= self.min_score] = 0
+            added.eliminate_zeros()
+            new_cols_arr = np.array(new_cols, dtype=np.int64)
+            for row in np.flatnonzero(np.diff(added.indptr)).tolist():
+                i = kept[row]
+                start, end = added.indptr[row], added.indptr[row + 1]
+                option_cols[i], option_vals[i] = self._keep_top(
+                    np.concatenate([option_cols[i], new_cols_arr[added.indices[start:end]]]),
+                    np.concatenate([option_vals[i], added.data[start:end]])
+                )
+        if rescore:
+            fresh_cols, fresh_vals = self._top_options(
+                build_score_matrix([candidates[i] for i in rescore], internships, top_k=self.max_options)
+            )
+            for i, cols, vals in zip(rescore, fresh_cols, fresh_vals):
+                option_cols[i], option_vals[i] = cols, vals
+
+        self._categories = categories
+        self._blocked = np.array([_is_blocked(c) for c in candidates], dtype=bool)
+        self._option_cols, self._option_vals = option_cols, option_vals
+        self._build_groups([i.get("capacity", 0) for i in internships], [i.get("quota", {}) for i in internships])
+        self._expand_options()
+
+        carried, floors = [], {}
+        for k, internship in enumerate(internships):
+            for code, g in enumerate(self._group_lookup[k].tolist()):
+                entry = carried_holders.get((internship["id"], QUOTA_KEYS[code])) if g >= 0 else None
+                if entry is None:
+                    continue
+                holders, floor = entry
+                floors[g] = floor
+                carried.extend((g, int(row_map[r]), paid) for paid, r in holders if row_map[r] >= 0)
+
+        converged = self._warm_start(carried, floors)
+        solution = self._solution(started, converged)
+        self._remember(candidates, internships, fingerprints)
+        result = self._result(candidates, internships, solution, started)
+        result["diff"] = self._diff(previous, self._assignment_by_id())
+        result["stats"]["candidates_rescored"] = len(rescore)
+        result["stats"]["postings_rescored"] = len(new_cols)
+        return result
+
+    def _apply_quota_bonus(self, option_cols, option_vals, categories, internships, col_map, old_quota_categories):
+        """Adjust kept scores in place for postings whose quota categories changed"""
+        old_cats = [frozenset()] * len(internships)
+        for j, k in enumerate(col_map.tolist()):
+            if k >= 0:
+                old_cats[k] = old_quota_categories[j]
+        delta = np.zeros((len(internships), len(QUOTA_CATEGORIES) + 1))
+        for k, internship in enumerate(internships):
+            now = _quota_categories(internship)
+            for cat in now ^ old_cats[k]:
+                if cat in CATEGORY_CODES:
+                    delta[k, CATEGORY_CODES[cat]] = 0.1 if cat in now else -0.1
+        if not delta.any():
+            return
+        for i, cols in enumerate(option_cols):
+            code = CATEGORY_CODES.get(categories[i], 0)
+            if cols is not None and code > 0:
+                option_vals[i] += delta[cols, code]
+
+    @_exclusive
+    def update_quota_targets(self, targets: Dict[str, float]) -> Dict[str, Any]:
+        """Re-derive every posting's reserved seats from percentage targets and re-solve"""
+        if self.state is None:
+            raise ValueError("No allocation has been run yet")
+        return self.reallocate(internships=quotas_from_targets(self.state["internships"], targets))
+
+    @staticmethod
+    def _diff(previous: Dict[Any, Tuple[Any, str]], current: Dict[Any, Tuple[Any, str]]) -> Dict[str, Any]:
+        """Assignments added, removed or moved between two runs"""
+        added = [{"candidate_id": c, "internship_id": seat[0], "seat_category": seat[1]}
+                 for c, seat in current.items() if c not in previous]
+        removed = [{"candidate_id": c, "internship_id": seat[0], "seat_category": seat[1]}
+                   for c, seat in previous.items() if c not in current]
+        moved = [{"candidate_id": c, "from_internship_id": previous[c][0], "to_internship_id": seat[0],
+                  "from_seat_category": previous[c][1], "to_seat_category": seat[1]}
+                 for c, seat in current.items() if c in previous and previous[c] != seat]
+        return {
+            "added": added,
+            "removed": removed,
+            "moved": moved,
+            "unchanged": len(current) - len(added) - len(moved),
+        }
+
+
+allocation_engine = AllocationEngine()
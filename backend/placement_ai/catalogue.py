@@ -0,0 +1,94 @@
+"""Internship catalogue writes, keeping the in-memory posting indexes in step with the table"""
+import os
+import time
+import threading
+from typing import Any, Dict, List, Optional
+from . import db
+from .posting_index import posting_index, is_live
+from .skill_index import skill_index
+
+# How stale the indexes may get with respect to writes made outside this process
+# (Supabase directly, the admin UI, other workers)
+RECONCILE_SECONDS = float(os.getenv("CATALOGUE_RECONCILE_SECONDS", "30"))
+# Above this many changed rows a reconcile reads the whole table instead of by id
+FETCH_BY_ID_LIMIT = 500
+
+_index_lock = threading.RLock()
+_versions: Dict[Any, Optional[str]] = {}
+_reconciled_at: Optional[float] = None
+
+
+def ensure_indexed():
+    """Reconcile the indexes with the internships table, at most every RECONCILE_SECONDS"""
+    if _reconciled_at is not None and time.monotonic() - _reconciled_at < RECONCILE_SECONDS:
+        return
+    with _index_lock:
+        if _reconciled_at is not None and time.monotonic() - _reconciled_at < RECONCILE_SECONDS:
+            return
+        reconcile()
+
+
+def reconcile():
+    """
+    Compare the table's (id, updated_at) pairs with what was indexed: re-read rows that
+    are new, edited or carry no updated_at, and drop ids the table no longer returns,
+    including postings reloaded from a persisted index.
+    """
+    global _versions, _reconciled_at
+    with _index_lock:
+        versions = {row["id"]: row.get("updated_at") for row in db.get_internship_versions()}
+        stale = (set(_versions) | posting_index.ids() | skill_index.ids()) - set(versions)
+        for internship_id in stale:
+            skill_index.remove(internship_id)
+        posting_index.remove_postings(stale)
+
+        changed = [i for i, version in versions.items() if version is None or _versions.get(i) != version]
+        if len(changed) > FETCH_BY_ID_LIMIT:
+            wanted = set(changed)
+            rows = [row for row in db.get_internships() if row["id"] in wanted]
+        else:
+            rows = db.get_internships_by_ids(changed) if changed else []
+        index_postings(rows)
+        _versions = versions
+        _reconciled_at = time.monotonic()
+
+
+def index_postings(internships: List[Dict]):
+    """Apply created, edited or closed postings to every index; both agree on what is live"""
+    with _index_lock:
+        for internship in internships:
+            if is_live(internship):
+                skill_index.upsert(internship)
+            else:
+                skill_index.remove(internship["id"])
+            _versions[internship["id"]] = internship.get("updated_at")
+        posting_index.upsert_postings(internships)
+
+
+def unindex_posting(internship_id: Any):
+    with _index_lock:
+        skill_index.remove(internship_id)
+        posting_index.remove_posting(internship_id)
+
+
+def create_internship(internship: Dict) -> Optional[Dict]:
+    row = db.insert_internship(internship)
+    if row:
+        index_postings([row])
+    return row
+
+
+def update_internship(internship_id: str, changes: Dict) -> Optional[Dict]:
+    row = db.update_internship(internship_id, changes)
+    if row:
+        index_postings([row])
+    return row
+
+
+def close_internship(internship_id: str) -> Optional[Dict]:
+    row = db.update_internship(internship_id, {"is_active": False})
+    if row:
+        index_postings([row])
+    else:
+        unindex_posting(internship_id)
+    return row
@@ -19,6 +19,14 @@ def get_internships() -> list:
     resp = supabase.table("internships").select("*").execute()
     return resp.data or []
 
+def get_internship_versions() -> list:
+    resp = supabase.table("internships").select("id,updated_at").execute()
+    return resp.data or []
+
+def get_internships_by_ids(internship_ids: list) -> list:
+    resp = supabase.table("internships").select("*").in_("id", internship_ids).execute()
+    return resp.data or []
+
 def get_internship_by_id(internship_id: str) -> Any:
     resp = supabase.table("internships").select("*").eq("id", internship_id).single().execute()
     return resp.data
@@ -38,3 +46,11 @@ def insert_application(application: dict) -> Any:
 def update_application_status(app_id: str, status: str) -> Any:
     resp = supabase.table("applications").update({"status": status}).eq("id", app_id).execute()
     return resp.data
+
+def insert_internship(internship: dict) -> Any:
+    resp = supabase.table("internships").insert(internship).execute()
+    return resp.data[0] if resp.data else None
+
+def update_internship(internship_id: str, changes: dict) -> Any:
+    resp = supabase.table("internships").update(changes).eq("id", internship_id).execute()
+    return resp.data[0] if resp.data else None
@@ -29,6 +29,7 @@ class Internship(BaseModel):
     eligibility: dict = {}
     quota: dict = {}  # {"SC": 2, "ST": 1, ...}
     is_active: bool = True
+    updated_at: Optional[str] = None
 
 class Application(BaseModel):
     id: str
@@ -0,0 +1,164 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from typing import List, Dict, Any, Optional
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from ai_modules.ann_index import IVFFlatIndex
+
+logger = logging.getLogger(__name__)
+
+# Shortlist size handed to the detailed weighted re-rank
+SHORTLIST_SIZE = int(os.getenv("POSTING_SHORTLIST_SIZE", "200"))
+INDEX_DIM = 2048
+
+
+def posting_text(internship: Dict) -> str:
+    """Searchable text for an internship posting (works for placement_ai and /internship listings)"""
+    skills = internship.get("requirements") or internship.get("required_skills") or internship.get("skills") or []
+    parts = [
+        internship.get("title", ""),
+        internship.get("domain", ""),
+        internship.get("category", ""),
+        " ".join(skills) if isinstance(skills, list) else str(skills),
+        internship.get("location", ""),
+        internship.get("description", ""),
+    ]
+    return " ".join(str(p) for p in parts if p)
+
+
+def candidate_text(candidate: Dict) -> str:
+    """Query text for a candidate profile"""
+    prefs = candidate.get("preferences", {}) or {}
+    parts = list(candidate.get("skills", []) or []) + list(candidate.get("manual_skills", []) or [])
+    parts += [str(prefs.get("domain", "")), str(prefs.get("location", ""))]
+    return " ".join(p for p in parts if p)
+
+
+def is_live(internship: Dict) -> bool:
+    """Open postings with seats left are searchable; closed or full ones are not"""
+    return bool(internship.get("is_active", True)) and internship.get("capacity", 1) > 0
+
+
+def _fingerprint(internship: Dict) -> str:
+    return hashlib.sha1(posting_text(internship).encode("utf-8")).hexdigest()
+
+
+class PostingIndex:
+    """
+    ANN index over internship postings used to shortlist before detailed scoring.
+    Postings are embedded with a stateless hashing vectorizer, so new postings can be
+    added and closed postings removed without refitting anything.
+
+    The index is maintained on posting writes (`upsert_posting`, `remove_posting`), not
+    per query, so a shortlist costs one ANN search. With `index_path` it is saved after
+    every change and reloaded, postings included, on the next start; a reloaded index
+    may hold postings deleted since, so its owner reconciles it against the source of
+    truth (see placement_ai.catalogue).
+    """
+
+    def __init__(self, n_probe: int = 8, train_threshold: int = 2048, index_path: Optional[str] = None):
+        self.vectorizer = HashingVectorizer(
+            n_features=INDEX_DIM, alternate_sign=False, norm="l2", ngram_range=(1, 2), stop_words="english"
+        )
+        self.index_path = index_path
+        self.index = IVFFlatIndex(INDEX_DIM, n_probe=n_probe, train_threshold=train_threshold)
+        self._fingerprints: Dict[Any, str] = {}
+        self._postings: Dict[Any, Dict] = {}
+        self._lock = threading.RLock()
+        if index_path and os.path.exists(index_path):
+            try:
+                self._load(index_path, n_probe)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Posting index at {index_path} not loaded: {e}")
+                self.index = IVFFlatIndex(INDEX_DIM, n_probe=n_probe, train_threshold=train_threshold)
+
+    def _load(self, path: str, n_probe: int):
+        index = IVFFlatIndex.load(path)
+        index.n_probe = n_probe
+        with open(path + ".postings.json", "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        self._fingerprints = {item_id: fp for item_id, fp, _ in entries if item_id in index}
+        self._postings = {item_id: posting for item_id, _, posting in entries if item_id in index}
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        return self.vectorizer.transform(texts).toarray().astype(np.float32)
+
+    def upsert_posting(self, internship: Dict):
+        """Index a created or edited posting, or drop it if it was closed or filled"""
+        self.upsert_postings([internship])
+
+    def upsert_postings(self, internships: List[Dict]):
+        """Apply many posting writes at once (one embedding batch, one save)"""
+        with self._lock:
+            changed = False
+            for internship in internships:
+                if not is_live(internship):
+                    changed |= self._remove(internship["id"])
+            live = [i for i in internships if is_live(i)]
+            fresh = [i for i in live if self._fingerprints.get(i["id"]) != _fingerprint(i)]
+            for internship in live:
+                changed |= self._postings.get(internship["id"]) != internship
+                self._postings[internship["id"]] = internship
+            if fresh:
+                self.index.add([i["id"] for i in fresh], self.embed([posting_text(i) for i in fresh]))
+                for internship in fresh:
+                    self._fingerprints[internship["id"]] = _fingerprint(internship)
+            if changed:
+                self.save()
+
+    def remove_posting(self, internship_id) -> bool:
+        """Drop a closed or deleted posting"""
+        return self.remove_postings([internship_id]) > 0
+
+    def remove_postings(self, internship_ids) -> int:
+        """Drop many postings at once (one save); returns how many were indexed"""
+        with self._lock:
+            removed = sum(self._remove(internship_id) for internship_id in internship_ids)
+            if removed:
+                self.save()
+            return removed
+
+    def ids(self) -> set:
+        """Ids of every indexed posting"""
+        with self._lock:
+            return set(self.index.ids()) | set(self._postings)
+
+    def _remove(self, internship_id) -> bool:
+        self._fingerprints.pop(internship_id, None)
+        known = self._postings.pop(internship_id, None) is not None
+        return self.index.remove(internship_id) or known
+
+    def shortlist(self, query_text: str, k: int = SHORTLIST_SIZE, n_probe: Optional[int] = None) -> List[Any]:
+        """Ids of the k postings closest to the query"""
+        return [item_id for item_id, _ in self.index.search(self.embed([query_text])[0], k, n_probe)]
+
+    def shortlist_postings(self, query_text: str, k: int = SHORTLIST_SIZE) -> List[Dict]:
+        """The k indexed postings closest to the query, best first"""
+        with self._lock:
+            return [self._postings[item_id] for item_id in self.shortlist(query_text, k) if item_id in self._postings]
+
+    def save(self, path: Optional[str] = None):
+        """Write the index and its postings (a no-op without a path)"""
+        path = path or self.index_path
+        if not path:
+            return
+        with self._lock:
+            # Written beside the target and renamed, so a crash never leaves a torn index;
+            # the temporary names are per process, as every worker saves to the same path
+            tmp = f".{os.getpid()}.tmp"
+            self.index.save(path + tmp)
+            with open(path + ".postings.json" + tmp, "w", encoding="utf-8") as f:
+                json.dump([[item_id, self._fingerprints[item_id], posting]
+                           for item_id, posting in self._postings.items()], f, default=str)
+            os.replace(path + tmp, path)
+            os.replace(path + ".postings.json" + tmp, path + ".postings.json")
+
+
+posting_index = PostingIndex(index_path=os.getenv("POSTING_INDEX_PATH"))
@@ -0,0 +1,35 @@
+import logging
+from fastapi import APIRouter, HTTPException
+from ..models import BatchAllocationRequest, BatchAllocationResult
+from ..db import get_candidates, get_internships
+from ..allocation import AllocationEngine
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Runs here only return results, so they get their own engine and never replace the
+# solved state the admin endpoints warm-start from
+preview_engine = AllocationEngine()
+
+@router.post("/allocation/batch", response_model=BatchAllocationResult)
+def run_batch_allocation(req: BatchAllocationRequest):
+    """
+    Global allocation of all candidates. placement_ai has no allocations table, so every
+    run is a simulation: results are returned, never written back. A request without
+    run_simulation is still served, with a warning saying nothing was committed.
+    """
+    logger.info(f"Batch allocation requested by admin {req.admin_id} (simulation={req.run_simulation})")
+    candidates = get_candidates()
+    internships = get_internships()
+    if not candidates or not internships:
+        raise HTTPException(status_code=404, detail="No candidates or internships to allocate.")
+    result = preview_engine.allocate(candidates, internships)
+    warnings = list(result["warnings"])
+    if not req.run_simulation:
+        warnings.append("Allocations were not saved: batch runs are previews, placement_ai has no allocations table.")
+    return BatchAllocationResult(
+        allocations=result["allocations"],
+        overfilled_quotas=result["overfilled_quotas"],
+        blocked_candidates=[str(c) for c in result["blocked_candidates"]],
+        warnings=warnings,
+    )
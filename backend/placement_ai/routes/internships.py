@@ -0,0 +1,28 @@
+from fastapi import APIRouter, HTTPException
+from ..models import Internship
+from ..catalogue import create_internship, update_internship, close_internship
+
+router = APIRouter()
+
+@router.post("/internships", response_model=Internship)
+def create_posting(internship: Internship):
+    """Create a posting; it is searchable from the next recommendation request"""
+    row = create_internship(internship.dict(exclude={"updated_at"}))
+    if not row:
+        raise HTTPException(status_code=500, detail="Internship could not be created.")
+    return row
+
+@router.patch("/internships/{internship_id}", response_model=Internship)
+def update_posting(internship_id: str, changes: dict):
+    row = update_internship(internship_id, changes)
+    if not row:
+        raise HTTPException(status_code=404, detail="Internship not found.")
+    return row
+
+@router.post("/internships/{internship_id}/close", response_model=Internship)
+def close_posting(internship_id: str):
+    """Close a posting and drop it from recommendations"""
+    row = close_internship(internship_id)
+    if not row:
+        raise HTTPException(status_code=404, detail="Internship not found.")
+    return row
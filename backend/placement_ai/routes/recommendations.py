@@ -1,7 +1,10 @@
 from fastapi import APIRouter, HTTPException
 from ..models import RecommendationRequest, Recommendation
-from ..db import get_candidate_by_id, get_internships, get_applications_by_candidate
+from ..db import get_candidate_by_id, get_applications_by_candidate
 from ..ai_engine import match_candidate_to_internships
+from ..posting_index import posting_index, candidate_text
+from ..catalogue import ensure_indexed
+from ..skill_index import skill_index
 
 router = APIRouter()
 
@@ -10,10 +13,13 @@ def get_recommendations(req: RecommendationRequest):
     candidate = get_candidate_by_id(req.candidate_id)
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found.")
-    internships = get_internships()
+    # Both indexes follow posting writes, so a query only touches overlapping postings
+    ensure_indexed()
+    # ANN shortlist supplies the no-overlap bucket for the detailed weighted re-rank
+    shortlist = posting_index.shortlist_postings(candidate_text(candidate))
     applications = get_applications_by_candidate(req.candidate_id)
-    quotas = {i["quota_category"]: i["quota"] for i in internships if "quota" in i}
-    recs = match_candidate_to_internships(candidate, internships, quotas, applications)
+    recs = match_candidate_to_internships(candidate, [], {}, applications,
+                                          skill_index=skill_index, fallback=shortlist)
     if not recs:
         # Suggest learning roadmap or closest industry
         return [Recommendation(
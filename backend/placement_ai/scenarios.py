@@ -0,0 +1,165 @@
+"""What-if allocation scenarios evaluated in parallel over one shared score matrix"""
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional
+import numpy as np
+
+from .allocation import (
+    AllocationEngine,
+    DEFAULT_WEIGHTS,
+    score_components,
+    quota_match,
+    combine_scores,
+    quotas_from_targets,
+    _category,
+    _is_blocked,
+)
+
+SCENARIO_WORKERS = int(os.getenv("SCENARIO_WORKERS", "0")) or None
+
+# Per-worker view of the shared matrix of the request being evaluated, set by _attach
+_shared: Optional[Dict[str, Any]] = None
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Shared scenario pool, started on first use (spawn: the API process is multi-threaded, forking it is not safe)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=SCENARIO_WORKERS or os.cpu_count() or 1,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken pool so the next request starts a fresh one"""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def write_shared_scores(directory: str, candidates: List[Dict], internships: List[Dict],
+                        top_k: Optional[int] = None, rank_weights: Optional[List[Dict[str, float]]] = None) -> None:
+    """
+    Score the eligible pairs once and store them as .npy files that workers open with
+    mmap_mode="r", so every process reads the same pages instead of unpickling a copy.
+    Only quota-independent components are stored; the quota bonus depends on the scenario.
+    With top_k, each candidate keeps the pairs in their top_k under any of rank_weights.
+    """
+    rows, cols, components = score_components(candidates, internships, top_k=top_k, rank_weights=rank_weights)
+    names = sorted(components)
+    np.save(os.path.join(directory, "rows.npy"), rows.astype(np.int32))
+    np.save(os.path.join(directory, "cols.npy"), cols.astype(np.int32))
+    np.save(os.path.join(directory, "components.npy"),
+            np.stack([components[name] for name in names]).astype(np.float32) if names else np.zeros((0, 0), np.float32))
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"components": names, "shape": [len(candidates), len(internships)]}, f)
+
+
+def _attach(directory: str, context: Dict[str, Any]) -> None:
+    """Memory-map a request's shared matrix, once per worker and request"""
+    global _shared
+    if _shared is not None and _shared["directory"] == directory:
+        return
+    with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    matrix = np.load(os.path.join(directory, "components.npy"), mmap_mode="r")
+    _shared = {
+        "rows": np.load(os.path.join(directory, "rows.npy"), mmap_mode="r"),
+        "cols": np.load(os.path.join(directory, "cols.npy"), mmap_mode="r"),
+        "components": {name: matrix[k] for k, name in enumerate(meta["components"])},
+        "shape": tuple(meta["shape"]),
+        "directory": directory,
+        **context,
+    }
+
+
+def _evaluate(directory: str, context: Dict[str, Any], scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Solve one scenario against the shared matrix in `directory`"""
+    started = time.time()
+    _attach(directory, context)
+    name = scenario.get("name", "")
+    weights = {**DEFAULT_WEIGHTS, **(scenario.get("weights") or {})}
+    targets = scenario.get("quota_targets")
+    capacities = _shared["capacities"]
+    if targets is not None:
+        quotas = [p["quota"] for p in quotas_from_targets([{"capacity": c} for c in capacities], targets)]
+    else:
+        quotas = _shared["quotas"]
+
+    rows, cols = _shared["rows"], _shared["cols"]
+    components = dict(_shared["components"])
+    components["quota_match"] = quota_match(rows, cols, _shared["categories"], quotas)
+    try:
+        scores = combine_scores(rows, cols, components, _shared["shape"], weights)
+    except ValueError as e:
+        return {"name": name, "error": str(e)}
+
+    engine = AllocationEngine(**_shared["engine_params"])
+    solution = engine.solve(scores, capacities, quotas, _shared["categories"], _shared["blocked"])
+    matched = solution["assignment"] >= 0
+    seats = int(engine._capacity.sum())
+    return {
+        "name": name,
+        "weights": weights,
+        "quota_targets": targets,
+        "quota_compliance": engine.quota_compliance(),
+        "avg_match_score": round(100.0 * float(solution["scores"][matched].mean()), 1) if matched.any() else 0.0,
+        "fill_rate": round(100.0 * int(matched.sum()) / seats, 1) if seats else 0.0,
+        "match_rate": round(100.0 * int(matched.sum()) / len(matched), 1) if len(matched) else 0.0,
+        "total_matches": int(matched.sum()),
+        "quota_report": engine.quota_report(),
+        "iterations": solution["iterations"],
+        "converged": solution["converged"],
+        "processing_seconds": round(time.time() - started, 3),
+    }
+
+
+def run_scenarios(candidates: List[Dict], internships: List[Dict], scenarios: List[Dict[str, Any]],
+                  engine_params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Evaluate allocation scenarios concurrently on the shared process pool (SCENARIO_WORKERS
+    processes, default one per CPU), which stays up between requests.
+
+    Each scenario is a dict with an optional "name", "weights" (overrides of
+    DEFAULT_WEIGHTS) and "quota_targets" (category -> % of every posting's capacity;
+    omitted keeps each posting's own quota). Results come back in scenario order.
+    """
+    candidates = [c for c in candidates if c.get("is_active", True)]
+    internships = [i for i in internships if i.get("is_active", True)]
+    if not scenarios:
+        return []
+
+    directory = tempfile.mkdtemp(prefix="allocation-scenarios-")
+    try:
+        # Every scenario's engine only bids on each candidate's best max_options pairs
+        write_shared_scores(directory, candidates, internships,
+                            top_k=AllocationEngine(**(engine_params or {})).max_options,
+                            rank_weights=[{**DEFAULT_WEIGHTS, **(s.get("weights") or {})} for s in scenarios])
+        context = {
+            "capacities": [i.get("capacity", 0) for i in internships],
+            "quotas": [i.get("quota", {}) for i in internships],
+            "categories": [_category(c.get("quota_category")) for c in candidates],
+            "blocked": [_is_blocked(c) for c in candidates],
+            "engine_params": engine_params or {},
+        }
+        pool = _get_pool()
+        try:
+            return list(pool.map(_evaluate, [directory] * len(scenarios), [context] * len(scenarios), scenarios))
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
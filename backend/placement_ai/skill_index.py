@@ -0,0 +1,107 @@
+import threading
+from array import array
+from typing import List, Dict, Any, Iterable, Optional
+import numpy as np
+
+
+class SkillIndex:
+    """
+    Inverted index skill -> internships for requirement matching.
+    Skills are interned to integer ids and each posting list is an array of internship rows,
+    so scoring a candidate only touches internships sharing at least one skill.
+    Internships without requirements live in an explicit bucket (they always score the neutral skill fallback).
+    The index is kept current by the catalogue's posting writes (upsert/remove), never by
+    rescanning the catalogue per query. Writes and reads share a lock: queries run on the
+    request threadpool while writes append to (or compaction rebuilds) the posting lists.
+    """
+
+    def __init__(self, internships: Optional[List[Dict]] = None):
+        # Re-entrant: upsert removes the old row, remove may compact, compact upserts
+        self._lock = threading.RLock()
+        self._reset()
+        for internship in internships or []:
+            self.upsert(internship)
+
+    def _reset(self):
+        self._skill_ids: Dict[str, int] = {}
+        self._postings: List[array] = []
+        self._rows: List[Optional[Dict]] = []
+        self._row_requirements: List[frozenset] = []
+        self._row_of: Dict[Any, int] = {}
+        self._no_requirements: set = set()
+        self._dead = 0
+
+    def _intern(self, skill: str) -> int:
+        skill_id = self._skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self._postings)
+            self._skill_ids[skill] = skill_id
+            self._postings.append(array("i"))
+        return skill_id
+
+    def upsert(self, internship: Dict):
+        """Add a new posting or replace an edited one"""
+        with self._lock:
+            self.remove(internship["id"])
+            row = len(self._rows)
+            requirements = frozenset(internship.get("requirements", []) or [])
+            self._rows.append(internship)
+            self._row_requirements.append(requirements)
+            self._row_of[internship["id"]] = row
+            if not requirements:
+                self._no_requirements.add(row)
+            for skill in requirements:
+                self._postings[self._intern(skill)].append(row)
+
+    def remove(self, internship_id) -> bool:
+        """Drop a posting; its rows are skipped until the next compaction"""
+        with self._lock:
+            row = self._row_of.pop(internship_id, None)
+            if row is None:
+                return False
+            self._rows[row] = None
+            self._no_requirements.discard(row)
+            self._dead += 1
+            if self._dead > 1024 and self._dead > len(self._row_of):
+                self.compact()
+            return True
+
+    def compact(self):
+        with self._lock:
+            live = [row for row in self._rows if row is not None]
+            self._reset()
+            for internship in live:
+                self.upsert(internship)
+
+    def overlapping(self, skills: Iterable[str]) -> List[Dict]:
+        """Internships sharing at least one skill with the candidate, in catalogue order"""
+        with self._lock:
+            # The frombuffer views must be gone before a writer may append to the arrays again
+            lists = [np.frombuffer(self._postings[self._skill_ids[s]], dtype=np.int32)
+                     for s in set(skills) if s in self._skill_ids]
+            if not lists:
+                return []
+            rows = np.unique(np.concatenate(lists))
+            del lists
+            return [self._rows[row] for row in rows.tolist() if self._rows[row] is not None]
+
+    def without_requirements(self) -> List[Dict]:
+        """Internships that list no requirements"""
+        with self._lock:
+            return [self._rows[row] for row in sorted(self._no_requirements)]
+
+    def requirements_of(self, internship_id) -> Optional[frozenset]:
+        with self._lock:
+            row = self._row_of.get(internship_id)
+            return self._row_requirements[row] if row is not None else None
+
+    def ids(self) -> set:
+        """Ids of every indexed posting"""
+        with self._lock:
+            return set(self._row_of)
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+
+skill_index = SkillIndex()
@@ -5,9 +5,34 @@ Lightweight implementation for resume entity extraction
 
 import re
 import json
+import asyncio
 from typing import Dict, List, Any, Optional
-import requests
 from datetime import datetime
+from ai_modules.http_client import http_pool
+from ai_modules.skill_matcher import SkillMatcher
+
+# Technical skills database with categories for rule-based analysis
+SKILL_CATEGORIES = {
+    "Programming Languages": ["Python", "JavaScript", "Java", "TypeScript", "C++", "C#", "PHP", "Ruby", "Go", "Rust", "Swift", "Kotlin", "Scala", "R"],
+    "Web Development": ["React", "Angular", "Vue.js", "Node.js", "Express", "Django", "Flask", "Spring Boot", "Laravel", "Ruby on Rails"],
+    "Frontend Technologies": ["HTML", "CSS", "SCSS", "SASS", "Bootstrap", "Tailwind", "jQuery", "Webpack", "Vite"],
+    "Backend Technologies": ["Node.js", "Express", "Django", "Flask", "Spring", "ASP.NET", "FastAPI", "GraphQL", "REST API"],
+    "Databases": ["MySQL", "PostgreSQL", "MongoDB", "Redis", "SQLite", "Oracle", "SQL Server", "DynamoDB", "Cassandra"],
+    "Cloud & DevOps": ["AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "CI/CD", "Terraform", "Ansible"],
+    "Mobile Development": ["React Native", "Flutter", "Swift", "Kotlin", "Xamarin", "Ionic"],
+    "Data & AI": ["Machine Learning", "Data Science", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn", "Jupyter"],
+    "Tools & Platforms": ["Git", "GitHub", "GitLab", "Jira", "Slack", "VS Code", "IntelliJ", "Linux", "Windows", "macOS"]
+}
+
+# Skills looked for in NER "O" entities when the model tags no skills
+TECH_SKILLS = [
+    "Python", "JavaScript", "Java", "React", "Node.js", "HTML", "CSS",
+    "MongoDB", "MySQL", "PostgreSQL", "Docker", "Kubernetes", "AWS"
+]
+
+# Compiled once at import
+SKILL_MATCHER = SkillMatcher.from_categories(SKILL_CATEGORIES)
+TECH_SKILL_MATCHER = SkillMatcher.from_categories({"Technical": TECH_SKILLS})
 
 class ResumeNERAnalyzer:
     """
@@ -30,7 +55,7 @@ class ResumeNERAnalyzer:
         import os
         return os.environ.get("NEXT_PUBLIC_HUGGING_FACE_API_KEY") or os.environ.get("HUGGING_FACE_API_KEY")
     
-    def analyze_resume_text(self, text: str) -> Dict[str, Any]:
+    async def analyze_resume_text(self, text: str) -> Dict[str, Any]:
         """
         Analyze resume text using NER model
         
@@ -42,7 +67,7 @@ class ResumeNERAnalyzer:
         """
         try:
             # Try HuggingFace API first
-            entities = self._extract_entities_hf_api(text)
+            entities = await self._extract_entities_hf_api(text)
             if entities:
                 analysis = self._process_entities(entities, text)
                 analysis["analysis_method"] = "huggingface_api"
@@ -56,7 +81,7 @@ class ResumeNERAnalyzer:
         analysis["analysis_method"] = "rule_based"
         return analysis
     
-    def _extract_entities_hf_api(self, text: str) -> List[Dict[str, Any]]:
+    async def _extract_entities_hf_api(self, text: str) -> List[Dict[str, Any]]:
         """Extract entities using HuggingFace Inference API"""
         try:
             # Truncate text if too long for API
@@ -65,11 +90,11 @@ class ResumeNERAnalyzer:
                 text = text[:max_length]
             
             payload = {"inputs": text}
-            response = requests.post(
+            response = await http_pool.post(
                 self.hf_api_url,
                 headers=self.headers,
                 json=payload,
-                timeout=30
+                read_timeout=30
             )
             
             if response.status_code == 200:
@@ -257,30 +282,20 @@ class ResumeNERAnalyzer:
     def _rule_based_analysis(self, text: str) -> Dict[str, Any]:
         """Enhanced rule-based analysis with comprehensive ATS scoring and analysis functions"""
         
-        # Comprehensive technical skills database with categories
-        skill_categories = {
-            "Programming Languages": ["Python", "JavaScript", "Java", "TypeScript", "C++", "C#", "PHP", "Ruby", "Go", "Rust", "Swift", "Kotlin", "Scala", "R"],
-            "Web Development": ["React", "Angular", "Vue.js", "Node.js", "Express", "Django", "Flask", "Spring Boot", "Laravel", "Ruby on Rails"],
-            "Frontend Technologies": ["HTML", "CSS", "SCSS", "SASS", "Bootstrap", "Tailwind", "jQuery", "Webpack", "Vite"],
-            "Backend Technologies": ["Node.js", "Express", "Django", "Flask", "Spring", "ASP.NET", "FastAPI", "GraphQL", "REST API"],
-            "Databases": ["MySQL", "PostgreSQL", "MongoDB", "Redis", "SQLite", "Oracle", "SQL Server", "DynamoDB", "Cassandra"],
-            "Cloud & DevOps": ["AWS", "Azure", "GCP", "Docker", "Kubernetes", "Jenkins", "CI/CD", "Terraform", "Ansible"],
-            "Mobile Development": ["React Native", "Flutter", "Swift", "Kotlin", "Xamarin", "Ionic"],
-            "Data & AI": ["Machine Learning", "Data Science", "TensorFlow", "PyTorch", "Pandas", "NumPy", "Scikit-learn", "Jupyter"],
-            "Tools & Platforms": ["Git", "GitHub", "GitLab", "Jira", "Slack", "VS Code", "IntelliJ", "Linux", "Windows", "macOS"]
-        }
+        text_lower = text.lower()
         
-        all_skills = []
-        for category, skills in skill_categories.items():
-            all_skills.extend([(skill, category) for skill in skills])
+        # Extract skills with categories and confidence scoring, from one scan of the text
+        mentions = {}
+        for hit in SKILL_MATCHER.find_all(text):
+            mentions[(hit.skill, hit.category)] = mentions.get((hit.skill, hit.category), 0) + 1
         
-        # Extract skills with categories and confidence scoring
         found_skills = []
-        text_lower = text.lower()
-        for skill, category in all_skills:
-            if skill.lower() in text_lower:
+        for category, skills in SKILL_CATEGORIES.items():
+            for skill in skills:
+                skill_mentions = mentions.get((skill, category))
+                if not skill_mentions:
+                    continue
                 # Calculate confidence based on context
-                skill_mentions = len(re.findall(r'\b' + re.escape(skill.lower()) + r'\b', text_lower))
                 confidence = min(0.6 + (skill_mentions * 0.1), 1.0)
                 
                 found_skills.append({
@@ -402,21 +417,15 @@ class ResumeNERAnalyzer:
     
     def _extract_skills_rule_based(self, other_entities: List) -> List[Dict[str, Any]]:
         """Rule-based skill extraction from other entities"""
-        tech_skills = [
-            "Python", "JavaScript", "Java", "React", "Node.js", "HTML", "CSS",
-            "MongoDB", "MySQL", "PostgreSQL", "Docker", "Kubernetes", "AWS"
-        ]
-        
         found_skills = []
         for entity in other_entities:
             text = entity.get("text", "")
-            for skill in tech_skills:
-                if skill.lower() in text.lower():
-                    found_skills.append({
-                        "name": skill,
-                        "confidence": entity.get("confidence", 0.7),
-                        "category": "Technical"
-                    })
+            for skill in TECH_SKILL_MATCHER.skills(text):
+                found_skills.append({
+                    "name": skill,
+                    "confidence": entity.get("confidence", 0.7),
+                    "category": "Technical"
+                })
         
         return found_skills
     
@@ -638,7 +647,7 @@ class ResumeNERAnalyzer:
         
         return keyword_density
 
-def analyze_resume_with_ner(text: str) -> Dict[str, Any]:
+async def analyze_resume_with_ner(text: str) -> Dict[str, Any]:
     """
     Main function to analyze resume using NER model
     
@@ -649,7 +658,7 @@ def analyze_resume_with_ner(text: str) -> Dict[str, Any]:
         Dictionary containing resume analysis
     """
     analyzer = ResumeNERAnalyzer()
-    return analyzer.analyze_resume_text(text)
+    return await analyzer.analyze_resume_text(text)
 
 # Test function
 if __name__ == "__main__":
@@ -675,5 +684,5 @@ if __name__ == "__main__":
     - Machine Learning model for price prediction
     """
     
-    result = analyze_resume_with_ner(sample_text)
+    result = asyncio.run(analyze_resume_with_ner(sample_text))
     print(json.dumps(result, indent=2))
\ No newline at end of file
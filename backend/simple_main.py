@@ -4,7 +4,6 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import uvicorn
 import os
-import tempfile
 
 app = FastAPI(title="Simple Internship API", version="1.0.0")
 
@@ -24,7 +23,9 @@ class ResumeAnalysisRequest(BaseModel):
 
 # Import simple internship analyzer
 try:
-    from models.simple_internship_analyzer import analyze_internship_resume, process_resume_file
+    from models.simple_internship_analyzer import analyze_internship_resume, process_resume_text
+    from file_extractor import ExtractionLimitError, extract_resume_text_async, keep_uploads_in_memory
+    keep_uploads_in_memory()
     print("✅ Successfully imported simple internship analyzer")
     INTERNSHIP_MODELS_AVAILABLE = True
 except ImportError as e:
@@ -59,33 +60,23 @@ async def analyze_internship_resume_endpoint(file: UploadFile = File(...)):
         if not file.filename.lower().endswith(('.pdf', '.docx', '.doc', '.txt')):
             raise HTTPException(status_code=400, detail="Only PDF, DOCX, DOC, and TXT files are supported")
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Extract from the upload in memory, off the event loop
+        resume_text = await extract_resume_text_async(file.file, file.filename)
         
-        print(f"📁 Temporary file created: {temp_file_path}")
+        # Process the resume for internships
+        result = process_resume_text(resume_text)
         
-        try:
-            # Process the resume for internships
-            result = process_resume_file(temp_file_path)
-            
-            print(f"✅ Processing complete: {result.get('success', False)}")
-            
-            return JSONResponse(content={
-                "success": True,
-                "filename": file.filename,
-                "analysis_type": "internship",
-                "result": result
-            })
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                print(f"🧹 Cleaned up temporary file: {temp_file_path}")
-                
+        print(f"✅ Processing complete: {result.get('success', False)}")
+        
+        return JSONResponse(content={
+            "success": True,
+            "filename": file.filename,
+            "analysis_type": "internship",
+            "result": result
+        })
+        
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -6,7 +6,6 @@ from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import uvicorn
-import tempfile
 import os
 from datetime import datetime
 
@@ -14,7 +13,9 @@ from datetime import datetime
 try:
     import sys
     sys.path.append('models')
-    from models.internship_resume_analyzer import analyze_internship_resume, process_resume_file
+    from models.internship_resume_analyzer import analyze_internship_resume, process_resume_text
+    from file_extractor import ExtractionLimitError, extract_resume_text_async, keep_uploads_in_memory
+    keep_uploads_in_memory()
     INTERNSHIP_MODELS_AVAILABLE = True
     print("✅ Internship models imported successfully")
 except ImportError as e:
@@ -62,38 +63,27 @@ async def analyze_internship_resume_endpoint(file: UploadFile = File(...)):
         
         print(f"📄 File details: {filename}, content-type: {file.content_type}")
         
-        # Save uploaded file temporarily
-        file_ext = os.path.splitext(filename)[1] or '.txt'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_file_path = temp_file.name
+        # Extract from the upload in memory, off the event loop
+        resume_text = await extract_resume_text_async(file.file, filename)
         
-        print(f"💾 Saved file temporarily at: {temp_file_path}")
+        # Process the resume for internships
+        print("🔄 Processing resume file...")
+        result = process_resume_text(resume_text)
+        print(f"✅ Resume processing completed: {type(result)}")
         
-        try:
-            # Process the resume for internships
-            print("🔄 Processing resume file...")
-            result = process_resume_file(temp_file_path)
-            print(f"✅ Resume processing completed: {type(result)}")
-            
-            response_data = {
-                "success": True,
-                "filename": file.filename,
-                "analysis_type": "internship",
-                "timestamp": datetime.now().isoformat(),
-                "result": result
-            }
-            
-            print(f"📊 Sending response: {len(str(response_data))} characters")
-            return JSONResponse(content=response_data)
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-                print(f"🗑️ Cleaned up temporary file: {temp_file_path}")
-                
+        response_data = {
+            "success": True,
+            "filename": file.filename,
+            "analysis_type": "internship",
+            "timestamp": datetime.now().isoformat(),
+            "result": result
+        }
+        
+        print(f"📊 Sending response: {len(str(response_data))} characters")
+        return JSONResponse(content=response_data)
+        
+    except ExtractionLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,137 @@
+"""
+Tests for the placement_ai allocation engine: the epsilon-scaling auction against an
+exact assignment solver, and warm-started re-solves against solving from scratch
+"""
+
+import os
+import sys
+import random
+import numpy as np
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from placement_ai.allocation import AllocationEngine, build_score_matrix
+
+linear_sum_assignment = pytest.importorskip("scipy.optimize").linear_sum_assignment
+
+SKILLS = ["python", "java", "sql", "react", "ml", "aws", "docker", "excel", "figma", "go"]
+CITIES = ["Mumbai", "Delhi", "Bengaluru", "Pune"]
+DOMAINS = ["software", "data", "design", "finance"]
+CATEGORIES = [None, None, None, "SC", "ST", "OBC", "EWS", "WOMEN"]
+
+
+def optimal_total(scores: np.ndarray, capacities) -> float:
+    """Best total score with at most capacities[j] candidates per column, one seat per candidate"""
+    seats = np.repeat(np.arange(len(capacities)), capacities)
+    if seats.size == 0:
+        return 0.0
+    expanded = scores[:, seats]
+    rows, cols = linear_sum_assignment(expanded, maximize=True)
+    return float(expanded[rows, cols].sum())
+
+
+def random_records(rng: random.Random, n: int, m: int, id_offset: int = 0):
+    candidates = [{
+        "id": f"c{id_offset + i}",
+        "skills": rng.sample(SKILLS, rng.randint(1, 4)),
+        "preferences": {"location": rng.choice(CITIES), "domain": rng.choice(DOMAINS)},
+        "quota_category": rng.choice(CATEGORIES),
+        "past_internships": 0,
+    } for i in range(n)]
+    internships = [{
+        "id": f"p{id_offset + j}",
+        "requirements": rng.sample(SKILLS, rng.randint(1, 3)),
+        "location": rng.choice(CITIES),
+        "domain": rng.choice(DOMAINS),
+        "capacity": rng.randint(1, 4),
+        "quota": {rng.choice(CATEGORIES[3:]): 1} if rng.random() < 0.3 else {},
+    } for j in range(m)]
+    return candidates, internships
+
+
+def allocation_total(result, candidates, internships) -> float:
+    """Total match score of an allocate/reallocate result, read from the unrounded score matrix"""
+    scores = build_score_matrix(candidates, internships).toarray()
+    rows = {c["id"]: r for r, c in enumerate(candidates)}
+    cols = {i["id"]: j for j, i in enumerate(internships)}
+    return float(sum(scores[rows[a["candidate_id"]], cols[a["internship_id"]]] for a in result["allocations"]))
+
+
+def test_auction_within_epsilon_of_optimal():
+    """300 random instances: the auction total is within epsilon * #assigned of the exact optimum"""
+    rng = np.random.default_rng(7)
+    for _ in range(300):
+        n, m = int(rng.integers(1, 40)), int(rng.integers(1, 15))
+        scores = rng.random((n, m))
+        scores[rng.random((n, m)) < 0.4] = 0.0
+        capacities = rng.integers(0, 4, size=m)
+
+        engine = AllocationEngine()
+        solution = engine.solve(scores, capacities.tolist(), [{}] * m, [None] * n)
+        assignment = solution["assignment"]
+
+        assert solution["converged"]
+        assert (np.bincount(assignment[assignment >= 0], minlength=m) <= capacities).all()
+        matched = np.flatnonzero(assignment >= 0)
+        total = float(scores[matched, assignment[matched]].sum())
+        assert np.allclose(solution["scores"][matched], scores[matched, assignment[matched]])
+        assert total >= optimal_total(scores, capacities) - solution["optimality_gap_bound"] - 1e-9
+
+
+def test_warm_start_never_worse_than_fresh_solve():
+    """200 random edits: a warm-started reallocate scores at least as well as solving from scratch"""
+    rng = random.Random(11)
+    for case in range(200):
+        candidates, internships = random_records(rng, rng.randint(5, 40), rng.randint(2, 12))
+        engine = AllocationEngine()
+        engine.allocate(candidates, internships)
+
+        # Withdraw some candidates, add others, edit capacities, close and open postings
+        candidates = [c for c in candidates if rng.random() > 0.15]
+        new_candidates, new_internships = random_records(rng, rng.randint(0, 8), rng.randint(0, 3), 1000 * (case + 1))
+        candidates += new_candidates
+        internships = [{**i, "capacity": max(0, i["capacity"] + rng.randint(-1, 1))}
+                       for i in internships if rng.random() > 0.1] + new_internships
+
+        warm = engine.reallocate(candidates, internships)
+        fresh = AllocationEngine().allocate(candidates, internships)
+
+        assert warm["stats"]["converged"]
+        warm_total = allocation_total(warm, candidates, internships)
+        fresh_total = allocation_total(fresh, candidates, internships)
+        # Scores are float32, so totals summed in a different order differ in the last bits
+        assert warm_total >= fresh_total - 1e-4
+
+
+def test_blocked_and_pruned_score_matrix_matches_full_build():
+    """Scoring in candidate blocks changes nothing; top_k keeps exactly each row's best scores"""
+    rng = random.Random(5)
+    candidates, internships = random_records(rng, 300, 40)
+    internships[3]["requirements"] = []
+    full = build_score_matrix(candidates, internships, block_rows=10 ** 6).toarray()
+    assert np.allclose(build_score_matrix(candidates, internships, block_rows=37).toarray(), full)
+
+    pruned = build_score_matrix(candidates, internships, top_k=5, block_rows=37)
+    assert np.diff(pruned.indptr).max() <= 5
+    dense = pruned.toarray()
+    for row in range(len(candidates)):
+        best = np.sort(full[row][full[row] > 0])[::-1][:5]
+        assert np.allclose(np.sort(dense[row][dense[row] > 0])[::-1], best)
+        kept = np.flatnonzero(dense[row])
+        assert np.allclose(dense[row, kept], full[row, kept])
+
+
+def test_quota_violations_checked_from_the_assignment():
+    """A solved run has none; a candidate moved onto another category's reserved seat is reported"""
+    rng = random.Random(3)
+    candidates, internships = random_records(rng, 60, 10)
+    engine = AllocationEngine()
+    result = engine.allocate(candidates, internships)
+    assert result["overfilled_quotas"] == [] == engine.quota_violations()
+
+    reserved = next(g for g, cat in enumerate(engine._group_category) if cat)
+    outsider = next(i for i, cat in enumerate(engine._categories) if cat != engine._group_category[reserved])
+    engine._assigned[outsider] = reserved
+    assert engine.quota_violations() == [engine._group_category[reserved]]
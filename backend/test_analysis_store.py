@@ -0,0 +1,126 @@
+"""
+Tests for the content-addressed analysis store: artifact expiry, least recently used
+eviction, and concurrent requests joining one in-flight computation
+"""
+
+import os
+import sys
+import types
+import asyncio
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules import analysis_store as analysis_store_module
+from ai_modules.analysis_store import AnalysisStore, content_hash
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Wall clock of the store, advanced by hand"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(analysis_store_module, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def test_artifacts_are_keyed_by_hash_version_and_params(tmp_path):
+    store = AnalysisStore(path=str(tmp_path / "store.db"))
+    file_hash = content_hash(b"resume bytes")
+    store.put(file_hash, "text", "Jane Doe, Python")
+    store.put(file_hash, "doc", b"\x00\x01binary")
+    store.put(file_hash, "langchain_analysis", {"score": 1}, params={"job": "a"})
+
+    assert store.get(file_hash, "text") == "Jane Doe, Python"
+    assert store.get(file_hash, "doc") == b"\x00\x01binary"
+    assert store.get(file_hash, "langchain_analysis", params={"job": "a"}) == {"score": 1}
+    assert store.get(file_hash, "langchain_analysis", params={"job": "b"}) is None
+    assert store.get(file_hash, "text", version="2") is None
+    assert store.get(content_hash(b"other bytes"), "text") is None
+    # A new store on the same file sees the same artifacts
+    assert AnalysisStore(path=str(tmp_path / "store.db")).get(file_hash, "text") == "Jane Doe, Python"
+
+
+def test_artifacts_expire_after_ttl(clock):
+    store = AnalysisStore(ttl=60)
+    store.put("h", "text", "old")
+    clock[0] += 59
+    assert store.get("h", "text") == "old"
+    clock[0] += 2
+    assert store.get("h", "text") is None
+    assert store.stats["expired"] == 1
+
+    # Expired rows are also dropped on the next write
+    store.put("h1", "text", "a")
+    clock[0] += 61
+    store.put("h2", "text", "b")
+    assert store.get_stats()["artifacts"]["text"]["entries"] == 1
+
+
+def test_least_recently_used_artifacts_are_evicted(clock):
+    store = AnalysisStore(max_bytes=1000, ttl=None)
+    for name in "abcd":
+        store.put(name, "text", "x" * 200)
+        clock[0] += 1
+    assert store.get("a", "text") is not None  # a is now the most recently used
+    clock[0] += 1
+    store.put("e", "text", "x" * 200)
+    store.put("f", "text", "x" * 200)  # 1200 bytes: evict down to 900
+
+    assert store.get("b", "text") is None and store.get("c", "text") is None
+    assert all(store.get(name, "text") is not None for name in "adef")
+    assert store.get_stats()["bytes"] <= 1000
+
+
+def test_concurrent_requests_join_one_computation():
+    store = AnalysisStore()
+    calls = []
+    started = threading.Event()
+
+    def compute():
+        calls.append(threading.current_thread().name)
+        started.wait(1)
+        return {"status": "success", "value": 42}
+
+    async def main():
+        with ThreadPoolExecutor(1, thread_name_prefix="tier") as executor:
+            requests = [store.get_or_compute("h", "nlp_analysis", compute, executor=executor) for _ in range(5)]
+            tasks = [asyncio.ensure_future(r) for r in requests]
+            await asyncio.sleep(0.05)
+            started.set()
+            return await asyncio.gather(*tasks)
+
+    results = asyncio.run(main())
+    assert results == [{"status": "success", "value": 42}] * 5
+    assert len(calls) == 1 and calls[0].startswith("tier")
+    assert store.stats["joined"] == 4
+    assert store.get("h", "nlp_analysis") == {"status": "success", "value": 42}
+
+
+def test_computation_outlives_a_caller_that_times_out():
+    store = AnalysisStore()
+
+    async def compute():
+        await asyncio.sleep(0.1)
+        return "text"
+
+    async def main():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(store.get_or_compute("h", "text", compute), timeout=0.01)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+    assert store.get("h", "text") == "text"
+
+
+def test_failures_are_not_stored():
+    store = AnalysisStore()
+    outcomes = iter([{"status": "error"}, {"success": False}, "", {"status": "success"}])
+
+    async def main():
+        return [await store.get_or_compute("h", "basic_analysis", lambda: next(outcomes)) for _ in range(5)]
+
+    assert asyncio.run(main())[-2:] == [{"status": "success"}] * 2
+    assert store.stats["writes"] == 1
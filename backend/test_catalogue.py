@@ -0,0 +1,104 @@
+"""
+Tests for the placement_ai internship catalogue: the recommendation indexes follow the
+internships table, including rows written outside the catalogue routes
+"""
+
+import os
+import sys
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+pytest.importorskip("supabase")
+pytest.importorskip("fastapi")
+
+from placement_ai import catalogue, db
+from placement_ai.models import RecommendationRequest
+from placement_ai.posting_index import PostingIndex
+from placement_ai.routes import recommendations
+from placement_ai.skill_index import SkillIndex
+
+CANDIDATE = {"id": "c1", "skills": ["python", "sql"], "preferences": {"location": "Pune", "domain": "data"}}
+
+
+def posting(internship_id, requirements, updated_at="2025-01-01T00:00:00", **fields):
+    return {"id": internship_id, "title": f"Intern {internship_id}", "requirements": requirements,
+            "location": "Pune", "domain": "data", "capacity": 2, "is_active": True,
+            "updated_at": updated_at, **fields}
+
+
+@pytest.fixture
+def table(monkeypatch):
+    """An in-memory internships table behind the db helpers, with fresh indexes"""
+    rows = {}
+    monkeypatch.setattr(db, "get_internship_versions",
+                        lambda: [{"id": r["id"], "updated_at": r["updated_at"]} for r in rows.values()])
+    monkeypatch.setattr(db, "get_internships", lambda: list(rows.values()))
+    monkeypatch.setattr(db, "get_internships_by_ids", lambda ids: [rows[i] for i in ids if i in rows])
+    monkeypatch.setattr(recommendations, "get_candidate_by_id", lambda candidate_id: CANDIDATE)
+    monkeypatch.setattr(recommendations, "get_applications_by_candidate", lambda candidate_id: [])
+
+    posting_index, skill_index = PostingIndex(), SkillIndex()
+    for module in (catalogue, recommendations):
+        monkeypatch.setattr(module, "posting_index", posting_index)
+        monkeypatch.setattr(module, "skill_index", skill_index)
+    monkeypatch.setattr(catalogue, "_versions", {})
+    monkeypatch.setattr(catalogue, "_reconciled_at", None)
+    monkeypatch.setattr(catalogue, "RECONCILE_SECONDS", 0.0)
+    return rows
+
+
+def recommended_ids():
+    return {r.internship_id for r in recommendations.get_recommendations(RecommendationRequest(candidate_id="c1"))}
+
+
+def test_posting_written_outside_the_routes_is_recommended(table):
+    table["p1"] = posting("p1", ["python"])
+    assert recommended_ids() == {"p1"}
+
+    # Inserted straight into the table, e.g. from the admin UI or another worker
+    table["p2"] = posting("p2", ["sql", "excel"])
+    assert recommended_ids() == {"p1", "p2"}
+
+
+def test_edited_closed_and_deleted_postings_follow_the_table(table):
+    table["p1"] = posting("p1", ["python"])
+    table["p2"] = posting("p2", ["sql"])
+    table["p3"] = posting("p3", ["python", "sql"])
+    assert recommended_ids() == {"p1", "p2", "p3"}
+
+    table["p1"] = posting("p1", ["python"], updated_at="2025-01-02T00:00:00", is_active=False)
+    del table["p2"]
+    assert recommended_ids() == {"p3"}
+
+
+def test_reconcile_is_rate_limited(table, monkeypatch):
+    table["p1"] = posting("p1", ["python"])
+    monkeypatch.setattr(catalogue, "RECONCILE_SECONDS", 3600.0)
+    assert recommended_ids() == {"p1"}
+    table["p2"] = posting("p2", ["sql"])
+    assert recommended_ids() == {"p1"}
+
+
+def test_reloaded_index_drops_postings_deleted_from_the_table(table, tmp_path, monkeypatch):
+    path = str(tmp_path / "postings.npz")
+    saved = PostingIndex(index_path=path)
+    saved.upsert_postings([posting("gone", ["python"]), posting("kept", ["python"])])
+
+    reloaded = PostingIndex(index_path=path)
+    assert reloaded.ids() == {"gone", "kept"}
+    monkeypatch.setattr(catalogue, "posting_index", reloaded)
+    table["kept"] = posting("kept", ["python"])
+
+    catalogue.reconcile()
+    assert reloaded.ids() == {"kept"}
+    assert PostingIndex(index_path=path).ids() == {"kept"}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_full_postings_are_in_neither_index(table):
+    table["p1"] = posting("p1", ["python"])
+    table["p2"] = posting("p2", ["python"], capacity=0)
+    assert recommended_ids() == {"p1"}
+    assert catalogue.skill_index.ids() == catalogue.posting_index.ids() == {"p1"}
@@ -0,0 +1,142 @@
+"""
+Tests for the LLM call scheduler: retries of transient failures, concurrency slots held
+by abandoned calls, and early exit from gather_unordered
+"""
+
+import os
+import sys
+import asyncio
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules.llm_scheduler import LLMScheduler, gather_unordered, is_retryable
+
+
+class ProviderError(Exception):
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def scheduler(**kwargs):
+    params = {"max_concurrency": 2, "timeout": 1.0, "max_retries": 2, "base_delay": 0.0, "max_delay": 0.0}
+    return LLMScheduler(provider="test", **{**params, **kwargs})
+
+
+def test_transient_failures_are_retried():
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ProviderError("busy", status_code=503)
+        return "ok"
+
+    llm = scheduler()
+    assert asyncio.run(llm.run(flaky)) == "ok"
+    assert len(attempts) == 3
+    stats = llm.get_stats()
+    assert stats["retries"] == 2 and stats["failures"] == 0 and stats["in_flight"] == 0
+
+
+def test_permanent_failures_and_exhausted_retries_raise():
+    attempts = []
+
+    async def rejected():
+        attempts.append(1)
+        raise ProviderError("bad request", status_code=400)
+
+    llm = scheduler()
+    with pytest.raises(ProviderError):
+        asyncio.run(llm.run(rejected))
+    assert len(attempts) == 1
+
+    async def throttled():
+        attempts.append(1)
+        raise ProviderError("too many requests", status_code=429)
+
+    attempts.clear()
+    with pytest.raises(ProviderError):
+        asyncio.run(llm.run(throttled))
+    assert len(attempts) == 3
+    assert llm.get_stats()["failures"] == 2
+
+
+def test_retryable_decided_on_status_before_message():
+    assert is_retryable(asyncio.TimeoutError())
+    assert is_retryable(ProviderError("anything", status_code=429))
+    assert not is_retryable(ProviderError("rate limit hit", status_code=400))
+    assert is_retryable(ProviderError("Resource exhausted: quota"))
+    assert not is_retryable(ProviderError("could not generate a response"))
+
+
+def test_timed_out_call_keeps_its_slot_until_it_ends():
+    """Abandoned calls still count against max_concurrency; the slot frees when they finish"""
+    running, peak = [0], [0]
+
+    async def call(duration):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            running[0] -= 1
+        return duration
+
+    async def main():
+        llm = scheduler(max_concurrency=2, timeout=0.05, max_retries=1)
+        slow = [asyncio.ensure_future(llm.run(call, 0.2)) for _ in range(2)]
+        quick = [asyncio.ensure_future(llm.run(call, 0.01)) for _ in range(3)]
+        results = await asyncio.gather(*slow, *quick, return_exceptions=True)
+        await asyncio.sleep(0.3)  # let the abandoned calls end
+        return llm, results
+
+    llm, results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results[:2])
+    assert results[2:] == [0.01] * 3
+    assert peak[0] <= 2
+    stats = llm.get_stats()
+    assert stats["peak_in_flight"] <= 2 and stats["in_flight"] == 0
+    assert stats["timeouts"] == 4
+
+
+def test_gather_unordered_yields_as_completed_and_keeps_errors():
+    async def work(delay, fail=False):
+        await asyncio.sleep(delay)
+        if fail:
+            raise ValueError(delay)
+        return delay
+
+    async def main():
+        return [item async for item in gather_unordered(work, [("a", (0.03,)), ("b", (0.01,)), ("c", (0.02, True))])]
+
+    results = asyncio.run(main())
+    assert [key for key, _ in results] == ["b", "c", "a"]
+    assert isinstance(dict(results)["c"], ValueError)
+
+
+def test_gather_unordered_cancels_pending_calls_when_consumer_stops():
+    started, cancelled = [], []
+
+    async def work(delay):
+        started.append(delay)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(delay)
+            raise
+        return delay
+
+    async def main():
+        stream = gather_unordered(work, [(i, (0.01 if i == 0 else 5.0,)) for i in range(4)])
+        async for key, _ in stream:
+            assert key == 0
+            break
+        await stream.aclose()
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert len(started) == 4
+    assert sorted(cancelled) == [5.0, 5.0, 5.0]
@@ -0,0 +1,97 @@
+"""
+Tests for the micro-batcher: concurrent requests share one forward pass, each caller
+gets its own outputs, and a failing input only fails the request that sent it
+"""
+
+import os
+import sys
+import asyncio
+import threading
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules.micro_batcher import MicroBatcher, batcher_for, get_batcher_stats
+
+
+class GatedModel:
+    """Doubles its inputs; the first forward pass waits for the gate so later requests queue up"""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.gate = threading.Event()
+        self.batches = []
+
+    def __call__(self, items):
+        if not self.entered.is_set():
+            self.entered.set()
+            self.gate.wait(2)
+        self.batches.append(list(items))
+        if any(item == "bad" for item in items):
+            raise ValueError("bad input")
+        return [item * 2 for item in items]
+
+
+def submit_while_busy(batcher, model, requests):
+    """Hold the first forward pass, queue `requests` behind it, then release"""
+    first = batcher.submit([0])
+    assert model.entered.wait(2)
+    futures = [batcher.submit(items) for items in requests]
+    model.gate.set()
+    first.result(2)
+    return futures
+
+
+def test_queued_requests_share_one_batch_and_get_their_own_outputs():
+    model = GatedModel()
+    batcher = MicroBatcher(model, name="test", max_batch=8, max_wait_ms=50)
+    futures = submit_while_busy(batcher, model, [[1], [2, 3], [4]])
+
+    assert [f.result(2) for f in futures] == [[2], [4, 6], [8]]
+    assert model.batches[1:] == [[1, 2, 3, 4]]
+    assert batcher.get_stats()["requests"] == 4
+
+
+def test_a_bad_input_only_fails_its_own_request():
+    model = GatedModel()
+    batcher = MicroBatcher(model, name="test", max_batch=8, max_wait_ms=50)
+    futures = submit_while_busy(batcher, model, [[1], ["bad"], [2, 3]])
+
+    assert futures[0].result(2) == [2]
+    with pytest.raises(ValueError):
+        futures[1].result(2)
+    assert futures[2].result(2) == [4, 6]
+    stats = batcher.get_stats()
+    assert stats["failures"] == 1 and stats["isolated_failures"] == 1
+
+
+def test_wrong_output_count_is_an_error_not_misaligned_results():
+    batcher = MicroBatcher(lambda items: items[:-1], name="short", max_wait_ms=0)
+    with pytest.raises(ValueError):
+        batcher.run([1, 2])
+    assert batcher.run([]) == []
+
+
+def test_oversized_requests_start_the_next_batch():
+    model = GatedModel()
+    batcher = MicroBatcher(model, name="test", max_batch=4, max_wait_ms=50)
+    futures = submit_while_busy(batcher, model, [[1, 2, 3], [4, 5], [6]])
+
+    assert [f.result(2) for f in futures] == [[2, 4, 6], [8, 10], [12]]
+    assert all(len(batch) <= 4 for batch in model.batches)
+
+
+def test_async_callers_and_stats_per_model():
+    first_model, second_model = object(), object()
+    first = batcher_for("stats-test", first_model, lambda items: [len(i) for i in items])
+    second = batcher_for("stats-test", second_model, lambda items: [0 for _ in items])
+    assert batcher_for("stats-test", first_model, None) is first
+
+    async def main():
+        return await asyncio.gather(first.encode(["a", "bb"]), second.encode(["ccc"]))
+
+    assert asyncio.run(main()) == [[1, 2], [0]]
+    stats = get_batcher_stats()
+    assert stats[f"stats-test:{id(first_model):x}"]["items"] == 2
+    assert stats[f"stats-test:{id(second_model):x}"]["items"] == 1
@@ -0,0 +1,89 @@
+"""
+Tests for multi-opportunity prompt packing in the LangChain matching engine: parsing of
+packed responses and the per-pair fallback for items the packed call did not deliver
+"""
+
+import os
+import sys
+import json
+import asyncio
+import types
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules.langchain_matching_engine import LangChainMatchingEngine
+from ai_modules.llm_scheduler import LLMScheduler
+
+parse = LangChainMatchingEngine._parse_packed_items
+
+
+def result(score, **fields):
+    return {"match_score": score, "explanation": "A sufficiently long explanation of why this pair matches well.",
+            "fit_level": "good fit", "skill_alignment": {}, "strengths": [], "concerns": [],
+            "recommendations": [], "confidence_score": 0.8, **fields}
+
+
+def test_items_are_keyed_by_their_opportunity_index():
+    raw = "Here you go:\n" + json.dumps([result(10, opportunity_index=2), result(20, opportunity_index=1)]) + "\nDone."
+    items = parse(raw, 2)
+    assert items[0]["match_score"] == 20 and items[1]["match_score"] == 10
+    assert "opportunity_index" not in items[0]
+
+
+def test_missing_or_bad_indices_fall_back_to_position_and_drop_extras():
+    items = parse(json.dumps([result(10), result(20, opportunity_index="x"), "junk", result(40, opportunity_index=9)]), 3)
+    assert sorted(items) == [0, 1]
+    assert items[1]["match_score"] == 20
+
+    # The first item claiming an index wins
+    items = parse(json.dumps([result(10, opportunity_index=1), result(20, opportunity_index=1)]), 2)
+    assert list(items) == [0] and items[0]["match_score"] == 10
+
+
+def test_unparseable_responses_yield_nothing():
+    assert parse("no json here", 2) == {}
+    assert parse("[{broken", 2) == {}
+    assert parse('{"match_score": 1}', 1) == {}
+
+
+def packed_engine(raw_or_error):
+    engine = LangChainMatchingEngine()
+    engine.api_type = "test"
+    engine.parser = types.SimpleNamespace(get_format_instructions=lambda: "")
+    engine.scheduler = LLMScheduler(provider="test", max_retries=0, base_delay=0.0)
+    pair_calls = []
+
+    async def run_chain(chain=None, **inputs):
+        if isinstance(raw_or_error, Exception):
+            raise raw_or_error
+        return raw_or_error
+
+    async def match_pair(candidate_data, opportunity_data):
+        pair_calls.append(opportunity_data["id"])
+        return {"success": True, "pair": opportunity_data["id"]}
+
+    engine._run_matching_chain = run_chain
+    engine._match_validated = match_pair
+    return engine, pair_calls
+
+
+def test_invalid_and_missing_items_are_rerun_as_pair_calls():
+    raw = json.dumps([result(70, opportunity_index=1), result(500, opportunity_index=2)])  # item 2 fails validation
+    engine, pair_calls = packed_engine(raw)
+    opportunities = [{"id": "o1"}, {"id": "o2"}, {"id": "o3"}]
+
+    results = asyncio.run(engine._match_packed({"name": "c"}, opportunities))
+    assert results[0]["packed"] and results[0]["match_score"] == 70
+    assert results[1] == {"success": True, "pair": "o2"}
+    assert results[2] == {"success": True, "pair": "o3"}
+    assert sorted(pair_calls) == ["o2", "o3"]
+
+
+def test_failed_packed_call_falls_back_to_every_pair():
+    engine, pair_calls = packed_engine(RuntimeError("provider down"))
+    opportunities = [{"id": "o1"}, {"id": "o2"}]
+
+    results = asyncio.run(engine._match_packed({"name": "c"}, opportunities))
+    assert [r["pair"] for r in results] == ["o1", "o2"]
+    assert sorted(pair_calls) == ["o1", "o2"]
@@ -0,0 +1,76 @@
+"""
+Tests for the precompiled resume parsing patterns in advanced_nlp_processor: job titles,
+degrees and certifications stay on one line and within their word limits, and short
+degree abbreviations are not read out of ordinary English words
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules.advanced_nlp_processor import AdvancedNLPProcessor, RESUME_PATTERNS
+
+processor = AdvancedNLPProcessor()
+
+
+def titles(text):
+    return processor.extract_experience_details(text)["positions"]
+
+
+def degrees(text):
+    return [(e["degree"], e["field"]) for e in processor.extract_education_details(text)]
+
+
+def certifications(text):
+    return {m.group(1) for pattern in RESUME_PATTERNS["certification"] for m in pattern.finditer(text)}
+
+
+def test_job_titles_keep_at_most_two_leading_words_on_one_line():
+    found = titles("Senior Software Engineer at Acme\nResponsible for mentoring everyone on the platform team as lead\ndeveloper")
+    assert "Senior Software Engineer" in found
+    assert "developer" in found
+    assert all("\n" not in title for title in found)
+    assert all(len(title.split()) <= 3 for title in found if not title.lower().startswith(("senior", "lead")))
+
+
+def test_seniority_titles_allow_two_words_before_the_role():
+    assert titles("Lead Machine Learning Engineer")[0] == "Lead Machine Learning Engineer"
+    assert not any("Staff" in title for title in titles("Staff meeting notes\nEngineer"))
+
+
+def test_degrees_and_fields():
+    text = "B.Tech in Computer Science\nBachelor of Science in Physics\nPh.D in Machine Learning\nMBA Finance\nM.S. Data Science"
+    assert set(degrees(text)) == {
+        ("B.Tech", "Computer Science"),
+        ("Bachelor of Science", "Physics"),
+        ("Ph.D", "Machine Learning"),
+        ("MBA", "Finance"),
+        ("M.S.", "Data Science"),
+    }
+
+
+def test_two_letter_words_are_not_degrees():
+    assert degrees("I will be there to help me and ma at home, as we said") == []
+    assert degrees("Graduated with a B.E. in Mechanical Engineering") == [("B.E.", "Mechanical Engineering")]
+
+
+def test_degree_fields_stay_on_their_line():
+    assert degrees("MBA\nExperience at Acme") == [("MBA", None)]
+
+
+def test_certifications_are_short_names_on_one_line():
+    found = certifications("Google Cloud certified\n- AWS Solutions Architect certification (2023)")
+    assert "Google Cloud" in found
+    assert "AWS Solutions Architect" in found
+    assert all("\n" not in name and len(name.split()) <= 5 for name in found)
+
+    # A whole sentence before "certification" is cut down to its last five words
+    found = certifications("After many years of work on several projects she earned the Kubernetes Administrator certification")
+    assert found == {"she earned the Kubernetes Administrator"}
+
+
+def test_gpa_and_years_of_experience():
+    assert RESUME_PATTERNS["gpa"].search("CGPA: 8.7/10").groups() == ("8.7", "10")
+    assert processor.extract_experience_details("5+ years of experience in Python")["total_years"] == 5
@@ -0,0 +1,68 @@
+"""
+Tests for the placement_ai inverted skill index under concurrent posting writes and queries
+"""
+
+import os
+import sys
+import random
+import threading
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from placement_ai.skill_index import SkillIndex
+
+SKILLS = ["python", "java", "sql", "react", "ml", "aws"]
+
+
+def test_overlapping_matches_requirements():
+    index = SkillIndex([
+        {"id": "a", "requirements": ["python", "sql"]},
+        {"id": "b", "requirements": ["java"]},
+        {"id": "c", "requirements": []},
+    ])
+    assert [i["id"] for i in index.overlapping(["sql", "go"])] == ["a"]
+    assert [i["id"] for i in index.without_requirements()] == ["c"]
+
+    index.upsert({"id": "a", "requirements": ["java"]})
+    index.remove("b")
+    assert [i["id"] for i in index.overlapping(["java"])] == ["a"]
+    assert index.requirements_of("a") == frozenset(["java"])
+    assert index.ids() == {"a", "c"}
+
+
+def test_queries_survive_concurrent_writes_and_compaction():
+    index = SkillIndex()
+    errors = []
+    stop = threading.Event()
+
+    def write(seed):
+        rng = random.Random(seed)
+        try:
+            for n in range(6000):
+                index.upsert({"id": rng.randrange(300), "requirements": rng.sample(SKILLS, 2)})
+                if n % 3 == 0:
+                    index.remove(rng.randrange(300))
+        except Exception as e:
+            errors.append(e)
+
+    def read():
+        try:
+            while not stop.is_set():
+                for internship in index.overlapping(["python", "sql"]):
+                    assert internship is not None
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write, args=(seed,)) for seed in range(2)]
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors
+    assert {i["id"] for i in index.overlapping(SKILLS)} == index.ids()
@@ -0,0 +1,69 @@
+"""
+Tests for the shared Aho-Corasick skill matcher: word boundaries for aliases such as
+c++, .net and go, overlapping aliases, offsets and canonical names
+"""
+
+import os
+import sys
+import pytest
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules import skill_matcher as skill_matcher_module
+from ai_modules.skill_matcher import SkillMatcher
+
+CATEGORIES = {
+    "languages": ["c++", "c#", "go", "java", "javascript", "node.js"],
+    "frameworks": [".net", "asp.net", "react", "spring boot"],
+    "tools": ["git", "ci/cd"],
+}
+
+
+@pytest.fixture(params=["python", "pyahocorasick"])
+def matcher(request, monkeypatch):
+    """The same matcher on the pure-Python automaton and, when installed, on pyahocorasick"""
+    if request.param == "pyahocorasick":
+        if not skill_matcher_module.AHOCORASICK_AVAILABLE:
+            pytest.skip("pyahocorasick not installed")
+    else:
+        monkeypatch.setattr(skill_matcher_module, "AHOCORASICK_AVAILABLE", False)
+    return SkillMatcher.from_categories(CATEGORIES)
+
+
+def test_word_aliases_do_not_match_inside_words(matcher):
+    assert matcher.skills("Good at Google Go, gone going") == {"go": 1}
+    assert matcher.skills("Rust, React and Reactive") == {"react": 1}
+    assert matcher.skills("javascripting") == {}
+    assert matcher.skills("legit digits") == {}
+
+
+def test_punctuated_aliases_match_next_to_punctuation(matcher):
+    assert matcher.skills("C++, C#.") == {"c++": 1, "c#": 1}
+    assert matcher.skills("node.js; CI/CD") == {"node.js": 1, "ci/cd": 1}
+    # Overlapping aliases are all reported: ASP.NET is also a .NET mention
+    assert matcher.skills("(.NET/ASP.NET)") == {".net": 2, "asp.net": 1}
+    # The boundary is checked only where the alias itself ends in a word character
+    assert matcher.skills("dotnet, .netcore, c++17") == {"c++": 1}
+
+
+def test_hits_carry_offsets_and_original_case(matcher):
+    text = "Used Java & JavaScript with Spring Boot"
+    hits = matcher.find_all(text)
+    assert [(text[h.start:h.end], h.skill, h.category) for h in hits] == [
+        ("Java", "java", "languages"),
+        ("JavaScript", "javascript", "languages"),
+        ("Spring Boot", "spring boot", "frameworks"),
+    ]
+
+
+def test_aliases_map_to_canonical_skills(matcher):
+    taxonomy = SkillMatcher.from_groups({"languages": {"golang": ["go", "golang"], "c++": ["c++", "cpp"]}})
+    assert taxonomy.skills("Go and golang, CPP and c++") == {"golang": 2, "c++": 2}
+    assert taxonomy.category_of("cpp") == "languages"
+    assert matcher.category_of("ASP.NET") == "frameworks"
+
+
+def test_empty_inputs(matcher):
+    assert matcher.find_all("") == []
+    assert SkillMatcher().skills("anything") == {}
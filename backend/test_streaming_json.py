@@ -0,0 +1,76 @@
+"""
+Tests for IncrementalJSONParser, which turns a streamed LLM response into top-level JSON
+members as soon as each one is complete, whatever the chunk boundaries
+"""
+
+import os
+import sys
+import json
+import random
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ai_modules.perplexity_analyzer import IncrementalJSONParser
+
+DOCUMENT = {
+    "overall_score": 78,
+    "summary": "Strong \"full-stack\" profile, {braces} and [brackets] inside strings, a \\ backslash",
+    "strengths": ["Python, SQL", {"nested": [1, 2, {"deep": "}"}]}],
+    "contact": {"email": "a@b.c", "links": []},
+    "empty": "",
+}
+
+
+def stream(text, chunks):
+    parser = IncrementalJSONParser()
+    members = []
+    for chunk in chunks:
+        members.extend(parser.feed(chunk))
+    return parser, members
+
+
+def split(text, cuts):
+    bounds = [0] + sorted(cuts) + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def test_every_single_split_point_gives_the_same_members():
+    text = "```json\n" + json.dumps(DOCUMENT, indent=2) + "\n```"
+    for cut in range(len(text) + 1):
+        parser, members = stream(text, split(text, [cut]))
+        assert members == list(DOCUMENT.items()), cut
+        assert parser.done
+
+
+def test_character_by_character_and_random_chunks():
+    text = json.dumps(DOCUMENT)
+    assert stream(text, list(text))[1] == list(DOCUMENT.items())
+
+    rng = random.Random(4)
+    for _ in range(200):
+        cuts = rng.sample(range(1, len(text)), rng.randint(1, 20))
+        assert stream(text, split(text, cuts))[1] == list(DOCUMENT.items())
+
+
+def test_members_are_returned_as_soon_as_they_complete():
+    parser = IncrementalJSONParser()
+    assert parser.feed('Sure! {"a": 1, "b": [1, ') == [("a", 1)]
+    assert parser.feed('2], "c": "x,') == [("b", [1, 2])]
+    assert parser.feed(' y"}') == [("c", "x, y")]
+    assert parser.done
+    assert parser.feed(', "ignored": true}') == []
+
+
+def test_arrays_yield_indexed_items():
+    parser = IncrementalJSONParser(opening="[")
+    items = []
+    for chunk in split('[{"skill": "go"}, "c++", 3]', [5, 17, 22]):
+        items.extend(parser.feed(chunk))
+    assert items == [(0, {"skill": "go"}), (1, "c++"), (2, 3)]
+
+
+def test_truncated_stream_keeps_completed_members_only():
+    parser, members = stream('{"a": 1, "b": {"c": ', ['{"a": 1, "b"', ': {"c": '])
+    assert members == [("a", 1)]
+    assert not parser.done